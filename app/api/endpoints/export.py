@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
+from app.core.error_handlers import FacebookAPIException
+from app.services.exporter import Exporter, EXPORT_TYPES, EXPORT_FORMATS
+from app.models.schemas import ErrorResponse
+from loguru import logger
+
+router = APIRouter()
+
+def get_exporter(request: Request):
+    """Dependency to get the exporter, created on first use from the shared Facebook client"""
+    exporter = getattr(request.app.state, "exporter", None)
+    if exporter is None:
+        client = getattr(request.app.state, "facebook_client", None)
+        if client is None:
+            logger.error("Facebook client is not initialized")
+            raise HTTPException(status_code=500, detail="Exporter initialization error: client not initialized")
+        exporter = request.app.state.exporter = Exporter(client)
+    return exporter
+
+@router.post("/export", status_code=202, responses={500: {"model": ErrorResponse}})
+async def start_export(
+    page_id: str = "me",
+    types: Optional[List[str]] = Query(None, description=f"Object types to export: {', '.join(EXPORT_TYPES)}"),
+    format: str = Query("jsonl", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    exporter: Exporter = Depends(get_exporter)
+):
+    """
+    Start a background export of a page's full history to compressed chunk files.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **types**: Object types to export (defaults to all)
+    - **format**: jsonl (one record per line) or columns (one list of values per key)
+    """
+    unknown = set(types or []) - set(EXPORT_TYPES)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown export types: {', '.join(sorted(unknown))}")
+    try:
+        return await exporter.start(page_id=page_id, types=types, format=format)
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting export: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error starting export: {str(e)}")
+
+@router.get("/export")
+async def list_exports(
+    exporter: Exporter = Depends(get_exporter)
+):
+    """
+    List exports found on disk with their status.
+    """
+    return {"data": await exporter.list_exports()}
+
+@router.get("/export/{export_id}", responses={404: {"model": ErrorResponse}})
+async def get_export_status(
+    export_id: str,
+    exporter: Exporter = Depends(get_exporter)
+):
+    """
+    Get the progress of an export.
+
+    - **export_id**: ID of the export
+    """
+    try:
+        return await exporter.status(export_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Export not found: {export_id}")
+
+@router.post("/export/{export_id}/resume", status_code=202, responses={404: {"model": ErrorResponse}})
+async def resume_export(
+    export_id: str,
+    exporter: Exporter = Depends(get_exporter)
+):
+    """
+    Resume an interrupted export from its last checkpoints.
+
+    - **export_id**: ID of the export
+    """
+    try:
+        return await exporter.resume(export_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Export not found: {export_id}")
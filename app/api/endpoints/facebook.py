@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
+from app.core.error_handlers import FacebookAPIException
+from app.core.responses import model_response
 from app.services.facebook_client import FacebookClient
+from app.services.fields import resolve_fields
+from app.services.sync import SyncEngine
 from app.models.schemas import (
     PostResponse, CommentResponse, LikeResponse, 
     FollowResponse, MentionResponse, ConversationResponse, ErrorResponse
@@ -9,96 +16,361 @@ from loguru import logger
 
 router = APIRouter()
 
-def get_facebook_client():
-    """Dependency to get Facebook client instance"""
+def get_default_client(request: Request):
+    """Dependency to get the shared Facebook client instance created at startup"""
+    client = getattr(request.app.state, "facebook_client", None)
+    if client is None:
+        logger.error("Facebook client is not initialized")
+        raise HTTPException(status_code=500, detail="Facebook client initialization error: client not initialized")
+    return client
+
+def request_page_id(request):
+    """Page a request is about: its ``page_id`` parameter, or the page prefix of a ``post_id`` path parameter"""
+    page_id = request.query_params.get("page_id")
+    if page_id:
+        return page_id
+    post_id = request.path_params.get("post_id", "")
+    return post_id.split("_", 1)[0] if "_" in post_id else None
+
+async def get_facebook_client(request: Request):
+    """
+    Dependency to get the Facebook client serving the request's page.
+
+    With the client pool enabled this is a client holding a page access token
+    of the page; otherwise, and for requests about no particular page, the
+    shared client created at startup.
+    """
+    client = get_default_client(request)
+    pool = getattr(request.app.state, "client_pool", None)
+    page_id = request_page_id(request)
+    if pool is None or page_id is None:
+        return client
+    return await pool.client_for_page(page_id)
+
+def get_page_clients(request: Request):
+    """
+    Dependency returning a coroutine function that gets the client of a page ID.
+
+    Used by routes covering several pages; see ``get_facebook_client``.
+    """
+    client = get_default_client(request)
+    pool = getattr(request.app.state, "client_pool", None)
+
+    async def client_for_page(page_id):
+        if pool is None:
+            return client
+        return await pool.client_for_page(page_id)
+    return client_for_page
+
+def get_read_sync_engine(request: Request):
+    """Dependency to get the sync engine whose store serves reads of recently synced pages, if any"""
+    return getattr(request.app.state, "sync_engine", None)
+
+def field_projection(object_type):
+    """
+    Dependency factory for the ``fields`` query parameter.
+    
+    The expression is validated against the allowlist of ``object_type`` and
+    translated into Graph field strings, or None when no projection was requested.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated fields to return, with nested expansion, e.g. id,message,from{id,name}"
+        )
+    ):
+        try:
+            return resolve_fields(fields, object_type)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid fields: {str(e)}")
+    return dependency
+
+async def ndjson_response(items, action):
+    """
+    Stream items from an async iterator as newline-delimited JSON.
+    
+    The first item is fetched before the response starts so that upstream errors
+    on the first page still produce a proper error status. Errors after the
+    stream has started are reported as a final error line.
+    """
     try:
-        return FacebookClient()
+        first = await anext(items)
+    except StopAsyncIteration:
+        first = None
+    except FacebookAPIException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to initialize Facebook client: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Facebook client initialization error: {str(e)}")
+        logger.error(f"Error {action}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error {action}: {str(e)}")
+    
+    async def body():
+        if first is None:
+            return
+        yield orjson.dumps(first) + b"\n"
+        try:
+            async for item in items:
+                yield orjson.dumps(item) + b"\n"
+        except Exception as e:
+            logger.error(f"Error {action}: {str(e)}")
+            yield orjson.dumps({"error": True, "message": f"Error {action}", "details": str(e)}) + b"\n"
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+async def with_post_id(items, post_id):
+    """Add post_id to each streamed item for reference"""
+    async for item in items:
+        item["post_id"] = post_id
+        yield item
+
+@router.get("/stats")
+async def get_client_stats(
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get runtime statistics of the shared Facebook client.
+    
+    - **connection_pool**: open, active, idle and waiting connections of the upstream pool
+    - **user_cache**: size and hit/miss counters of the user profile cache
+    - **response_cache**: size and hit/miss counters of the upstream response cache
+    - **coalescing**: concurrent identical upstream calls that shared one request
+    - **search_index**: documents and terms in the local search index
+    - **rate_limits**: remaining Graph API budget per app, page and business
+    - **circuit_breakers**: state of the circuit breaker of each Graph endpoint
+    """
+    return client.stats()
+
+@router.get("/rate-limits")
+async def get_rate_limits(
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get the Graph API rate limit budgets tracked from usage headers.
+    
+    For each budget (app, page and business use case) returns the reported usage
+    percentages, the request rate currently allowed and how long it is blocked
+    after a throttling error.
+    """
+    return client.rate_limiter.stats()
+
+@router.get("/client-pool")
+async def get_client_pool_stats(request: Request):
+    """
+    Get statistics of the per-page client pool.
+
+    - **clients**: pooled clients, and how many were created and evicted
+    - **pages**: pages with a resolved page access token
+    - **fallbacks**: requests for pages without a token, served by the default client
+    - **remaining_budget**: share of the rate limit budget left per pooled token
+    """
+    pool = getattr(request.app.state, "client_pool", None)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="Client pool is disabled")
+    return pool.stats()
+
+@router.delete("/cache")
+async def invalidate_cache(
+    page_id: Optional[str] = None,
+    method: Optional[str] = None,
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Invalidate cached upstream responses.
+    
+    - **page_id**: Only invalidate responses for this page (defaults to all pages)
+    - **method**: Only invalidate responses of this client method, e.g. get_page_posts (defaults to all)
+    """
+    removed = client.invalidate_cache(page_id=page_id, method=method)
+    return {"invalidated": removed}
 
 @router.get("/page-info", responses={500: {"model": ErrorResponse}})
 async def get_page_info(
     page_id: str = "me",
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("page")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
     Get detailed information about a Facebook page.
     
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    - **fields**: Comma-separated page fields to return, with nested expansion (defaults to all)
     """
     try:
-        page_info = client.get_page_info(page_id=page_id)
+        page_info = await client.get_page_info(page_id=page_id, fields=fields, use_cache=not no_cache)
         return page_info
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving page info: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving page info: {str(e)}")
 
-@router.get("/posts", response_model=PostResponse, responses={500: {"model": ErrorResponse}})
+@router.get("/posts", response_model=PostResponse, response_model_exclude_unset=True, responses={500: {"model": ErrorResponse}})
 async def get_posts(
     page_id: str = "me",
     limit: int = Query(10, ge=1, le=100),
-    client: FacebookClient = Depends(get_facebook_client)
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("post")),
+    client: FacebookClient = Depends(get_facebook_client),
+    engine: Optional[SyncEngine] = Depends(get_read_sync_engine)
 ):
     """
     Get posts from a Facebook page.
     
+    Pages fully synced within SYNC_READ_MAX_AGE seconds are served from the
+    local store unless fields or no_cache are given.
+    
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
     - **limit**: Maximum number of posts to retrieve (1-100)
+    - **no_cache**: Bypass the response cache and the local store and fetch fresh data
+    - **fields**: Comma-separated post fields to return, with nested expansion (defaults to all)
     """
     try:
-        posts = client.get_page_posts(page_id=page_id, limit=limit)
-        return posts
+        posts = None
+        if engine is not None and fields is None and not no_cache:
+            posts = await engine.stored_posts(page_id=page_id, limit=limit)
+        if posts is None:
+            posts = await client.get_page_posts(page_id=page_id, limit=limit, fields=fields, use_cache=not no_cache)
+        return model_response(posts, PostResponse)
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving posts: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving posts: {str(e)}")
 
+@router.get("/posts/stream", responses={500: {"model": ErrorResponse}})
+async def stream_posts(
+    page_id: str = "me",
+    page_size: int = Query(100, ge=1, le=100),
+    max_items: Optional[int] = Query(None, ge=1),
+    fields: Optional[List[str]] = Depends(field_projection("post")),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Stream all posts of a Facebook page as newline-delimited JSON, following pagination.
+    
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **page_size**: Number of items fetched per upstream call (1-100)
+    - **max_items**: Stop after this many items (defaults to all)
+    - **fields**: Comma-separated post fields to return, with nested expansion (defaults to all)
+    """
+    posts = client.iter_page_posts(page_id=page_id, page_size=page_size, max_items=max_items, fields=fields)
+    return await ndjson_response(posts, "streaming posts")
+
 @router.get("/posts/{post_id}", responses={500: {"model": ErrorResponse}})
 async def get_post_details(
     post_id: str,
+    fields: Optional[List[str]] = Depends(field_projection("post")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
     Get details of a specific post.
     
     - **post_id**: ID of the Facebook post
+    - **fields**: Comma-separated post fields to return, with nested expansion (defaults to all)
     """
     try:
-        post = client.get_post_details(post_id=post_id)
+        post = await client.get_post_details(post_id=post_id, fields=fields)
         return post
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving post details: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving post details: {str(e)}")
 
-@router.get("/posts/{post_id}/comments", response_model=CommentResponse, responses={500: {"model": ErrorResponse}})
+@router.get("/posts/{post_id}/full", responses={500: {"model": ErrorResponse}})
+async def get_post_full(
+    post_id: str,
+    comments_limit: int = Query(25, ge=1, le=100),
+    likes_limit: int = Query(25, ge=1, le=100),
+    replies: bool = Query(False, description="Include replies of each comment"),
+    replies_limit: int = Query(10, ge=1, le=100),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get a post with its comments, likes and authors in a single upstream request.
+    
+    - **post_id**: ID of the Facebook post
+    - **comments_limit**: Maximum number of top-level comments (1-100)
+    - **likes_limit**: Maximum number of likes (1-100)
+    - **replies**: Include replies of each comment, threaded under ``replies``
+    - **replies_limit**: Maximum number of replies per comment (1-100)
+    """
+    try:
+        return await client.get_post_full(
+            post_id=post_id,
+            comments_limit=comments_limit,
+            likes_limit=likes_limit,
+            replies=replies,
+            replies_limit=replies_limit
+        )
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving full post: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving full post: {str(e)}")
+
+@router.get("/posts/{post_id}/comments", response_model=CommentResponse, response_model_exclude_unset=True, responses={500: {"model": ErrorResponse}})
 async def get_post_comments(
     post_id: str,
     limit: int = Query(25, ge=1, le=100),
-    client: FacebookClient = Depends(get_facebook_client)
+    fields: Optional[List[str]] = Depends(field_projection("comment")),
+    client: FacebookClient = Depends(get_facebook_client),
+    engine: Optional[SyncEngine] = Depends(get_read_sync_engine)
 ):
     """
     Get comments on a specific post with detailed user information.
     
+    Comments of posts of pages fully synced within SYNC_READ_MAX_AGE seconds
+    are served from the local store unless fields are given.
+    
     - **post_id**: ID of the Facebook post
     - **limit**: Maximum number of comments to retrieve (1-100)
+    - **fields**: Comma-separated comment fields to return, with nested expansion (defaults to all)
     """
     try:
-        comments = client.get_post_comments(post_id=post_id, limit=limit)
+        comments = None
+        if engine is not None and fields is None:
+            comments = await engine.stored_comments(post_id=post_id, limit=limit)
+        if comments is None:
+            comments = await client.get_post_comments(post_id=post_id, limit=limit, fields=fields)
         
         # Add post_id to each comment for reference
         if "data" in comments:
             for comment in comments["data"]:
                 comment["post_id"] = post_id
                 
-        return comments
+        return model_response(comments, CommentResponse)
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving comments: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving comments: {str(e)}")
 
-@router.get("/posts/{post_id}/likes", response_model=LikeResponse, responses={500: {"model": ErrorResponse}})
+@router.get("/posts/{post_id}/comments/stream", responses={500: {"model": ErrorResponse}})
+async def stream_post_comments(
+    post_id: str,
+    page_size: int = Query(100, ge=1, le=100),
+    max_items: Optional[int] = Query(None, ge=1),
+    fields: Optional[List[str]] = Depends(field_projection("comment")),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Stream all comments on a post with detailed user information as newline-delimited JSON.
+    
+    - **post_id**: ID of the Facebook post
+    - **page_size**: Number of items fetched per upstream call (1-100)
+    - **max_items**: Stop after this many items (defaults to all)
+    - **fields**: Comma-separated comment fields to return, with nested expansion (defaults to all)
+    """
+    comments = client.iter_post_comments(post_id=post_id, page_size=page_size, max_items=max_items, fields=fields)
+    return await ndjson_response(with_post_id(comments, post_id), "streaming comments")
+
+@router.get("/posts/{post_id}/likes", response_model=LikeResponse, response_model_exclude_unset=True, responses={500: {"model": ErrorResponse}})
 async def get_post_likes(
     post_id: str,
     limit: int = Query(25, ge=1, le=100),
+    fields: Optional[List[str]] = Depends(field_projection("user")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -106,24 +378,47 @@ async def get_post_likes(
     
     - **post_id**: ID of the Facebook post
     - **limit**: Maximum number of likes to retrieve (1-100)
+    - **fields**: Comma-separated liker fields to return, with nested expansion (defaults to all)
     """
     try:
-        likes = client.get_post_likes(post_id=post_id, limit=limit)
+        likes = await client.get_post_likes(post_id=post_id, limit=limit, fields=fields)
         
         # Add post_id to each like for reference
         if "data" in likes:
             for like in likes["data"]:
                 like["post_id"] = post_id
                 
-        return likes
+        return model_response(likes, LikeResponse)
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving likes: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving likes: {str(e)}")
 
+@router.get("/posts/{post_id}/likes/stream", responses={500: {"model": ErrorResponse}})
+async def stream_post_likes(
+    post_id: str,
+    page_size: int = Query(100, ge=1, le=100),
+    max_items: Optional[int] = Query(None, ge=1),
+    fields: Optional[List[str]] = Depends(field_projection("user")),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Stream all likes on a post with detailed user information as newline-delimited JSON.
+    
+    - **post_id**: ID of the Facebook post
+    - **page_size**: Number of items fetched per upstream call (1-100)
+    - **max_items**: Stop after this many items (defaults to all)
+    - **fields**: Comma-separated liker fields to return, with nested expansion (defaults to all)
+    """
+    likes = client.iter_post_likes(post_id=post_id, page_size=page_size, max_items=max_items, fields=fields)
+    return await ndjson_response(with_post_id(likes, post_id), "streaming likes")
+
 @router.get("/fans", responses={500: {"model": ErrorResponse}})
 async def get_page_fans(
     page_id: str = "me",
     limit: int = Query(25, ge=1, le=100),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -131,18 +426,23 @@ async def get_page_fans(
     
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
     - **limit**: Maximum number of data points to retrieve (1-100)
+    - **no_cache**: Bypass the response cache and fetch fresh data
     """
     try:
-        fans = client.get_page_fans(page_id=page_id, limit=limit)
+        fans = await client.get_page_fans(page_id=page_id, limit=limit, use_cache=not no_cache)
         return fans
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving fans: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving fans: {str(e)}")
 
-@router.get("/mentions", response_model=MentionResponse, responses={500: {"model": ErrorResponse}})
+@router.get("/mentions", response_model=MentionResponse, response_model_exclude_unset=True, responses={500: {"model": ErrorResponse}})
 async def get_page_mentions(
     page_id: str = "me",
     limit: int = Query(25, ge=1, le=100),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("mention")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -150,18 +450,23 @@ async def get_page_mentions(
     
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
     - **limit**: Maximum number of mentions to retrieve (1-100)
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    - **fields**: Comma-separated mention fields to return, with nested expansion (defaults to all)
     """
     try:
-        mentions = client.get_page_mentions(page_id=page_id, limit=limit)
-        return mentions
+        mentions = await client.get_page_mentions(page_id=page_id, limit=limit, fields=fields, use_cache=not no_cache)
+        return model_response(mentions, MentionResponse)
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving mentions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving mentions: {str(e)}")
 
-@router.get("/conversations", response_model=ConversationResponse, responses={500: {"model": ErrorResponse}})
+@router.get("/conversations", response_model=ConversationResponse, response_model_exclude_unset=True, responses={500: {"model": ErrorResponse}})
 async def get_page_conversations(
     page_id: str = "me",
     limit: int = Query(25, ge=1, le=100),
+    fields: Optional[List[str]] = Depends(field_projection("conversation")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -169,18 +474,41 @@ async def get_page_conversations(
     
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
     - **limit**: Maximum number of conversations to retrieve (1-100)
+    - **fields**: Comma-separated conversation fields to return, with nested expansion (defaults to all)
     """
     try:
-        conversations = client.get_page_conversations(page_id=page_id, limit=limit)
-        return conversations
+        conversations = await client.get_page_conversations(page_id=page_id, limit=limit, fields=fields)
+        return model_response(conversations, ConversationResponse)
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving conversations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving conversations: {str(e)}")
 
+@router.get("/conversations/stream", responses={500: {"model": ErrorResponse}})
+async def stream_page_conversations(
+    page_id: str = "me",
+    page_size: int = Query(25, ge=1, le=100),
+    max_items: Optional[int] = Query(None, ge=1),
+    fields: Optional[List[str]] = Depends(field_projection("conversation")),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Stream all conversations of a Facebook page as newline-delimited JSON.
+    
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **page_size**: Number of items fetched per upstream call (1-100)
+    - **max_items**: Stop after this many items (defaults to all)
+    - **fields**: Comma-separated conversation fields to return, with nested expansion (defaults to all)
+    """
+    conversations = client.iter_page_conversations(page_id=page_id, page_size=page_size, max_items=max_items, fields=fields)
+    return await ndjson_response(conversations, "streaming conversations")
+
 @router.get("/conversations/{conversation_id}", responses={500: {"model": ErrorResponse}})
 async def get_conversation_details(
     conversation_id: str,
     limit: int = Query(25, ge=1, le=100),
+    fields: Optional[List[str]] = Depends(field_projection("conversation")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -188,23 +516,17 @@ async def get_conversation_details(
     
     - **conversation_id**: ID of the Facebook conversation
     - **limit**: Maximum number of messages to retrieve (1-100)
+    - **fields**: Comma-separated conversation fields to return, with nested expansion (defaults to all)
     """
     try:
-        # Get conversation details with messages
-        fields = [
-            "id", 
-            "link", 
-            "updated_time", 
-            f"messages.limit({limit}){{message,from{{id,name,picture}},created_time}}"
-        ]
-        
-        conversation = client.graph.get_object(
-            id=conversation_id,
-            fields=",".join(fields)
+        conversation = await client.get_conversation_details(
+            conversation_id=conversation_id,
+            fields=fields,
+            limit=limit
         )
-        
-        logger.info(f"Retrieved details for conversation {conversation_id}")
         return conversation
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving conversation details: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving conversation details: {str(e)}")
@@ -215,6 +537,7 @@ async def get_page_insights(
     metrics: List[str] = Query(["page_impressions", "page_engaged_users", "page_fans"]),
     period: str = Query("day", regex="^(day|week|month|lifetime)$"),
     limit: int = Query(25, ge=1, le=100),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
@@ -224,15 +547,19 @@ async def get_page_insights(
     - **metrics**: List of metrics to retrieve
     - **period**: Time period for metrics (day, week, month, lifetime)
     - **limit**: Maximum number of data points to retrieve (1-100)
+    - **no_cache**: Bypass the response cache and fetch fresh data
     """
     try:
-        insights = client.get_page_insights(
+        insights = await client.get_page_insights(
             page_id=page_id,
             metrics=metrics,
             period=period,
-            limit=limit
+            limit=limit,
+            use_cache=not no_cache
         )
         return insights
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving page insights: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving page insights: {str(e)}")
@@ -242,22 +569,57 @@ async def search_page_feed(
     query: str,
     page_id: str = "me",
     limit: int = Query(25, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    doc_type: str = Query("post", alias="type", pattern="^(post|comment)$"),
+    fields: Optional[List[str]] = Depends(field_projection("post")),
     client: FacebookClient = Depends(get_facebook_client)
 ):
     """
     Search for posts in a page's feed.
     
+    Results are ranked from the local search index covering the page's full
+    history. The first search on a page that has not been indexed yet scans its
+    most recent posts and starts indexing in the background.
+    
     - **query**: Search query
     - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
     - **limit**: Maximum number of results to retrieve (1-100)
+    - **offset**: Number of ranked results to skip
+    - **type**: Search posts or comments
+    - **fields**: Comma-separated post fields to return, with nested expansion (defaults to all)
     """
     try:
-        search_results = client.search_page_feed(
+        search_results = await client.search_page_feed(
             page_id=page_id,
             query=query,
-            limit=limit
+            limit=limit,
+            offset=offset,
+            doc_type=doc_type,
+            fields=fields
         )
         return search_results
+    except FacebookAPIException:
+        raise
     except Exception as e:
         logger.error(f"Error searching page feed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error searching page feed: {str(e)}")
+
+@router.post("/search/index", responses={500: {"model": ErrorResponse}})
+async def build_search_index(
+    page_id: str = "me",
+    include_comments: bool = False,
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Index the full post history of a page for search.
+    
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **include_comments**: Also index the comments of every post
+    """
+    try:
+        return await client.build_search_index(page_id=page_id, include_comments=include_comments)
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building search index: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error building search index: {str(e)}")
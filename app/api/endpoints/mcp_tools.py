@@ -0,0 +1,282 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
+from app.api.endpoints.facebook import get_facebook_client
+from app.core.config import MCP_MAX_TOKEN_BUDGET, MCP_PAGE_SIZE, MCP_TOKEN_BUDGET
+from app.core.error_handlers import FacebookAPIException
+from app.services.compact import (
+    compact_comment, compact_conversation, compact_insights, compact_message, compact_page,
+    compact_post, compact_user, decode_cursor, encode_cursor, estimate_tokens, paginate
+)
+from app.services.facebook_client import FacebookClient
+from loguru import logger
+
+router = APIRouter()
+
+# Graph fields needed by the compact representations, so nothing else is fetched
+PAGE_FIELDS = ["id", "name", "category", "fan_count", "about", "link"]
+POST_FIELDS = (
+    "id,created_time,message,story,permalink_url,shares,"
+    "likes.limit(0).summary(true),comments.limit(0).summary(true)"
+)
+COMMENT_FIELDS = "id,message,created_time,from{name},like_count,comment_count"
+USER_FIELDS = "id,name"
+CONVERSATION_FIELDS = "id,updated_time,snippet,message_count,unread_count"
+MESSAGE_FIELDS = "id,created_time,from{name},message"
+
+def token_budget(
+    max_tokens: int = Query(
+        MCP_TOKEN_BUDGET, ge=1, le=MCP_MAX_TOKEN_BUDGET,
+        description="Approximate maximum size of the result in LLM tokens"
+    )
+):
+    return max_tokens
+
+async def tool_result(request, action, produce):
+    """
+    Run a tool, serving repeated identical calls of an MCP session from cache.
+
+    Calls are cached per ``Mcp-Session-Id`` header, path and query string for
+    ``MCP_SESSION_CACHE_TTL`` seconds; calls without a session are never cached.
+    A malformed cursor is reported as a 422 error.
+
+    Args:
+        request (Request): Inbound tool call.
+        action (str): Description of the tool used in error messages.
+        produce (callable): Coroutine function computing the result.
+    """
+    cache = getattr(request.app.state, "mcp_cache", None)
+    session = request.headers.get("mcp-session-id")
+    key = None
+    if cache is not None and session:
+        key = (session, request.url.path, tuple(sorted(request.query_params.multi_items())))
+        result = cache.get(key)
+        if result is not None:
+            return result
+    try:
+        result = await produce()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error {action}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error {action}: {str(e)}")
+    if key is not None:
+        cache.set(key, result)
+    return result
+
+@router.get("/page", operation_id="page_info")
+async def page_info(
+    request: Request,
+    page_id: str = "me",
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get the name, category, fan count, description and link of a Facebook page.
+
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    """
+    async def produce():
+        return compact_page(await client.get_page_info(page_id=page_id, fields=PAGE_FIELDS))
+    return await tool_result(request, "retrieving page info", produce)
+
+@router.get("/posts", operation_id="list_posts")
+async def list_posts(
+    request: Request,
+    page_id: str = "me",
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the posts of a Facebook page, newest first, with like, comment and share counts.
+
+    Returns as many posts as fit in ``max_tokens``; pass ``next_cursor`` back as
+    ``cursor`` to continue. Post texts are truncated.
+
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(client, page_id, "posts", POST_FIELDS, compact_post, max_tokens, MCP_PAGE_SIZE, cursor)
+    return await tool_result(request, "listing posts", produce)
+
+@router.get("/posts/{post_id}", operation_id="get_post")
+async def get_post(
+    request: Request,
+    post_id: str,
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get a single post with its like, comment and share counts.
+
+    - **post_id**: ID of the post
+    """
+    async def produce():
+        return compact_post(await client.get_object(post_id, fields=POST_FIELDS))
+    return await tool_result(request, "retrieving post", produce)
+
+@router.get("/posts/{post_id}/comments", operation_id="list_comments")
+async def list_comments(
+    request: Request,
+    post_id: str,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the comments of a post with their author, like and reply counts.
+
+    Returns as many comments as fit in ``max_tokens``; pass ``next_cursor`` back
+    as ``cursor`` to continue. Comment texts are truncated.
+
+    - **post_id**: ID of the post
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(client, post_id, "comments", COMMENT_FIELDS, compact_comment, max_tokens, MCP_PAGE_SIZE, cursor)
+    return await tool_result(request, "listing comments", produce)
+
+@router.get("/posts/{post_id}/likes", operation_id="list_likes")
+async def list_likes(
+    request: Request,
+    post_id: str,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the users who liked a post.
+
+    - **post_id**: ID of the post
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(client, post_id, "likes", USER_FIELDS, compact_user, max_tokens, MCP_PAGE_SIZE, cursor)
+    return await tool_result(request, "listing likes", produce)
+
+@router.get("/mentions", operation_id="list_mentions")
+async def list_mentions(
+    request: Request,
+    page_id: str = "me",
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the posts a Facebook page is tagged in.
+
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(client, page_id, "tagged", POST_FIELDS, compact_post, max_tokens, MCP_PAGE_SIZE, cursor)
+    return await tool_result(request, "listing mentions", produce)
+
+@router.get("/conversations", operation_id="list_conversations")
+async def list_conversations(
+    request: Request,
+    page_id: str = "me",
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the Messenger conversations of a Facebook page, most recently updated first.
+
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(
+            client, page_id, "conversations", CONVERSATION_FIELDS, compact_conversation, max_tokens, MCP_PAGE_SIZE, cursor
+        )
+    return await tool_result(request, "listing conversations", produce)
+
+@router.get("/conversations/{conversation_id}/messages", operation_id="list_messages")
+async def list_messages(
+    request: Request,
+    conversation_id: str,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    List the messages of a conversation, newest first.
+
+    - **conversation_id**: ID of the conversation
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        return await paginate(
+            client, conversation_id, "messages", MESSAGE_FIELDS, compact_message, max_tokens, MCP_PAGE_SIZE, cursor
+        )
+    return await tool_result(request, "listing messages", produce)
+
+@router.get("/insights", operation_id="page_insights")
+async def page_insights(
+    request: Request,
+    page_id: str = "me",
+    metrics: List[str] = Query(["page_impressions", "page_engaged_users", "page_fans"]),
+    period: str = Query("day", pattern="^(day|week|month|lifetime)$"),
+    limit: int = Query(7, ge=1, le=100, description="Data points per metric"),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Get page metrics as ``{"metric/period": [[date, value], ...]}``.
+
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    - **metrics**: Metrics to retrieve
+    - **period**: Time period for metrics (day, week, month, lifetime)
+    - **limit**: Data points per metric (1-100)
+    """
+    async def produce():
+        insights = await client.get_page_insights(page_id=page_id, metrics=metrics, period=period, limit=limit)
+        return compact_insights(insights, points=limit)
+    return await tool_result(request, "retrieving page insights", produce)
+
+@router.get("/search", operation_id="search_posts")
+async def search_posts(
+    request: Request,
+    query: str,
+    page_id: str = "me",
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous call"),
+    max_tokens: int = Depends(token_budget),
+    client: FacebookClient = Depends(get_facebook_client)
+):
+    """
+    Search the posts of a Facebook page, best matches first.
+
+    - **query**: Search query
+    - **page_id**: ID of the Facebook page (defaults to the authenticated page)
+    - **cursor**: Continue after the previous call
+    - **max_tokens**: Approximate maximum size of the result
+    """
+    async def produce():
+        offset = int(decode_cursor(cursor).get("offset", 0)) if cursor else 0
+        results = await client.search_page_feed(
+            page_id=page_id, query=query, limit=MCP_PAGE_SIZE, offset=offset, fields=POST_FIELDS.split(",")
+        )
+        data = results.get("data", [])
+        items = []
+        used = 0
+        for item in map(compact_post, data):
+            cost = estimate_tokens(item)
+            if items and used + cost > max_tokens:
+                break
+            items.append(item)
+            used += cost
+        next_offset = offset + len(items)
+        has_more = len(items) < len(data) or results.get("paging", {}).get("next_offset") is not None
+        return {
+            "items": items,
+            "next_cursor": encode_cursor({"offset": next_offset}) if has_more else None,
+            "tokens": used
+        }
+    return await tool_result(request, "searching posts", produce)
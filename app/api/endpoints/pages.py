@@ -0,0 +1,155 @@
+import time
+
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.api.endpoints.facebook import get_page_clients, field_projection
+from app.core.config import FANOUT_CONCURRENCY, FANOUT_MAX_PAGES
+from app.services.fanout import fan_out, error_details
+from loguru import logger
+
+router = APIRouter()
+
+def parse_page_ids(page_ids):
+    """Accept repeated and comma-separated page IDs, dropping duplicates while keeping order"""
+    ids = list(dict.fromkeys(
+        page_id.strip() for value in page_ids for page_id in value.split(",") if page_id.strip()
+    ))
+    if not ids:
+        raise HTTPException(status_code=422, detail="At least one page ID is required")
+    if len(ids) > FANOUT_MAX_PAGES:
+        raise HTTPException(status_code=422, detail=f"At most {FANOUT_MAX_PAGES} page IDs can be requested at once")
+    return ids
+
+def fan_out_response(page_ids, fetch, concurrency, action):
+    """
+    Fetch every page concurrently and stream one NDJSON line per page as it completes.
+
+    Each line carries the page ID and either its ``data`` or its ``error``; a
+    final summary line reports counts and the total duration.
+    """
+    async def body():
+        started = time.perf_counter()
+        succeeded = failed = 0
+        async for page_id, result, error in fan_out(page_ids, fetch, concurrency):
+            if error is None:
+                succeeded += 1
+                yield orjson.dumps({"page_id": page_id, "data": result}) + b"\n"
+            else:
+                failed += 1
+                logger.error(f"Error {action} for page {page_id}: {str(error)}")
+                yield orjson.dumps({"page_id": page_id, "error": error_details(error)}) + b"\n"
+        yield orjson.dumps({
+            "summary": {
+                "pages": len(page_ids),
+                "succeeded": succeeded,
+                "failed": failed,
+                "duration_seconds": round(time.perf_counter() - started, 3)
+            }
+        }) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+@router.get("/pages/page-info")
+async def get_pages_info(
+    page_ids: List[str] = Query(..., description="Page IDs, repeated or comma-separated"),
+    concurrency: int = Query(FANOUT_CONCURRENCY, ge=1, le=FANOUT_CONCURRENCY),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("page")),
+    clients = Depends(get_page_clients)
+):
+    """
+    Get information about several Facebook pages, streamed as newline-delimited JSON.
+
+    - **page_ids**: IDs of the Facebook pages
+    - **concurrency**: Maximum number of pages fetched at once
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    - **fields**: Comma-separated page fields to return, with nested expansion (defaults to all)
+    """
+    async def fetch(page_id):
+        client = await clients(page_id)
+        return await client.get_page_info(page_id=page_id, fields=fields, use_cache=not no_cache)
+
+    return fan_out_response(parse_page_ids(page_ids), fetch, concurrency, "retrieving page info")
+
+@router.get("/pages/posts")
+async def get_pages_posts(
+    page_ids: List[str] = Query(..., description="Page IDs, repeated or comma-separated"),
+    limit: int = Query(10, ge=1, le=100),
+    concurrency: int = Query(FANOUT_CONCURRENCY, ge=1, le=FANOUT_CONCURRENCY),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("post")),
+    clients = Depends(get_page_clients)
+):
+    """
+    Get posts of several Facebook pages, streamed as newline-delimited JSON.
+
+    - **page_ids**: IDs of the Facebook pages
+    - **limit**: Maximum number of posts to retrieve per page (1-100)
+    - **concurrency**: Maximum number of pages fetched at once
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    - **fields**: Comma-separated post fields to return, with nested expansion (defaults to all)
+    """
+    async def fetch(page_id):
+        client = await clients(page_id)
+        return await client.get_page_posts(page_id=page_id, limit=limit, fields=fields, use_cache=not no_cache)
+
+    return fan_out_response(parse_page_ids(page_ids), fetch, concurrency, "retrieving posts")
+
+@router.get("/pages/insights")
+async def get_pages_insights(
+    page_ids: List[str] = Query(..., description="Page IDs, repeated or comma-separated"),
+    metrics: List[str] = Query(["page_impressions", "page_engaged_users", "page_fans"]),
+    period: str = Query("day", pattern="^(day|week|month|lifetime)$"),
+    limit: int = Query(25, ge=1, le=100),
+    concurrency: int = Query(FANOUT_CONCURRENCY, ge=1, le=FANOUT_CONCURRENCY),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    clients = Depends(get_page_clients)
+):
+    """
+    Get insights of several Facebook pages, streamed as newline-delimited JSON.
+
+    - **page_ids**: IDs of the Facebook pages
+    - **metrics**: List of metrics to retrieve
+    - **period**: Time period for metrics (day, week, month, lifetime)
+    - **limit**: Maximum number of data points to retrieve per page (1-100)
+    - **concurrency**: Maximum number of pages fetched at once
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    """
+    async def fetch(page_id):
+        client = await clients(page_id)
+        return await client.get_page_insights(
+            page_id=page_id,
+            metrics=metrics,
+            period=period,
+            limit=limit,
+            use_cache=not no_cache
+        )
+
+    return fan_out_response(parse_page_ids(page_ids), fetch, concurrency, "retrieving page insights")
+
+@router.get("/pages/mentions")
+async def get_pages_mentions(
+    page_ids: List[str] = Query(..., description="Page IDs, repeated or comma-separated"),
+    limit: int = Query(25, ge=1, le=100),
+    concurrency: int = Query(FANOUT_CONCURRENCY, ge=1, le=FANOUT_CONCURRENCY),
+    no_cache: bool = Query(False, description="Bypass the response cache and fetch fresh data"),
+    fields: Optional[List[str]] = Depends(field_projection("mention")),
+    clients = Depends(get_page_clients)
+):
+    """
+    Get tagged posts/mentions of several Facebook pages, streamed as newline-delimited JSON.
+
+    - **page_ids**: IDs of the Facebook pages
+    - **limit**: Maximum number of mentions to retrieve per page (1-100)
+    - **concurrency**: Maximum number of pages fetched at once
+    - **no_cache**: Bypass the response cache and fetch fresh data
+    - **fields**: Comma-separated mention fields to return, with nested expansion (defaults to all)
+    """
+    async def fetch(page_id):
+        client = await clients(page_id)
+        return await client.get_page_mentions(page_id=page_id, limit=limit, fields=fields, use_cache=not no_cache)
+
+    return fan_out_response(parse_page_ids(page_ids), fetch, concurrency, "retrieving mentions")
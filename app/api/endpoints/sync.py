@@ -0,0 +1,241 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.core.error_handlers import FacebookAPIException
+from app.services.sync import SyncEngine
+from app.models.schemas import ErrorResponse
+from loguru import logger
+
+router = APIRouter()
+
+def get_sync_engine(request: Request):
+    """Dependency to get the sync engine created at startup"""
+    engine = getattr(request.app.state, "sync_engine", None)
+    if engine is None:
+        logger.error("Sync engine is not initialized")
+        raise HTTPException(status_code=500, detail="Sync engine initialization error: engine not initialized")
+    return engine
+
+@router.post("/sync", responses={500: {"model": ErrorResponse}})
+async def sync_page(
+    page_id: str = "me",
+    include_comments: bool = True,
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Pull new and recently changed posts (and their comments) into the local store.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **include_comments**: Also sync comments of new and changed posts
+    """
+    try:
+        return await engine.sync_page(page_id=page_id, include_comments=include_comments)
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error syncing page: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error syncing page: {str(e)}")
+
+@router.post("/sync/conversations", responses={500: {"model": ErrorResponse}})
+async def sync_conversations(
+    page_id: str = "me",
+    include_messages: bool = True,
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Pull changed conversations (and their new messages) into the local store.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **include_messages**: Also sync new messages of changed conversations
+    """
+    try:
+        return await engine.sync_conversations(page_id=page_id, include_messages=include_messages)
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error syncing conversations: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error syncing conversations: {str(e)}")
+
+@router.post("/sync/insights", responses={500: {"model": ErrorResponse}})
+async def sync_insights(
+    page_id: str = "me",
+    metrics: Optional[List[str]] = Query(None),
+    period: str = Query("day", pattern="^(day|week|days_28)$"),
+    days: int = Query(365, ge=1, le=730),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Pull insights series of a page into the local insights store.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **metrics**: Metrics to sync (defaults to the configured INSIGHTS_METRICS)
+    - **period**: Insights period of the series (day, week, days_28)
+    - **days**: Days of history to backfill on the first sync (1-730)
+    """
+    try:
+        return await engine.sync_insights(page_id=page_id, metrics=metrics, period=period, days=days)
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error syncing insights: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error syncing insights: {str(e)}")
+
+@router.get("/sync/status")
+async def get_sync_status(
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Get the size of the local store and the result of the last sync of each page.
+    """
+    return await asyncio.to_thread(engine.stats)
+
+@router.get("/store/posts", responses={500: {"model": ErrorResponse}})
+async def get_stored_posts(
+    page_id: str = "me",
+    limit: int = Query(25, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Get synced posts of a page from the local store, newest first.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **limit**: Maximum number of posts to return (1-1000)
+    - **offset**: Number of posts to skip
+    """
+    try:
+        page_key = await engine.client.resolve_page_id(page_id)
+        total, posts = await asyncio.to_thread(engine.store.get_posts, page_key, limit, offset)
+        return {"data": posts, "paging": {"total": total, "offset": offset, "limit": limit}}
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving stored posts: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving stored posts: {str(e)}")
+
+@router.get("/store/posts/{post_id}/comments", responses={500: {"model": ErrorResponse}})
+async def get_stored_comments(
+    post_id: str,
+    limit: int = Query(25, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Get synced comments of a post from the local store, oldest first.
+
+    - **post_id**: ID of the Facebook post
+    - **limit**: Maximum number of comments to return (1-1000)
+    - **offset**: Number of comments to skip
+    """
+    try:
+        total, comments = await asyncio.to_thread(engine.store.get_comments, post_id, limit, offset)
+        return {"data": comments, "paging": {"total": total, "offset": offset, "limit": limit}}
+    except Exception as e:
+        logger.error(f"Error retrieving stored comments: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving stored comments: {str(e)}")
+
+@router.get("/inbox", responses={500: {"model": ErrorResponse}})
+async def get_inbox(
+    page_id: str = "me",
+    limit: int = Query(25, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    messages: int = Query(10, ge=0, le=100, description="Latest messages embedded in each conversation"),
+    refresh: bool = Query(True, description="Delta sync changed conversations before reading the store"),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Get the conversations of a page with their latest messages, most recently updated first.
+
+    Served from the local store. With ``refresh`` the inbox is first delta
+    synced, which costs a single upstream request when nothing changed.
+
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **limit**: Maximum number of conversations to return (1-100)
+    - **offset**: Number of conversations to skip
+    - **messages**: Latest messages embedded in each conversation (0-100)
+    - **refresh**: Delta sync changed conversations first
+    """
+    try:
+        page_key = await engine.client.resolve_page_id(page_id)
+        sync = await engine.sync_conversations(page_id=page_key) if refresh else None
+        total, conversations = await asyncio.to_thread(engine.store.get_conversations, page_key, limit, offset, messages)
+        return {"data": conversations, "paging": {"total": total, "offset": offset, "limit": limit}, "sync": sync}
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving inbox: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving inbox: {str(e)}")
+
+@router.get("/inbox/{conversation_id}/messages", responses={500: {"model": ErrorResponse}})
+async def get_inbox_messages(
+    conversation_id: str,
+    limit: int = Query(25, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    refresh: bool = Query(False, description="Pull messages newer than the stored ones first"),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Get stored messages of a conversation, newest first.
+
+    - **conversation_id**: ID of the conversation
+    - **limit**: Maximum number of messages to return (1-1000)
+    - **offset**: Number of messages to skip
+    - **refresh**: Pull messages newer than the stored ones first
+    """
+    try:
+        if refresh:
+            await engine.sync_conversation_messages(conversation_id)
+        total, messages = await asyncio.to_thread(engine.store.get_messages, conversation_id, limit, offset)
+        return {"data": messages, "paging": {"total": total, "offset": offset, "limit": limit}}
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving stored messages: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving stored messages: {str(e)}")
+
+@router.get("/store/insights/rollup", responses={500: {"model": ErrorResponse}})
+async def get_insights_rollup(
+    metric: str,
+    page_id: str = "me",
+    period: str = Query("day", pattern="^(day|week|days_28)$"),
+    window: str = Query("week", pattern="^(week|month|[1-9][0-9]*)$"),
+    since: Optional[int] = Query(None, description="Unix timestamp of the earliest end_time to include"),
+    until: Optional[int] = Query(None, description="Unix timestamp before which end_times are included"),
+    moving_average: int = Query(7, ge=0, le=365),
+    engine: SyncEngine = Depends(get_sync_engine)
+):
+    """
+    Aggregate a stored insights series without calling the Graph API.
+
+    - **metric**: Insights metric name (e.g. page_impressions)
+    - **page_id**: ID of the Facebook page (defaults to authenticated user's page)
+    - **period**: Insights period of the series (day, week, days_28)
+    - **window**: Rollup window: week, month or a number of days
+    - **since**: Only include points ending at or after this Unix timestamp
+    - **until**: Only include points ending before this Unix timestamp
+    - **moving_average**: Points in the trailing moving average (0 disables it)
+    """
+    if engine.insights_store is None:
+        raise HTTPException(status_code=500, detail="Insights store is not configured")
+    try:
+        started = time.perf_counter()
+        page_key = await engine.client.resolve_page_id(page_id)
+        rollup = await asyncio.to_thread(
+            engine.insights_store.rollup,
+            page_key,
+            metric,
+            period,
+            window if window in ("week", "month") else int(window),
+            since,
+            until,
+            moving_average
+        )
+        rollup["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return rollup
+    except FacebookAPIException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing insights rollup: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error computing insights rollup: {str(e)}")
@@ -0,0 +1,37 @@
+from loguru import logger
+
+from app.core.config import API_V1_STR, MCP_SESSION_CACHE_MAX_ENTRIES, MCP_SESSION_CACHE_TTL
+from app.services.cache import TTLCache
+
+def mount_mcp(app):
+    """
+    Expose the compact MCP tool routes as MCP tools under ``/mcp``.
+
+    Only the routes of ``app.api.endpoints.mcp_tools`` become tools: they return
+    trimmed, token-budgeted results with continuation cursors instead of raw
+    Graph payloads. The ``Mcp-Session-Id`` header is forwarded to them so that
+    repeated calls within a session are served from ``app.state.mcp_cache``.
+
+    fastapi_mcp is imported here rather than at module level as loading it takes
+    longer than the rest of the application together; deployments that do not
+    enable MCP never pay for it. Must be called after every router is included.
+
+    Args:
+        app (FastAPI): Application whose routes become tools.
+    """
+    from fastapi_mcp import FastApiMCP
+    from app.api.endpoints import mcp_tools
+
+    app.include_router(mcp_tools.router, prefix=f"{API_V1_STR}/mcp", tags=["mcp"])
+    app.state.mcp_cache = TTLCache(max_entries=MCP_SESSION_CACHE_MAX_ENTRIES, ttl=MCP_SESSION_CACHE_TTL)
+
+    mcp = FastApiMCP(
+        app,
+        name=app.title,
+        description=app.description,
+        include_tags=["mcp"],
+        headers=["authorization", "mcp-session-id"]
+    )
+    mcp.mount_http()
+    logger.info("MCP server mounted at /mcp")
+    return mcp
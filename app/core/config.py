@@ -8,15 +8,174 @@ load_dotenv()
 # Facebook API configuration
 FACEBOOK_ACCESS_TOKEN = os.getenv("FACEBOOK_ACCESS_TOKEN")
 FACEBOOK_API_VERSION = os.getenv("FACEBOOK_API_VERSION", "2.12")
+FACEBOOK_GRAPH_URL = os.getenv("FACEBOOK_GRAPH_URL", "https://graph.facebook.com").rstrip("/")
+
+# Upstream HTTP connection pool settings
+FACEBOOK_HTTP_MAX_CONNECTIONS = int(os.getenv("FACEBOOK_HTTP_MAX_CONNECTIONS", "100"))
+FACEBOOK_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("FACEBOOK_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+FACEBOOK_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("FACEBOOK_HTTP_KEEPALIVE_EXPIRY", "30"))
+FACEBOOK_HTTP_TIMEOUT = float(os.getenv("FACEBOOK_HTTP_TIMEOUT", "30"))
+FACEBOOK_HTTP_CONNECT_TIMEOUT = float(os.getenv("FACEBOOK_HTTP_CONNECT_TIMEOUT", "5"))
+FACEBOOK_HTTP_POOL_TIMEOUT = float(os.getenv("FACEBOOK_HTTP_POOL_TIMEOUT", "10"))
+
+# User profile cache used when enriching comments and likes
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "3600"))
+
+# Upstream response cache for page level reads (TTLs in seconds)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_TTL_PAGE_INFO = float(os.getenv("RESPONSE_CACHE_TTL_PAGE_INFO", "900"))
+RESPONSE_CACHE_TTL_POSTS = float(os.getenv("RESPONSE_CACHE_TTL_POSTS", "30"))
+RESPONSE_CACHE_TTL_INSIGHTS = float(os.getenv("RESPONSE_CACHE_TTL_INSIGHTS", "300"))
+RESPONSE_CACHE_TTL_FANS = float(os.getenv("RESPONSE_CACHE_TTL_FANS", "300"))
+RESPONSE_CACHE_TTL_MENTIONS = float(os.getenv("RESPONSE_CACHE_TTL_MENTIONS", "60"))
+
+# Rate limit scheduler driven by Graph usage headers
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_MAX_RATE = float(os.getenv("RATE_LIMIT_MAX_RATE", "20"))
+RATE_LIMIT_MIN_RATE = float(os.getenv("RATE_LIMIT_MIN_RATE", "0.2"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "20"))
+RATE_LIMIT_PACING_THRESHOLD = float(os.getenv("RATE_LIMIT_PACING_THRESHOLD", "60"))
+RATE_LIMIT_USAGE_WINDOW = float(os.getenv("RATE_LIMIT_USAGE_WINDOW", "3600"))
+RATE_LIMIT_THROTTLE_COOLDOWN = float(os.getenv("RATE_LIMIT_THROTTLE_COOLDOWN", "60"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+
+# Retries and circuit breakers around Graph API requests
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+
+# Local sync store for posts and comments
+SYNC_DB_PATH = os.getenv("SYNC_DB_PATH", "data/facebook_sync.db")
+SYNC_REFRESH_WINDOW = float(os.getenv("SYNC_REFRESH_WINDOW", str(3 * 24 * 3600)))
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "4"))
+SYNC_INTERVAL = float(os.getenv("SYNC_INTERVAL", "0"))
+SYNC_PAGE_IDS = [page_id for page_id in os.getenv("SYNC_PAGE_IDS", "").split(",") if page_id]
+SYNC_CONVERSATIONS = os.getenv("SYNC_CONVERSATIONS", "false").lower() == "true"
+SYNC_MESSAGE_BACKFILL = int(os.getenv("SYNC_MESSAGE_BACKFILL", "100"))
+SYNC_MESSAGE_MAX_FAILURES = int(os.getenv("SYNC_MESSAGE_MAX_FAILURES", "3"))
+# Posts and comments of pages fully synced within this many seconds are read from the store; 0 always reads Graph
+SYNC_READ_MAX_AGE = float(os.getenv("SYNC_READ_MAX_AGE", "900"))
+
+# Full-text search index; indexed pages are topped up with newer posts at most this often
+SEARCH_INDEX_REFRESH_INTERVAL = float(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", "300"))
+
+# Bulk page exports
+EXPORT_DIR = os.getenv("EXPORT_DIR", "data/exports")
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", "3"))
+
+# Multi-page fan-out requests
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "10"))
+FANOUT_MAX_PAGES = int(os.getenv("FANOUT_MAX_PAGES", "500"))
+
+# Insights time series store
+INSIGHTS_STORE_DIR = os.getenv("INSIGHTS_STORE_DIR", "data/insights")
+INSIGHTS_METRICS = os.getenv(
+    "INSIGHTS_METRICS",
+    "page_impressions,page_engaged_users,page_post_engagements,page_fans,page_views_total"
+).split(",")
+INSIGHTS_BACKFILL_DAYS = int(os.getenv("INSIGHTS_BACKFILL_DAYS", "365"))
+
+# Response serialization: skip response_model re-validation and encode with orjson,
+# validating only a sample of responses (set the rate to 1 while debugging)
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "true").lower() in ("1", "true", "yes")
+RESPONSE_VALIDATION_SAMPLE_RATE = float(os.getenv("RESPONSE_VALIDATION_SAMPLE_RATE", "0.01"))
+
+# Page webhooks
+FACEBOOK_APP_SECRET = os.getenv("FACEBOOK_APP_SECRET")
+FACEBOOK_WEBHOOK_VERIFY_TOKEN = os.getenv("FACEBOOK_WEBHOOK_VERIFY_TOKEN")
+
+# Metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_LATENCY_BUCKETS = [
+    float(bucket) for bucket in
+    os.getenv("METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")
+]
+
+# Tracing and logging
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "logs/traces.jsonl")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+LOG_FILE = os.getenv("LOG_FILE", "logs/facebook_api.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Fraction of requests whose INFO lines from the hot-path modules are kept
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "0.1"))
+LOG_SAMPLED_MODULES = [
+    module for module in os.getenv("LOG_SAMPLED_MODULES", "app.services.facebook_client").split(",") if module
+]
+
+# Startup
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+WARMUP_PAGE_IDS = [page_id for page_id in os.getenv("WARMUP_PAGE_IDS", "me").split(",") if page_id]
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "4"))
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+
+# MCP server mode
+MCP_ENABLED = os.getenv("MCP_ENABLED", "false").lower() == "true"
+MCP_TOKEN_BUDGET = int(os.getenv("MCP_TOKEN_BUDGET", "2000"))
+MCP_MAX_TOKEN_BUDGET = int(os.getenv("MCP_MAX_TOKEN_BUDGET", "8000"))
+MCP_TEXT_MAX_CHARS = int(os.getenv("MCP_TEXT_MAX_CHARS", "280"))
+MCP_PAGE_SIZE = int(os.getenv("MCP_PAGE_SIZE", "25"))
+MCP_SESSION_CACHE_TTL = float(os.getenv("MCP_SESSION_CACHE_TTL", "120"))
+MCP_SESSION_CACHE_MAX_ENTRIES = int(os.getenv("MCP_SESSION_CACHE_MAX_ENTRIES", "1000"))
+
+# Per-page client pool
+CLIENT_POOL_ENABLED = os.getenv("CLIENT_POOL_ENABLED", "false").lower() == "true"
+CLIENT_POOL_USER_TOKENS = [token for token in os.getenv("CLIENT_POOL_USER_TOKENS", "").split(",") if token]
+CLIENT_POOL_MAX_CLIENTS = int(os.getenv("CLIENT_POOL_MAX_CLIENTS", "500"))
+CLIENT_POOL_IDLE_TTL = float(os.getenv("CLIENT_POOL_IDLE_TTL", "1800"))
+PAGE_TOKEN_CACHE_TTL = float(os.getenv("PAGE_TOKEN_CACHE_TTL", "3600"))
 
 # API settings
 API_V1_STR = "/api/v1"
 PROJECT_NAME = "Facebook Page Manager API"
 
-# Configure logger
-logger.add("logs/facebook_api.log", rotation="10 MB", level="INFO")
+def validate_config():
+    """
+    Check the configuration, called on startup rather than on import.
 
-# Validate required environment variables
-if not FACEBOOK_ACCESS_TOKEN:
-    logger.error("FACEBOOK_ACCESS_TOKEN environment variable is not set")
-    raise ValueError("FACEBOOK_ACCESS_TOKEN environment variable is not set")
+    Raises:
+        ValueError: Listing every invalid setting.
+    """
+    problems = []
+    if not FACEBOOK_ACCESS_TOKEN:
+        problems.append("FACEBOOK_ACCESS_TOKEN environment variable is not set")
+    for name, value in (
+        ("RESPONSE_VALIDATION_SAMPLE_RATE", RESPONSE_VALIDATION_SAMPLE_RATE),
+        ("TRACE_SAMPLE_RATE", TRACE_SAMPLE_RATE),
+        ("LOG_INFO_SAMPLE_RATE", LOG_INFO_SAMPLE_RATE)
+    ):
+        if not 0 <= value <= 1:
+            problems.append(f"{name} must be between 0 and 1, got {value}")
+    for name, value in (
+        ("FACEBOOK_HTTP_MAX_CONNECTIONS", FACEBOOK_HTTP_MAX_CONNECTIONS),
+        ("SYNC_CONCURRENCY", SYNC_CONCURRENCY),
+        ("SYNC_MESSAGE_BACKFILL", SYNC_MESSAGE_BACKFILL),
+        ("SYNC_MESSAGE_MAX_FAILURES", SYNC_MESSAGE_MAX_FAILURES),
+        ("EXPORT_CHUNK_SIZE", EXPORT_CHUNK_SIZE),
+        ("EXPORT_CONCURRENCY", EXPORT_CONCURRENCY),
+        ("FANOUT_CONCURRENCY", FANOUT_CONCURRENCY),
+        ("FANOUT_MAX_PAGES", FANOUT_MAX_PAGES),
+        ("RETRY_MAX_ATTEMPTS", RETRY_MAX_ATTEMPTS),
+        ("WARMUP_CONNECTIONS", WARMUP_CONNECTIONS),
+        ("MCP_TOKEN_BUDGET", MCP_TOKEN_BUDGET),
+        ("MCP_PAGE_SIZE", MCP_PAGE_SIZE),
+        ("CLIENT_POOL_MAX_CLIENTS", CLIENT_POOL_MAX_CLIENTS)
+    ):
+        if value < 1:
+            problems.append(f"{name} must be at least 1, got {value}")
+    if MCP_TOKEN_BUDGET > MCP_MAX_TOKEN_BUDGET:
+        problems.append("MCP_TOKEN_BUDGET must not exceed MCP_MAX_TOKEN_BUDGET")
+    if RATE_LIMIT_MIN_RATE > RATE_LIMIT_MAX_RATE:
+        problems.append("RATE_LIMIT_MIN_RATE must not exceed RATE_LIMIT_MAX_RATE")
+    if FACEBOOK_WEBHOOK_VERIFY_TOKEN and not FACEBOOK_APP_SECRET:
+        problems.append("FACEBOOK_APP_SECRET is required to verify webhook deliveries")
+    
+    for problem in problems:
+        logger.error(problem)
+    if problems:
+        raise ValueError("Invalid configuration: " + "; ".join(problems))
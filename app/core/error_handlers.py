@@ -3,37 +3,58 @@ from fastapi.responses import JSONResponse
 from facebook import GraphAPIError
 from loguru import logger
 
+from app.core.config import RATE_LIMIT_THROTTLE_COOLDOWN
+
 class FacebookAPIException(Exception):
     """Custom exception for Facebook API errors"""
-    def __init__(self, status_code: int, message: str, details: str = None):
+    def __init__(self, status_code: int, message: str, details: str = None, retry_after: int = None):
         self.status_code = status_code
         self.message = message
         self.details = details
+        self.retry_after = retry_after
         super().__init__(self.message)
 
 async def facebook_exception_handler(request: Request, exc: GraphAPIError):
     """Handler for Facebook GraphAPIError exceptions"""
-    status_code = getattr(exc, "code", 500)
+    # Imported here as the rate limiter raises FacebookAPIException from this module
+    from app.services.rate_limiter import THROTTLE_ERROR_CODES
+    
+    status_code = getattr(exc, "http_status", None) or 500
     message = str(exc)
+    headers = None
+    
+    if getattr(exc, "code", None) in THROTTLE_ERROR_CODES:
+        # Set by the client from the rate limiter when it paused the throttled budget
+        retry_after = getattr(exc, "retry_after", None) or int(RATE_LIMIT_THROTTLE_COOLDOWN)
+        status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        headers = {"Retry-After": str(retry_after)}
     
     logger.error(f"Facebook API error: {message}")
     
     return JSONResponse(
         status_code=status_code,
-        content={"error": True, "message": "Facebook API error", "details": message}
+        content={"error": True, "message": "Facebook API error", "details": message},
+        headers=headers
     )
 
 async def facebook_api_exception_handler(request: Request, exc: FacebookAPIException):
     """Handler for custom FacebookAPIException"""
     logger.error(f"Facebook API exception: {exc.message}")
     
+    content = {
+        "error": True,
+        "message": exc.message,
+        "details": exc.details
+    }
+    headers = None
+    if exc.retry_after is not None:
+        content["retry_after"] = exc.retry_after
+        headers = {"Retry-After": str(exc.retry_after)}
+    
     return JSONResponse(
         status_code=exc.status_code,
-        content={
-            "error": True,
-            "message": exc.message,
-            "details": exc.details
-        }
+        content=content,
+        headers=headers
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
@@ -0,0 +1,70 @@
+import random
+import sys
+import zlib
+
+from loguru import logger
+
+from app.core.config import LOG_FILE, LOG_INFO_SAMPLE_RATE, LOG_LEVEL, LOG_SAMPLED_MODULES
+from app.core.tracing import get_request_id
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {extra[request_id]} | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+def _add_request_id(record):
+    record["extra"].setdefault("request_id", get_request_id() or "-")
+
+def _is_sampled(request_id):
+    """Keep or drop all sampled lines of a request together, so kept requests stay complete."""
+    if LOG_INFO_SAMPLE_RATE >= 1:
+        return True
+    if request_id == "-":
+        return random.random() < LOG_INFO_SAMPLE_RATE
+    return zlib.crc32(request_id.encode()) % 10000 < LOG_INFO_SAMPLE_RATE * 10000
+
+def sample_filter(record):
+    """
+    Drop a share of the INFO and lower lines of the hot-path modules.
+
+    Warnings and errors, and lines from other modules, are always kept.
+    """
+    if record["level"].no >= logger.level("WARNING").no:
+        return True
+    if record["extra"].get("sampled"):
+        return True
+    if not any(record["name"].startswith(module) for module in LOG_SAMPLED_MODULES):
+        return True
+    return _is_sampled(record["extra"]["request_id"])
+
+class SampledLogger:
+    """
+    Logger for hot-path INFO lines that samples them before they are formatted.
+
+    loguru formats a message before any sink filter sees it, so lines dropped by
+    ``sample_filter`` still cost their formatting. Lines logged through this
+    logger with loguru's ``"{}"`` placeholders are kept or dropped with the same
+    per-request decision first, and only kept lines are formatted.
+    """
+
+    def __init__(self):
+        self._logger = logger.bind(sampled=True)
+
+    def info(self, message, *args):
+        if _is_sampled(get_request_id() or "-"):
+            self._logger.opt(depth=1).info(message, *args)
+
+sampled_logger = SampledLogger()
+
+def configure_logging():
+    """
+    Replace the default loguru sink with enqueued console and file sinks.
+
+    Records are formatted and written by loguru's background worker, so a log
+    call on the request path only pays for putting the record on a queue.
+    Every record carries the ID of the request it was logged for.
+    """
+    logger.remove()
+    logger.configure(patcher=_add_request_id)
+    logger.add(sys.stderr, level=LOG_LEVEL, format=LOG_FORMAT, filter=sample_filter, enqueue=True)
+    logger.add(LOG_FILE, level=LOG_LEVEL, format=LOG_FORMAT, filter=sample_filter, enqueue=True, rotation="10 MB")
@@ -0,0 +1,246 @@
+import time
+from contextvars import ContextVar
+
+from app.core.config import METRICS_LATENCY_BUCKETS
+from app.core.tracing import current_operation, route_template
+
+# Upstream calls made while serving the current inbound request
+_request_calls = ContextVar("request_graph_calls", default=None)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base of the metric types: a name, help text and one sample per label combination."""
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        """Render the metric in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, value in sorted(self._samples.items()):
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._samples[key] = self._samples.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Mirror a count kept elsewhere, e.g. the hit counter of a cache."""
+        self._samples[self._key(labels)] = value
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    type = "gauge"
+
+    def set(self, value, **labels):
+        self._samples[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._samples[key] = self._samples.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(Metric):
+    """Distribution of observations over cumulative buckets."""
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        sample = self._samples.get(key)
+        if sample is None:
+            sample = self._samples[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts = sample[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        sample[1] += value
+        sample[2] += 1
+
+    def _render_sample(self, key, sample):
+        counts, total, count = sample
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+HTTP_REQUESTS = Counter(
+    "facebook_api_http_requests_total", "Inbound HTTP requests by route and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "facebook_api_http_request_duration_seconds", "Inbound request latency until the last body chunk is sent",
+    ["method", "route"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "facebook_api_http_requests_in_flight", "Inbound HTTP requests currently being served"
+)
+HTTP_GRAPH_CALLS = Histogram(
+    "facebook_api_http_request_graph_calls", "Upstream Graph calls made to serve one inbound request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+GRAPH_REQUESTS = Counter(
+    "facebook_api_graph_requests_total", "Upstream Graph API calls by client method, endpoint and HTTP status",
+    ["operation", "endpoint", "status"]
+)
+GRAPH_REQUEST_DURATION = Histogram(
+    "facebook_api_graph_request_duration_seconds", "Upstream Graph API call latency",
+    ["operation", "endpoint"]
+)
+GRAPH_REQUESTS_IN_FLIGHT = Gauge(
+    "facebook_api_graph_requests_in_flight", "Upstream Graph API calls currently in flight"
+)
+GRAPH_ERRORS = Counter(
+    "facebook_api_graph_errors_total", "Graph API errors by endpoint and Graph error code",
+    ["endpoint", "code"]
+)
+CACHE_HITS = Counter("facebook_api_cache_hits_total", "Cache hits since startup", ["cache"])
+CACHE_MISSES = Counter("facebook_api_cache_misses_total", "Cache misses since startup", ["cache"])
+CACHE_HIT_RATIO = Gauge("facebook_api_cache_hit_ratio", "Cache hits over lookups since startup", ["cache"])
+CACHE_ENTRIES = Gauge("facebook_api_cache_entries", "Entries currently held in the cache", ["cache"])
+COALESCED_CALLS = Counter(
+    "facebook_api_graph_coalesced_calls_total", "Upstream GETs served by an identical call already in flight"
+)
+STARTUP_SECONDS = Gauge(
+    "facebook_api_startup_seconds", "Duration of each startup phase of this process", ["phase"]
+)
+
+METRICS = [
+    HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, HTTP_GRAPH_CALLS,
+    GRAPH_REQUESTS, GRAPH_REQUEST_DURATION, GRAPH_REQUESTS_IN_FLIGHT, GRAPH_ERRORS,
+    CACHE_HITS, CACHE_MISSES, CACHE_HIT_RATIO, CACHE_ENTRIES, COALESCED_CALLS, STARTUP_SECONDS
+]
+
+def record_graph_call(endpoint, status, duration, error_code=None):
+    """
+    Record one upstream Graph API call.
+
+    Args:
+        endpoint (str): Connection name, "object" or "batch".
+        status (str): HTTP status code, or "error" if no response was received.
+        duration (float): Call latency in seconds.
+        error_code (int, optional): Graph error code of a failed call.
+    """
+    operation = current_operation() or "other"
+    GRAPH_REQUESTS.inc(operation=operation, endpoint=endpoint, status=status)
+    GRAPH_REQUEST_DURATION.observe(duration, operation=operation, endpoint=endpoint)
+    if error_code is not None:
+        GRAPH_ERRORS.inc(endpoint=endpoint, code=error_code)
+    calls = _request_calls.get()
+    if calls is not None:
+        calls[0] += 1
+
+def collect_client_metrics(client):
+    """Refresh the gauges derived from the counters a FacebookClient keeps itself."""
+    for cache, cache_stats in (("user", client.user_cache.stats()), ("response", client.response_cache.stats())):
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        CACHE_HITS.set(cache_stats["hits"], cache=cache)
+        CACHE_MISSES.set(cache_stats["misses"], cache=cache)
+        CACHE_HIT_RATIO.set(cache_stats["hits"] / lookups if lookups else 0.0, cache=cache)
+        CACHE_ENTRIES.set(cache_stats["entries"], cache=cache)
+    COALESCED_CALLS.set(client.inflight.stats()["deduplicated"])
+
+def render_metrics(client=None):
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        client (FacebookClient, optional): Client whose cache and coalescing counters are exported.
+
+    Returns:
+        str: Metrics page.
+    """
+    if client is not None:
+        collect_client_metrics(client)
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, in-flight requests and upstream
+    Graph calls of every inbound HTTP request.
+
+    Requests are labelled with the template of the matched route rather than
+    the raw path to keep label cardinality bounded.
+    Latency runs until the last body chunk is sent, so streamed responses are
+    measured in full while background tasks run after it are not.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        finished = None
+        calls = [0]
+        calls_sent = None
+        token = _request_calls.set(calls)
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status, finished, calls_sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this, outside the measured request
+                finished = time.perf_counter()
+                calls_sent = calls[0]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_calls.reset(token)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            duration = (finished or time.perf_counter()) - started
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_REQUEST_DURATION.observe(duration, method=method, route=route)
+            HTTP_GRAPH_CALLS.observe(calls[0] if calls_sent is None else calls_sent, method=method, route=route)
@@ -0,0 +1,97 @@
+import random
+import typing
+from functools import lru_cache
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+from loguru import logger
+
+from app.core.config import FAST_RESPONSES, RESPONSE_VALIDATION_SAMPLE_RATE
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson"""
+    media_type = "application/json"
+
+    def render(self, content):
+        return orjson.dumps(content)
+
+def _model_of(annotation):
+    """Get the Pydantic model inside an annotation such as Optional[List[Model]], or None."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for argument in typing.get_args(annotation):
+        model = _model_of(argument)
+        if model is not None:
+            return model
+    return None
+
+def _is_list(annotation):
+    if typing.get_origin(annotation) in (list, typing.List):
+        return True
+    return any(_is_list(argument) for argument in typing.get_args(annotation))
+
+@lru_cache(maxsize=None)
+def compile_serializer(model):
+    """
+    Build a function that reshapes raw data like ``model`` would, without validation.
+
+    The returned function keeps only the keys declared by the model (by alias),
+    recursing into nested models and lists of models. Values are passed through
+    unchanged, so e.g. Graph time strings are returned as received. The key plan
+    is computed once per model.
+
+    Args:
+        model (type): Pydantic model describing the response.
+
+    Returns:
+        callable: Function taking a dict and returning the filtered dict.
+    """
+    plan = []
+    for name, field in model.model_fields.items():
+        nested = _model_of(field.annotation)
+        plan.append((
+            field.alias or name,
+            compile_serializer(nested) if nested is not None else None,
+            nested is not None and _is_list(field.annotation)
+        ))
+
+    def serialize(data):
+        result = {}
+        for key, nested, many in plan:
+            if key not in data:
+                continue
+            value = data[key]
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if many else nested(value)
+            result[key] = value
+        return result
+
+    return serialize
+
+def model_response(content, model):
+    """
+    Return a route result through the fast serialization path.
+
+    When fast responses are enabled the content is filtered by the precompiled
+    serializer of ``model`` and encoded with orjson, bypassing FastAPI's
+    ``response_model`` validation and encoding. A sample of responses (all of
+    them when the rate is 1) is still validated against the model, and
+    mismatches are logged. With fast responses disabled the content is
+    returned unchanged for FastAPI to validate.
+
+    Args:
+        content (dict): Raw response data.
+        model (type): Pydantic model declared as the route's ``response_model``.
+
+    Returns:
+        The content, or a ``FastJSONResponse``.
+    """
+    if not FAST_RESPONSES:
+        return content
+    if RESPONSE_VALIDATION_SAMPLE_RATE and random.random() < RESPONSE_VALIDATION_SAMPLE_RATE:
+        try:
+            model.model_validate(content)
+        except ValidationError as e:
+            logger.error(f"Response does not match {model.__name__}: {str(e)}")
+    return FastJSONResponse(compile_serializer(model)(content))
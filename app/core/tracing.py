@@ -0,0 +1,367 @@
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+
+from loguru import logger
+
+from app.core.config import TRACING_ENABLED, TRACE_EXPORT_PATH, TRACE_QUEUE_SIZE, TRACE_SAMPLE_RATE
+
+# ID of the inbound request being served, also attached to log records
+_request_id = ContextVar("request_id", default=None)
+# Innermost open span; new spans become its children
+_current_span = ContextVar("current_span", default=None)
+# Public FacebookClient method on whose behalf upstream calls are made
+_operation = ContextVar("graph_operation", default=None)
+
+_exporter = None
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Marks the current context as part of a trace that was not sampled
+_UNSAMPLED = object()
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+def get_request_id():
+    """Get the ID of the inbound request being served, or None outside a request."""
+    return _request_id.get()
+
+def current_operation():
+    """Get the name of the outermost client method being executed, or None."""
+    return _operation.get()
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Spans are only created for sampled traces. Ending a span hands it to the
+    exporter; attributes set afterwards are ignored.
+    """
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, trace_id, parent_id=None, kind=INTERNAL, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {key: value for key, value in (attributes or {}).items() if value is not None}
+        self.error = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def end(self, error=None):
+        """Finish the span, marking it failed if ``error`` is given."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        if _exporter is not None:
+            _exporter.export(self)
+
+    def to_otlp(self):
+        """Encode the span as an OTLP/JSON span object."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+def start_span(name, kind=INTERNAL, attributes=None, trace_id=None, parent_id=None, sampled=None):
+    """
+    Start a span as a child of the current span, or as the root of a new trace.
+
+    Args:
+        name (str): Span name.
+        kind (int, optional): INTERNAL, SERVER or CLIENT.
+        attributes (dict, optional): Initial attributes.
+        trace_id (str, optional): Continue this trace instead of the current one.
+        parent_id (str, optional): Remote parent span of ``trace_id``.
+        sampled (bool, optional): Sampling decision of a remote parent.
+
+    Returns:
+        Span: The new span, or None if tracing is disabled or the trace is not sampled.
+    """
+    if not TRACING_ENABLED:
+        return None
+    parent = _current_span.get()
+    if trace_id is None and parent is not None:
+        if parent is _UNSAMPLED:
+            return None
+        return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+    if sampled is None:
+        sampled = random.random() < TRACE_SAMPLE_RATE
+    if not sampled:
+        return None
+    return Span(name, trace_id or secrets.token_hex(16), parent_id, kind, attributes)
+
+def activate(span):
+    """
+    Make ``span`` the current span; returns a token for ``deactivate``.
+
+    Activating None (an unsampled span) keeps its descendants unsampled too.
+    """
+    return _current_span.set(_UNSAMPLED if span is None else span)
+
+def deactivate(token):
+    _current_span.reset(token)
+
+def graph_operation(fn):
+    """
+    Trace a client method and label the upstream calls it makes with its name.
+
+    Only the outermost decorated method opens a span and sets the label, so e.g.
+    the batch user lookups made by ``get_post_comments`` are attributed to it
+    rather than to ``get_users_details``. Works for coroutine functions and
+    async generators; a generator's span covers the whole iteration.
+    """
+    name = fn.__name__
+    span_name = f"FacebookClient.{name}"
+
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def generator_wrapper(*args, **kwargs):
+            if _operation.get() is not None:
+                async for item in fn(*args, **kwargs):
+                    yield item
+                return
+            span = start_span(span_name)
+            iterator = fn(*args, **kwargs)
+            error = None
+            try:
+                while True:
+                    # Set around each step only: between items the consumer runs in its own context
+                    operation_token = _operation.set(name)
+                    span_token = activate(span)
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    except Exception as e:
+                        error = e
+                        raise
+                    finally:
+                        deactivate(span_token)
+                        _operation.reset(operation_token)
+                    yield item
+            finally:
+                await iterator.aclose()
+                if span is not None:
+                    span.end(error)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _operation.get() is not None:
+            return await fn(*args, **kwargs)
+        span = start_span(span_name)
+        operation_token = _operation.set(name)
+        span_token = activate(span)
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            if span is not None:
+                span.end(e)
+            raise
+        finally:
+            deactivate(span_token)
+            _operation.reset(operation_token)
+        if span is not None:
+            span.end()
+        return result
+    return wrapper
+
+class SpanExporter:
+    """
+    Write finished spans to a JSON lines file in the OTLP/JSON format.
+
+    Spans are queued without blocking and written in batches by a background
+    thread, one ``{"resourceSpans": [...]}`` document per line, which is the
+    layout read by the OpenTelemetry collector's ``otlpjsonfile`` receiver.
+    When the queue is full new spans are dropped and counted.
+    """
+
+    def __init__(self, path=TRACE_EXPORT_PATH, queue_size=TRACE_QUEUE_SIZE, batch_size=512, service_name="facebook-page-manager-api"):
+        """
+        Args:
+            path (str, optional): File the spans are appended to.
+            queue_size (int, optional): Maximum number of spans waiting to be written.
+            batch_size (int, optional): Maximum number of spans per line.
+            service_name (str, optional): ``service.name`` resource attribute.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self.exported = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stopping = True
+            spans = [span.to_otlp() for span in batch if span is not None]
+            if not spans:
+                continue
+            document = {
+                "resourceSpans": [{
+                    "resource": self.resource,
+                    "scopeSpans": [{"scope": {"name": "app"}, "spans": spans}]
+                }]
+            }
+            try:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(document) + "\n")
+                self.exported += len(spans)
+            except OSError as e:
+                self.dropped += len(spans)
+                logger.warning(f"Could not write {len(spans)} spans to {self.path}: {str(e)}")
+
+    def close(self, timeout=5):
+        """Write the spans still queued and stop the background thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {"path": self.path, "exported": self.exported, "dropped": self.dropped, "queued": self._queue.qsize()}
+
+def configure_tracing():
+    """Start exporting spans to ``TRACE_EXPORT_PATH`` when tracing is enabled."""
+    global _exporter
+    if TRACING_ENABLED and _exporter is None:
+        _exporter = SpanExporter()
+    return _exporter
+
+def shutdown_tracing():
+    """Flush and stop the span exporter."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
+
+def route_template(scope):
+    """
+    Get the path template of the route that served a request, e.g. ``/api/v1/facebook/posts/{post_id}``.
+
+    Path parameter values are put back in place of their segments, so the
+    template includes router prefixes. Requests not matching any route yield "unmatched".
+    """
+    if scope.get("endpoint") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        for i in range(len(segments) - 1, -1, -1):
+            if segments[i] == str(value):
+                segments[i] = "{" + name + "}"
+                break
+    return "/".join(segments)
+
+def _parse_traceparent(value):
+    match = _TRACEPARENT.match(value or "")
+    if not match or match.group(1) == "0" * 32:
+        return None, None, None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+class TracingMiddleware:
+    """
+    ASGI middleware giving every inbound HTTP request an ID and a server span.
+
+    The request ID is taken from a valid ``X-Request-ID`` header or generated,
+    made available to route handlers, client methods and log records through a
+    context variable, and echoed in the ``X-Request-ID`` response header. A W3C
+    ``traceparent`` header continues the caller's trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        request_id = headers.get("x-request-id")
+        if not request_id or not _REQUEST_ID.match(request_id):
+            request_id = secrets.token_hex(16)
+        trace_id, parent_id, sampled = _parse_traceparent(headers.get("traceparent"))
+        span = start_span(
+            f"{scope['method']} {scope['path']}", kind=SERVER, trace_id=trace_id, parent_id=parent_id, sampled=sampled,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"], "request.id": request_id}
+        )
+        request_token = _request_id.set(request_id)
+        span_token = activate(span)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            deactivate(span_token)
+            _request_id.reset(request_token)
+            if span is not None:
+                route = route_template(scope)
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
+                span.end(error if error is not None else f"HTTP {status}" if status >= 500 else None)
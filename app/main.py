@@ -1,21 +1,136 @@
-from fastapi import FastAPI
+import time
+
+# Taken before the imports below so startup timings include loading the application
+_process_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from facebook import GraphAPIError
 
-from app.api.endpoints import facebook
-from app.core.config import API_V1_STR, PROJECT_NAME
+from app.api.endpoints import export, facebook, pages, sync
+from app.api.mcp import mount_mcp
+from app.core.config import (
+    API_V1_STR,
+    CLIENT_POOL_ENABLED,
+    PROJECT_NAME,
+    FACEBOOK_API_VERSION,
+    FACEBOOK_APP_SECRET,
+    FACEBOOK_WEBHOOK_VERIFY_TOKEN,
+    MCP_ENABLED,
+    METRICS_ENABLED,
+    SYNC_INTERVAL,
+    SYNC_PAGE_IDS,
+    WARMUP_CONNECTIONS,
+    WARMUP_ENABLED,
+    WARMUP_PAGE_IDS,
+    WARMUP_TIMEOUT,
+    validate_config
+)
 from app.core.error_handlers import (
     facebook_exception_handler,
     facebook_api_exception_handler,
     FacebookAPIException,
     general_exception_handler
 )
+from app.core.logging_config import configure_logging
+from app.core.metrics import STARTUP_SECONDS, MetricsMiddleware, render_metrics
+from app.core.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from app.services.facebook_client import FacebookClient
+from app.services.sync import SyncEngine
+from app.services.sync_store import SyncStore
+from app.services.webhooks import WebhookProcessor, verify_signature
+from loguru import logger
+
+_imported = time.perf_counter()
+
+def record_startup_phase(app, phase, seconds):
+    app.state.startup[f"{phase}_seconds"] = round(seconds, 3)
+    STARTUP_SECONDS.set(round(seconds, 3), phase=phase)
+
+def open_insights_store():
+    """Open the insights store; numpy is only imported once insights are used"""
+    from app.services.insights_store import InsightsStore
+    return InsightsStore()
+
+async def warm_up(app):
+    """Run the optional warmup, then mark the application ready whatever its outcome"""
+    started = time.perf_counter()
+    if WARMUP_ENABLED:
+        try:
+            app.state.startup["warmup"] = await asyncio.wait_for(
+                app.state.facebook_client.warm_up(WARMUP_PAGE_IDS, WARMUP_CONNECTIONS),
+                WARMUP_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Warmup did not finish within {WARMUP_TIMEOUT}s")
+            app.state.startup["warmup"] = {"error": f"Timed out after {WARMUP_TIMEOUT}s"}
+        except Exception as e:
+            logger.warning(f"Warmup failed: {str(e)}")
+            app.state.startup["warmup"] = {"error": str(e)}
+    record_startup_phase(app, "warmup", time.perf_counter() - started)
+    record_startup_phase(app, "total", time.perf_counter() - _process_started)
+    app.state.ready = True
+    logger.info(
+        f"Ready in {app.state.startup['total_seconds']}s (imports {app.state.startup['imports_seconds']}s, "
+        f"startup {app.state.startup['startup_seconds']}s, warmup {app.state.startup['warmup_seconds']}s)"
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared Facebook client and sync engine on startup and release them on shutdown"""
+    started = time.perf_counter()
+    configure_logging()
+    validate_config()
+    configure_tracing()
+    app.state.ready = False
+    app.state.startup = {}
+    record_startup_phase(app, "imports", _imported - _process_started)
+    
+    app.state.facebook_client = FacebookClient()
+    logger.info(f"Facebook client initialized with API version {FACEBOOK_API_VERSION}")
+    app.state.client_pool = None
+    if CLIENT_POOL_ENABLED:
+        from app.services.client_pool import ClientPool
+        app.state.client_pool = ClientPool(app.state.facebook_client)
+    # The stores and the exporter are opened on first use, so they cost nothing on startup
+    app.state.sync_engine = SyncEngine(app.state.facebook_client, SyncStore, open_insights_store)
+    app.state.webhook_processor = WebhookProcessor(app.state.facebook_client, app.state.sync_engine)
+    app.state.exporter = None
+    
+    sync_task = None
+    if SYNC_INTERVAL > 0 and SYNC_PAGE_IDS:
+        sync_task = asyncio.create_task(app.state.sync_engine.run_periodically(SYNC_PAGE_IDS, SYNC_INTERVAL))
+        logger.info(f"Background sync started for pages {SYNC_PAGE_IDS} every {SYNC_INTERVAL}s")
+    record_startup_phase(app, "startup", time.perf_counter() - started)
+    
+    # Serve liveness probes right away; /ready flips once warmup is done
+    warmup_task = asyncio.create_task(warm_up(app))
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        if sync_task is not None:
+            sync_task.cancel()
+        if app.state.exporter is not None:
+            await app.state.exporter.close()
+        if app.state.client_pool is not None:
+            await app.state.client_pool.close()
+        await app.state.facebook_client.close()
+        app.state.sync_engine.close()
+        logger.info("Facebook client closed")
+        shutdown_tracing()
+        await logger.complete()
 
 # Create FastAPI app
 app = FastAPI(
     title=PROJECT_NAME,
     description="API for managing Facebook page data",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -27,6 +142,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request and upstream call metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Give every request an ID and a trace span
+app.add_middleware(TracingMiddleware)
+
 # Register exception handlers
 app.add_exception_handler(GraphAPIError, facebook_exception_handler)
 app.add_exception_handler(FacebookAPIException, facebook_api_exception_handler)
@@ -34,6 +156,9 @@ app.add_exception_handler(Exception, general_exception_handler)
 
 # Include API routers
 app.include_router(facebook.router, prefix=f"{API_V1_STR}/facebook", tags=["facebook"])
+app.include_router(pages.router, prefix=f"{API_V1_STR}/facebook", tags=["pages"])
+app.include_router(sync.router, prefix=f"{API_V1_STR}/facebook", tags=["sync"])
+app.include_router(export.router, prefix=f"{API_V1_STR}/facebook", tags=["export"])
 
 @app.get("/")
 async def root():
@@ -44,3 +169,57 @@ async def root():
         "docs_url": "/docs",
         "redoc_url": "/redoc"
     }
+
+@app.get("/ready")
+async def ready(request: Request):
+    """Readiness probe: 503 until startup, including the optional warmup, has finished"""
+    if not request.app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "startup": request.app.state.startup})
+    return {"status": "ready", "startup": request.app.state.startup}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request):
+    """Expose request, upstream Graph call and cache metrics in the Prometheus text format"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        render_metrics(request.app.state.facebook_client),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.get("/webhooks/facebook", response_class=PlainTextResponse)
+async def verify_webhook(
+    mode: str = Query(None, alias="hub.mode"),
+    verify_token: str = Query(None, alias="hub.verify_token"),
+    challenge: str = Query(None, alias="hub.challenge")
+):
+    """Answer the verification handshake Facebook performs when subscribing the webhook"""
+    if mode == "subscribe" and FACEBOOK_WEBHOOK_VERIFY_TOKEN and verify_token == FACEBOOK_WEBHOOK_VERIFY_TOKEN:
+        logger.info("Webhook subscription verified")
+        return challenge
+    logger.warning("Webhook verification failed")
+    raise HTTPException(status_code=403, detail="Webhook verification failed")
+
+@app.post("/webhooks/facebook")
+async def receive_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Receive page feed and messages change events.
+    
+    Deliveries must carry a valid X-Hub-Signature-256 header. Events are
+    processed after the response is sent so Facebook gets a fast acknowledgement.
+    """
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256"), FACEBOOK_APP_SECRET):
+        logger.warning("Rejected webhook delivery with invalid signature")
+        raise HTTPException(status_code=403, detail="Invalid webhook signature")
+    
+    payload = await request.json()
+    if payload.get("object") != "page":
+        raise HTTPException(status_code=404, detail=f"Unsupported webhook object: {payload.get('object')}")
+    
+    background_tasks.add_task(request.app.state.webhook_processor.handle, payload)
+    return {"status": "received"}
+
+# Mounted last so every route above is exposed
+if MCP_ENABLED:
+    mount_mcp(app)
@@ -5,6 +5,8 @@ from datetime import datetime
 class UserBase(BaseModel):
     id: str
     name: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
     picture: Optional[Dict[str, Any]] = None
     link: Optional[str] = None
     email: Optional[str] = None
@@ -13,7 +15,19 @@ class PostBase(BaseModel):
     id: str
     message: Optional[str] = None
     created_time: Optional[datetime] = None
+    updated_time: Optional[datetime] = None
     permalink_url: Optional[str] = None
+    story: Optional[str] = None
+    full_picture: Optional[str] = None
+    status_type: Optional[str] = None
+    is_published: Optional[bool] = None
+    message_tags: Optional[List[Dict[str, Any]]] = None
+    from_user: Optional[UserBase] = Field(None, alias="from")
+    likes: Optional[Dict[str, Any]] = None
+    comments: Optional[Dict[str, Any]] = None
+    reactions: Optional[Dict[str, Any]] = None
+    shares: Optional[Dict[str, Any]] = None
+    attachments: Optional[Dict[str, Any]] = None
 
 class CommentBase(BaseModel):
     id: str
@@ -21,11 +35,19 @@ class CommentBase(BaseModel):
     created_time: Optional[datetime] = None
     from_user: Optional[UserBase] = Field(None, alias="from")
     like_count: Optional[int] = None
+    comment_count: Optional[int] = None
+    permalink_url: Optional[str] = None
+    parent: Optional[Dict[str, Any]] = None
+    comments: Optional[Dict[str, Any]] = None
+    likes: Optional[Dict[str, Any]] = None
+    attachment: Optional[Dict[str, Any]] = None
     post_id: str
 
 class LikeBase(BaseModel):
     id: str
-    name: str
+    name: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
     picture: Optional[Dict[str, Any]] = None
     link: Optional[str] = None
     email: Optional[str] = None
@@ -41,17 +63,24 @@ class MentionBase(BaseModel):
     created_time: Optional[datetime] = None
     from_user: Optional[UserBase] = Field(None, alias="from")
     story: Optional[str] = None
+    permalink_url: Optional[str] = None
 
 class MessageBase(BaseModel):
     id: str
     message: Optional[str] = None
     created_time: Optional[datetime] = None
     from_user: Optional[UserBase] = Field(None, alias="from")
+    to: Optional[Dict[str, Any]] = None
+    attachments: Optional[Dict[str, Any]] = None
 
 class ConversationBase(BaseModel):
     id: str
     link: Optional[str] = None
     updated_time: Optional[datetime] = None
+    snippet: Optional[str] = None
+    message_count: Optional[int] = None
+    unread_count: Optional[int] = None
+    participants: Optional[Dict[str, Any]] = None
     messages: Optional[Dict[str, Any]] = None
 
 class PostResponse(BaseModel):
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry and LRU eviction.
+
+    Entries expire ``ttl`` seconds after being stored. When the cache is full the
+    least recently used entry is evicted to make room for a new one. Hit and miss
+    counters are kept so the effectiveness of the cache can be monitored.
+    """
+
+    def __init__(self, max_entries=1000, ttl=300, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of entries kept. Defaults to 1000.
+            ttl (float, optional): Default time to live of an entry in seconds. Defaults to 300.
+            clock (callable, optional): Monotonic clock returning seconds. Defaults to time.monotonic.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Get a value from the cache.
+
+        Args:
+            key: Cache key.
+            default (optional): Value returned when the key is missing or expired.
+
+        Returns:
+            The cached value, or ``default``.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl (float, optional): Time to live in seconds. Defaults to the cache TTL.
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key):
+        """Remove a key from the cache if present."""
+        self._entries.pop(key, None)
+
+    def invalidate(self, predicate):
+        """
+        Remove all entries whose key matches a predicate.
+
+        Args:
+            predicate (callable): Function receiving a key and returning True to remove it.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        self._entries.clear()
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Number of entries, capacity, hit/miss/eviction counters and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
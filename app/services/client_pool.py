@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import random
+import time
+from collections import OrderedDict
+
+from loguru import logger
+
+from app.core.config import (
+    CLIENT_POOL_USER_TOKENS, CLIENT_POOL_MAX_CLIENTS, CLIENT_POOL_IDLE_TTL, PAGE_TOKEN_CACHE_TTL
+)
+from app.services.facebook_client import FacebookClient
+
+def token_scope(token):
+    """Rate limit scope of an access token, named after a fingerprint so the token never shows up in stats."""
+    return "token:" + hashlib.sha256(token.encode()).hexdigest()[:12]
+
+class ClientPool:
+    """
+    Facebook clients keyed by access token, so that every page is served with its own page token.
+
+    Page access tokens are resolved through ``/me/accounts`` of the configured
+    user tokens and cached. Pooled clients share the connection pool, rate
+    limiter, caches, search index and in-flight requests of the default client,
+    so webhook invalidation and metrics going through it cover every token and
+    a page is cached once whichever token serves it. Each client charges its
+    own token's budget, and clients left idle are closed, least recently used
+    first. When several tokens can serve a page, one is picked at random
+    weighted by the share of its budget left, which spreads load across tokens
+    before any of them is throttled. Pages without a known token are served by
+    the default client.
+    """
+
+    def __init__(self, default_client, user_tokens=None, max_clients=CLIENT_POOL_MAX_CLIENTS,
+                 idle_ttl=CLIENT_POOL_IDLE_TTL, token_ttl=PAGE_TOKEN_CACHE_TTL, clock=time.monotonic):
+        """
+        Initialize the pool.
+
+        Args:
+            default_client (FacebookClient): Client of the configured token, also used for unknown pages.
+            user_tokens (list, optional): Additional user or system user tokens whose pages are
+                resolved. Defaults to CLIENT_POOL_USER_TOKENS.
+            max_clients (int, optional): Maximum number of pooled clients. Defaults to CLIENT_POOL_MAX_CLIENTS.
+            idle_ttl (float, optional): Seconds after which an unused client is closed. Defaults to CLIENT_POOL_IDLE_TTL.
+            token_ttl (float, optional): Seconds page tokens are cached. Defaults to PAGE_TOKEN_CACHE_TTL.
+            clock (callable, optional): Monotonic clock returning seconds. Defaults to time.monotonic.
+        """
+        self.default_client = default_client
+        self.user_tokens = list(dict.fromkeys(
+            [default_client.access_token] + list(CLIENT_POOL_USER_TOKENS if user_tokens is None else user_tokens)
+        ))
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.token_ttl = token_ttl
+        self._clock = clock
+        # Access token -> [client, last used], least recently used first
+        self._clients = OrderedDict()
+        self._page_tokens = {}
+        self._resolved_at = None
+        self._resolve_lock = asyncio.Lock()
+        self.created = 0
+        self.evicted = 0
+        self.fallbacks = 0
+
+    async def client_for_token(self, token):
+        """
+        Get the pooled client of an access token, creating it on first use.
+
+        Args:
+            token (str): Access token.
+
+        Returns:
+            FacebookClient: Client using ``token``.
+        """
+        if token == self.default_client.access_token:
+            return self.default_client
+        now = self._clock()
+        entry = self._clients.get(token)
+        if entry is not None:
+            entry[1] = now
+            self._clients.move_to_end(token)
+            return entry[0]
+        client = FacebookClient(
+            access_token=token,
+            version=self.default_client.version,
+            http_client=self.default_client.http,
+            rate_limiter=self.default_client.rate_limiter,
+            page_scope=token_scope(token),
+            shared=self.default_client
+        )
+        self._clients[token] = [client, now]
+        self.created += 1
+        await self._evict(now)
+        return client
+
+    async def _evict(self, now):
+        retired = []
+        while len(self._clients) > self.max_clients:
+            retired.append(self._clients.popitem(last=False)[1][0])
+        while self._clients:
+            token, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            del self._clients[token]
+            retired.append(client)
+        self.evicted += len(retired)
+        for client in retired:
+            await client.close()
+
+    async def page_tokens(self, refresh=False):
+        """
+        Get the page access tokens available for each page.
+
+        Tokens are read from ``/me/accounts`` of every user token and cached for
+        ``token_ttl`` seconds. User tokens that cannot list pages (e.g. page
+        tokens) are skipped.
+
+        Args:
+            refresh (bool, optional): Resolve again even if the cache is fresh. Defaults to False.
+
+        Returns:
+            dict: Lists of page access tokens keyed by page ID.
+        """
+        if not refresh and self._is_fresh():
+            return self._page_tokens
+        async with self._resolve_lock:
+            if not refresh and self._is_fresh():
+                return self._page_tokens
+            accounts = await asyncio.gather(
+                *(self._list_accounts(user_token) for user_token in self.user_tokens), return_exceptions=True
+            )
+            page_tokens = {}
+            for user_accounts in accounts:
+                if isinstance(user_accounts, Exception):
+                    logger.warning(f"Could not resolve page tokens of a user token: {str(user_accounts)}")
+                    continue
+                for account in user_accounts:
+                    tokens = page_tokens.setdefault(account["id"], [])
+                    if account["access_token"] not in tokens:
+                        tokens.append(account["access_token"])
+            self._page_tokens = page_tokens
+            self._resolved_at = self._clock()
+            logger.info(f"Resolved page tokens for {len(page_tokens)} pages from {len(self.user_tokens)} user tokens")
+            return page_tokens
+
+    def _is_fresh(self):
+        return self._resolved_at is not None and self._clock() - self._resolved_at < self.token_ttl
+
+    async def _list_accounts(self, user_token):
+        client = await self.client_for_token(user_token)
+        return [
+            account async for account in client.iter_connection("me", "accounts", fields="id,access_token", limit=100)
+            if account.get("access_token")
+        ]
+
+    def _scope(self, token):
+        if token == self.default_client.access_token:
+            return self.default_client.page_scope
+        return token_scope(token)
+
+    def select_token(self, tokens):
+        """
+        Pick one of several tokens, weighted by the share of each token's budget left.
+
+        Args:
+            tokens (list): Eligible access tokens.
+
+        Returns:
+            str: Selected token.
+        """
+        if len(tokens) == 1:
+            return tokens[0]
+        weights = [self.default_client.rate_limiter.remaining(self._scope(token)) for token in tokens]
+        if not any(weights):
+            return random.choice(tokens)
+        return random.choices(tokens, weights=weights)[0]
+
+    async def client_for_page(self, page_id):
+        """
+        Get a client holding a page access token of ``page_id``.
+
+        Args:
+            page_id (str): ID of the page.
+
+        Returns:
+            FacebookClient: Pooled client, or the default client for "me" and pages without a known token.
+        """
+        if page_id == "me":
+            return self.default_client
+        tokens = (await self.page_tokens()).get(page_id)
+        if not tokens:
+            self.fallbacks += 1
+            return self.default_client
+        return await self.client_for_token(self.select_token(tokens))
+
+    async def close(self):
+        """Close every pooled client; the shared connection pool is closed with the default client."""
+        clients = [client for client, _ in self._clients.values()]
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+
+    def stats(self):
+        rate_limiter = self.default_client.rate_limiter
+        return {
+            "clients": len(self._clients),
+            "max_clients": self.max_clients,
+            "created": self.created,
+            "evicted": self.evicted,
+            "fallbacks": self.fallbacks,
+            "user_tokens": len(self.user_tokens),
+            "pages": len(self._page_tokens),
+            "page_tokens_age_seconds": (
+                round(self._clock() - self._resolved_at, 1) if self._resolved_at is not None else None
+            ),
+            "remaining_budget": {
+                token_scope(token): round(rate_limiter.remaining(token_scope(token)), 2) for token in self._clients
+            }
+        }
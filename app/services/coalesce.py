@@ -0,0 +1,69 @@
+import asyncio
+import copy
+
+class _Flight:
+    """An in-flight call shared by every caller that requested the same key."""
+
+    def __init__(self, task):
+        self.task = task
+        self.followers = 0
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into a single execution.
+
+    The first caller for a key starts the call; callers arriving while it is still
+    in flight wait for the same result instead of starting their own. The call runs
+    as a separate task, so a cancelled caller does not cancel it for the others.
+    When a result is shared, every caller receives its own deep copy so callers
+    can post-process it independently.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def do(self, key, fn):
+        """
+        Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        Args:
+            key: Hashable identity of the call.
+            fn (callable): Zero-argument coroutine function performing the call.
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.executions += 1
+        else:
+            flight.followers += 1
+            self.deduplicated += 1
+
+        result = await asyncio.shield(flight.task)
+        return copy.deepcopy(result) if flight.followers else result
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self):
+        """
+        Get coalescing statistics.
+
+        Returns:
+            dict: Total calls, upstream executions, deduplicated calls and calls in flight.
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._flights)
+        }
@@ -0,0 +1,167 @@
+import base64
+
+import orjson
+
+from app.core.config import MCP_TEXT_MAX_CHARS
+
+def truncate(text, limit=MCP_TEXT_MAX_CHARS):
+    """Shorten text to ``limit`` characters, marking the cut with an ellipsis."""
+    if not text or len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+def _total(value):
+    """Get the count of a summary connection such as ``likes.summary(true)`` or ``shares``."""
+    if not isinstance(value, dict):
+        return value
+    if "summary" in value:
+        return value["summary"].get("total_count")
+    if "count" in value:
+        return value["count"]
+    return len(value.get("data", []))
+
+def _name(user):
+    return user.get("name") or user.get("id") if isinstance(user, dict) else None
+
+def _drop_empty(item):
+    return {key: value for key, value in item.items() if value not in (None, "", [], {})}
+
+def compact_page(page):
+    return _drop_empty({
+        "id": page.get("id"),
+        "name": page.get("name"),
+        "category": page.get("category"),
+        "fans": page.get("fan_count"),
+        "about": truncate(page.get("about")),
+        "link": page.get("link")
+    })
+
+def compact_post(post):
+    return _drop_empty({
+        "id": post.get("id"),
+        "created": post.get("created_time"),
+        "text": truncate(post.get("message") or post.get("story")),
+        "likes": _total(post.get("likes")),
+        "comments": _total(post.get("comments")),
+        "shares": _total(post.get("shares")),
+        "url": post.get("permalink_url")
+    })
+
+def compact_comment(comment):
+    return _drop_empty({
+        "id": comment.get("id"),
+        "from": _name(comment.get("from")),
+        "created": comment.get("created_time"),
+        "text": truncate(comment.get("message")),
+        "likes": comment.get("like_count"),
+        "replies": comment.get("comment_count")
+    })
+
+def compact_user(user):
+    return _drop_empty({"id": user.get("id"), "name": user.get("name")})
+
+def compact_conversation(conversation):
+    return _drop_empty({
+        "id": conversation.get("id"),
+        "updated": conversation.get("updated_time"),
+        "snippet": truncate(conversation.get("snippet")),
+        "messages": conversation.get("message_count"),
+        "unread": conversation.get("unread_count")
+    })
+
+def compact_message(message):
+    return _drop_empty({
+        "id": message.get("id"),
+        "from": _name(message.get("from")),
+        "created": message.get("created_time"),
+        "text": truncate(message.get("message"))
+    })
+
+def compact_insights(insights, points=None):
+    """
+    Reduce insights to ``{metric: [[end_date, value], ...]}``, dropping IDs, titles and descriptions.
+
+    Only the latest ``points`` values of each metric are kept when given.
+    """
+    return {
+        f"{metric['name']}/{metric.get('period')}": [
+            [value.get("end_time", "")[:10], value.get("value")] for value in metric.get("values", [])[-(points or 0):]
+        ]
+        for metric in insights.get("data", [])
+    }
+
+# Graph paging arguments a cursor may carry; anything else in a cursor is ignored
+CURSOR_ARGS = {"limit", "after", "before", "since", "until", "offset", "__paging_token", "__previous"}
+
+def estimate_tokens(value):
+    """Rough token count of a value once serialized, at about four bytes per token."""
+    return len(orjson.dumps(value)) // 4 + 1
+
+def encode_cursor(state):
+    """Encode continuation state as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(state)).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        state = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+    return state
+
+async def paginate(client, object_id, connection, fields, compact, budget, page_size, cursor=None):
+    """
+    Read a connection into compact items until a token budget is spent.
+
+    Graph pages are fetched one after another and their items compacted until
+    adding the next item would exceed ``budget``; at least one item is always
+    returned. The returned cursor resumes exactly at the first item left out,
+    including in the middle of a Graph page.
+
+    Args:
+        client (FacebookClient): Client used for the Graph requests.
+        object_id (str): ID of the object owning the connection.
+        connection (str): Connection name, e.g. "comments".
+        fields (str): Graph fields requested for each item.
+        compact (callable): Function turning a Graph item into its compact form.
+        budget (int): Maximum estimated tokens of the returned items.
+        page_size (int): Items per Graph request.
+        cursor (str, optional): Cursor returned by a previous call.
+
+    Returns:
+        dict: ``items``, the ``next_cursor`` (None at the end) and the estimated ``tokens`` used.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    state = decode_cursor(cursor) if cursor else {}
+    args = {key: value for key, value in (state.get("args") or {}).items() if key in CURSOR_ARGS}
+    args["limit"] = page_size
+    skip = int(state.get("skip", 0))
+    items = []
+    used = 0
+    while True:
+        page = await client.get_connections(object_id, connection, fields=fields, **args)
+        data = page.get("data", [])
+        for index in range(skip, len(data)):
+            item = compact(data[index])
+            cost = estimate_tokens(item)
+            if items and used + cost > budget:
+                return {"items": items, "next_cursor": encode_cursor({"args": args, "skip": index}), "tokens": used}
+            items.append(item)
+            used += cost
+        skip = 0
+        next_args = client.next_page_args(page, args)
+        if next_args is None:
+            return {"items": items, "next_cursor": None, "tokens": used}
+        next_args.pop("fields", None)
+        args = next_args
+        if used >= budget:
+            return {"items": items, "next_cursor": encode_cursor({"args": args}), "tokens": used}
@@ -0,0 +1,420 @@
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from loguru import logger
+
+from app.core.config import EXPORT_DIR, EXPORT_CHUNK_SIZE, EXPORT_CONCURRENCY, INSIGHTS_METRICS, INSIGHTS_BACKFILL_DAYS
+from app.services.facebook_client import POST_FIELDS, COMMENT_FIELDS, LIKE_FIELDS
+
+EXPORT_TYPES = ["posts", "comments", "likes", "mentions", "insights"]
+EXPORT_FORMATS = ["jsonl", "columns"]
+MENTION_FIELDS = ["id", "message", "created_time", "from", "story", "permalink_url"]
+# Graph rejects insights ranges longer than 93 days
+INSIGHTS_WINDOW = 90 * 86400
+
+def _write_json(path, data):
+    """Write a JSON file atomically so an interrupted export never leaves it truncated"""
+    with open(path + ".tmp", "w") as file:
+        json.dump(data, file)
+    os.replace(path + ".tmp", path)
+
+class ChunkWriter:
+    """
+    Writes the records of one object type as numbered, gzip-compressed chunks.
+
+    Records are buffered until the next resumable boundary, then compressed and
+    written from a worker thread so the event loop never blocks on disk. A
+    chunk is only closed at a boundary, once it holds at least ``chunk_size``
+    records, and the checkpoint recording the chunk count and the upstream
+    cursor is written right after it. Resuming deletes any chunk past the
+    checkpoint and restarts from its cursor, so every record ends up in exactly
+    one chunk.
+
+    In ``jsonl`` format each line is a record. In ``columns`` format a chunk is
+    a JSON object mapping every key to the list of its values; each column is
+    spooled to a temporary file and the chunk is assembled from them when it
+    closes, so only the records since the last boundary are held in memory.
+    """
+
+    def __init__(self, directory, object_type, format="jsonl", chunk_size=EXPORT_CHUNK_SIZE):
+        self.directory = directory
+        self.object_type = object_type
+        self.format = format
+        self.chunk_size = chunk_size
+        self.checkpoint_path = os.path.join(directory, f"{object_type}.checkpoint.json")
+        self.checkpoint = {"chunks": 0, "records": 0, "cursor": None, "done": False}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as file:
+                self.checkpoint = json.load(file)
+        self.chunks = self.checkpoint["chunks"]
+        self.records = self.checkpoint["records"]
+        self._file = None
+        # Column key -> [spool file, number of records in the chunk before the key first appeared]
+        self._columns = {}
+        self._pending = []
+        self._chunk_records = 0
+        self._spooled = 0
+
+    def _chunk_path(self, index):
+        extension = "jsonl.gz" if self.format == "jsonl" else "columns.json.gz"
+        return os.path.join(self.directory, f"{self.object_type}-{index:05d}.{extension}")
+
+    def discard_partial(self):
+        """Delete chunks written after the last checkpoint."""
+        index = self.chunks
+        while os.path.exists(self._chunk_path(index)):
+            os.remove(self._chunk_path(index))
+            index += 1
+
+    def write(self, record):
+        """Buffer a record; it is written out at the next boundary."""
+        self._pending.append(record)
+        self._chunk_records += 1
+        self.records += 1
+
+    async def boundary(self, cursor):
+        """Mark a point the export can resume from; closes the chunk once it is full."""
+        records, self._pending = self._pending, []
+        full = cursor is not None and self._chunk_records >= self.chunk_size
+        await asyncio.to_thread(self._flush, records, full, cursor)
+
+    async def finish(self):
+        records, self._pending = self._pending, []
+        await asyncio.to_thread(self._flush, records, True, None, True)
+
+    def _flush(self, records, close, cursor, done=False):
+        if records and self.format == "jsonl":
+            if self._file is None:
+                self._file = gzip.open(self._chunk_path(self.chunks), "wt", encoding="utf-8")
+            self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        elif records:
+            for record in records:
+                for key in record.keys() - self._columns.keys():
+                    self._columns[key] = [tempfile.TemporaryFile("w+", encoding="utf-8", dir=self.directory), self._spooled]
+                for key, (spool, _) in self._columns.items():
+                    spool.write("," + json.dumps(record.get(key)))
+                self._spooled += 1
+        if close:
+            self._close_chunk(cursor, done)
+
+    def _close_chunk(self, cursor, done=False):
+        if self._chunk_records:
+            if self.format == "columns":
+                self._write_columns()
+            else:
+                self._file.close()
+                self._file = None
+            self._chunk_records = 0
+            self.chunks += 1
+        self.checkpoint = {"chunks": self.chunks, "records": self.records, "cursor": cursor, "done": done}
+        _write_json(self.checkpoint_path, self.checkpoint)
+
+    def _write_columns(self):
+        with gzip.open(self._chunk_path(self.chunks), "wt", encoding="utf-8") as file:
+            file.write(f'{{"records": {self._chunk_records}, "columns": {{')
+            for index, (key, (spool, missing)) in enumerate(self._columns.items()):
+                file.write((", " if index else "") + json.dumps(key) + ": [" + ",".join(["null"] * missing))
+                spool.seek(0)
+                if not missing:
+                    spool.read(1)
+                shutil.copyfileobj(spool, file)
+                file.write("]")
+            file.write("}}")
+        self._close_spools()
+
+    def _close_spools(self):
+        for spool, _ in self._columns.values():
+            spool.close()
+        self._columns = {}
+        self._spooled = 0
+
+    def close(self):
+        """Abandon the open chunk; it is discarded on resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._close_spools()
+
+class Exporter:
+    """
+    Exports the full history of a page to chunked, compressed files on disk.
+
+    Each object type is walked with cursor pagination and streamed to its own
+    ``ChunkWriter``, up to ``concurrency`` types at a time. Exports run as
+    background tasks and can be resumed from their checkpoints after a failure
+    or a restart.
+    """
+
+    def __init__(self, client, path=EXPORT_DIR, chunk_size=EXPORT_CHUNK_SIZE, concurrency=EXPORT_CONCURRENCY):
+        """
+        Initialize the exporter.
+
+        Args:
+            client (FacebookClient): Client used to fetch from the Graph API.
+            path (str, optional): Directory receiving one subdirectory per export.
+            chunk_size (int, optional): Minimum number of records per chunk file.
+            concurrency (int, optional): Number of object types exported in parallel.
+        """
+        self.client = client
+        self.path = path
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.jobs = {}
+        self._tasks = {}
+
+    async def start(self, page_id="me", types=None, format="jsonl"):
+        """
+        Start exporting a page in the background.
+
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            types (list, optional): Object types to export. Defaults to EXPORT_TYPES.
+            format (str, optional): "jsonl" or "columns". Defaults to "jsonl".
+
+        Returns:
+            dict: Status of the new export.
+        """
+        page_key = await self.client.resolve_page_id(page_id)
+        # The random suffix keeps exports of a page started within the same second apart
+        export_id = f"{page_key}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        manifest = {
+            "export_id": export_id,
+            "page_id": page_key,
+            "types": types or EXPORT_TYPES,
+            "format": format,
+            "created_time": int(time.time())
+        }
+        await asyncio.to_thread(self._create, manifest)
+        return self._launch(manifest)
+
+    def _create(self, manifest):
+        directory = os.path.join(self.path, manifest["export_id"])
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, "manifest.json"), manifest)
+
+    def _directory(self, export_id):
+        if not export_id or export_id.startswith(".") or os.path.basename(export_id) != export_id:
+            raise KeyError(export_id)
+        return os.path.join(self.path, export_id)
+
+    def _read_manifest(self, export_id):
+        manifest_path = os.path.join(self._directory(export_id), "manifest.json")
+        if not os.path.exists(manifest_path):
+            raise KeyError(export_id)
+        with open(manifest_path) as file:
+            return json.load(file)
+
+    async def resume(self, export_id):
+        """
+        Resume an interrupted export from its checkpoints.
+
+        Raises:
+            KeyError: If the export does not exist.
+        """
+        if export_id in self._tasks and not self._tasks[export_id].done():
+            return self.jobs[export_id]
+        manifest = await asyncio.to_thread(self._read_manifest, export_id)
+        if export_id in self._tasks and not self._tasks[export_id].done():
+            return self.jobs[export_id]
+        return self._launch(manifest)
+
+    def _launch(self, manifest):
+        export_id = manifest["export_id"]
+        self.jobs[export_id] = {
+            **manifest,
+            "status": "running",
+            "started_time": int(time.time()),
+            "types_status": {object_type: {"status": "pending"} for object_type in manifest["types"]},
+            "error": None
+        }
+        self._tasks[export_id] = asyncio.create_task(self._run(manifest))
+        logger.info(f"Started export {export_id} of {', '.join(manifest['types'])}")
+        return self.jobs[export_id]
+
+    async def status(self, export_id):
+        """
+        Get the status of an export, including ones from previous runs found on disk.
+
+        Raises:
+            KeyError: If the export does not exist.
+        """
+        if export_id in self.jobs:
+            return self.jobs[export_id]
+        return await asyncio.to_thread(self._status_on_disk, export_id)
+
+    def _status_on_disk(self, export_id):
+        directory = self._directory(export_id)
+        manifest = self._read_manifest(export_id)
+        types_status = {}
+        for object_type in manifest["types"]:
+            checkpoint_path = os.path.join(directory, f"{object_type}.checkpoint.json")
+            if os.path.exists(checkpoint_path):
+                with open(checkpoint_path) as file:
+                    checkpoint = json.load(file)
+                types_status[object_type] = {
+                    "status": "done" if checkpoint["done"] else "interrupted",
+                    "records": checkpoint["records"],
+                    "chunks": checkpoint["chunks"]
+                }
+            else:
+                types_status[object_type] = {"status": "pending"}
+        done = all(status["status"] == "done" for status in types_status.values())
+        return {**manifest, "status": "done" if done else "interrupted", "types_status": types_status}
+
+    async def list_exports(self):
+        """List the exports found on disk, with the live status of those started by this process."""
+        statuses = await asyncio.to_thread(self._list_on_disk, set(self.jobs))
+        return [self.jobs.get(status["export_id"], status) for status in statuses]
+
+    def _list_on_disk(self, running):
+        if not os.path.isdir(self.path):
+            return []
+        return [
+            {"export_id": export_id} if export_id in running else self._status_on_disk(export_id)
+            for export_id in sorted(os.listdir(self.path))
+            if os.path.exists(os.path.join(self.path, export_id, "manifest.json"))
+        ]
+
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _run(self, manifest):
+        export_id = manifest["export_id"]
+        job = self.jobs[export_id]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def export_type(object_type):
+            async with semaphore:
+                await self._export_type(manifest, object_type, job["types_status"][object_type])
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(export_type(t) for t in manifest["types"]), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            job["status"] = "failed"
+            job["error"] = str(errors[0])
+            logger.error(f"Export {export_id} failed: {str(errors[0])}")
+        else:
+            job["status"] = "done"
+            logger.info(f"Export {export_id} finished in {time.perf_counter() - started:.1f}s")
+        job["duration_seconds"] = round(time.perf_counter() - started, 3)
+
+    async def _export_type(self, manifest, object_type, status):
+        directory = os.path.join(self.path, manifest["export_id"])
+        writer = await asyncio.to_thread(ChunkWriter, directory, object_type, manifest["format"], self.chunk_size)
+        if writer.checkpoint["done"]:
+            status.update(status="done", records=writer.records, chunks=writer.chunks)
+            return
+        await asyncio.to_thread(writer.discard_partial)
+        status.update(status="running", records=writer.records, chunks=writer.chunks)
+
+        walk = getattr(self, f"_walk_{object_type}")
+        try:
+            async for kind, item in walk(manifest["page_id"], writer.checkpoint["cursor"]):
+                if kind == "record":
+                    writer.write(item)
+                else:
+                    await writer.boundary(item)
+                    status.update(records=writer.records, chunks=writer.chunks)
+            await writer.finish()
+        except BaseException as e:
+            await asyncio.shield(asyncio.to_thread(writer.close))
+            status.update(status="failed", error=str(e) or type(e).__name__, records=writer.records)
+            raise
+        status.update(status="done", records=writer.records, chunks=writer.chunks)
+
+    async def _walk_connection(self, id, connection_name, args, cursor, extra=None):
+        """Yield the records of a connection, with a boundary after every upstream page."""
+        args = cursor or args
+        while args is not None:
+            page = await self.client.get_connections(id, connection_name, **args)
+            for record in page.get("data", []):
+                yield "record", ({**record, **extra} if extra else record)
+            args = self.client.next_page_args(page, args)
+            yield "boundary", args
+
+    async def _walk_posts(self, page_id, cursor):
+        args = {"fields": ",".join(POST_FIELDS), "limit": 100}
+        async for item in self._walk_connection(page_id, "posts", args, cursor):
+            yield item
+
+    async def _walk_mentions(self, page_id, cursor):
+        args = {"fields": ",".join(MENTION_FIELDS), "limit": 100}
+        async for item in self._walk_connection(page_id, "tagged", args, cursor):
+            yield item
+
+    async def _walk_post_children(self, page_id, cursor, connection_name, fields):
+        # Boundaries fall after every page of children: the cursor holds the args
+        # of the posts page being walked, the post reached with its creation time
+        # and its next children page, which is None once all of that post's
+        # children are written
+        cursor = cursor or {"posts": {"fields": "id,created_time", "limit": 100}}
+        posts_args = cursor["posts"]
+        resume_id = cursor.get("post_id")
+        children_args = cursor.get("children")
+        while posts_args is not None:
+            posts = await self.client.get_connections(page_id, "posts", **posts_args)
+            for post in posts.get("data", []):
+                post_id = post["id"]
+                args = {"fields": ",".join(fields), "limit": 100}
+                if resume_id is not None:
+                    # Posts are listed newest first, so the refetched posts before the
+                    # checkpointed one, even when new posts moved it to a later page,
+                    # were written before the checkpoint or published after the export
+                    if post_id == resume_id:
+                        resume_id = None
+                        if children_args is None:
+                            continue
+                        args = children_args
+                    elif (post.get("created_time") or "") > cursor["created_time"]:
+                        continue
+                    else:
+                        # The checkpointed post is gone
+                        resume_id = None
+                async for kind, item in self._walk_connection(post_id, connection_name, args, None, {"post_id": post_id}):
+                    if kind == "record":
+                        yield kind, item
+                    else:
+                        yield "boundary", {
+                            "posts": posts_args,
+                            "post_id": post_id,
+                            "created_time": post.get("created_time") or "",
+                            "children": item
+                        }
+            posts_args = self.client.next_page_args(posts, posts_args)
+            yield "boundary", {"posts": posts_args} if posts_args is not None else None
+
+    async def _walk_comments(self, page_id, cursor):
+        async for item in self._walk_post_children(page_id, cursor, "comments", COMMENT_FIELDS):
+            yield item
+
+    async def _walk_likes(self, page_id, cursor):
+        async for item in self._walk_post_children(page_id, cursor, "likes", LIKE_FIELDS):
+            yield item
+
+    async def _walk_insights(self, page_id, cursor):
+        now = int(time.time())
+        since = (cursor or {}).get("since", now - INSIGHTS_BACKFILL_DAYS * 86400)
+        while since < now:
+            until = min(since + INSIGHTS_WINDOW, now)
+            insights = await self.client.get_connections(
+                page_id, "insights", metric=",".join(INSIGHTS_METRICS), period="day", since=since, until=until
+            )
+            for metric in insights.get("data", []):
+                for point in metric.get("values", []):
+                    yield "record", {
+                        "name": metric.get("name"),
+                        "period": metric.get("period"),
+                        "end_time": point.get("end_time"),
+                        "value": point.get("value")
+                    }
+            since = until
+            yield "boundary", ({"since": since} if since < now else None)
@@ -1,32 +1,625 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qsl, urlsplit
+
 import facebook
+import httpx
 from loguru import logger
-from app.core.config import FACEBOOK_ACCESS_TOKEN, FACEBOOK_API_VERSION
+from app.core.config import (
+    FACEBOOK_ACCESS_TOKEN,
+    FACEBOOK_API_VERSION,
+    FACEBOOK_GRAPH_URL,
+    FACEBOOK_HTTP_MAX_CONNECTIONS,
+    FACEBOOK_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    FACEBOOK_HTTP_KEEPALIVE_EXPIRY,
+    FACEBOOK_HTTP_TIMEOUT,
+    FACEBOOK_HTTP_CONNECT_TIMEOUT,
+    FACEBOOK_HTTP_POOL_TIMEOUT,
+    USER_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_PAGE_INFO,
+    RESPONSE_CACHE_TTL_POSTS,
+    RESPONSE_CACHE_TTL_INSIGHTS,
+    RESPONSE_CACHE_TTL_FANS,
+    RESPONSE_CACHE_TTL_MENTIONS,
+    SEARCH_INDEX_REFRESH_INTERVAL
+)
+from app.core.error_handlers import FacebookAPIException
+from app.core.logging_config import sampled_logger
+from app.core.metrics import GRAPH_REQUESTS_IN_FLIGHT, record_graph_call
+from app.core.tracing import CLIENT, graph_operation, start_span
+from app.services.cache import TTLCache
+from app.services.coalesce import SingleFlight
+from app.services.fields import selected_keys, project
+from app.services.search_index import SearchIndex, page_id_of
+from app.services.sync_store import graph_timestamp
+from app.services.rate_limiter import RateLimiter, APP_SCOPE, THROTTLE_ERROR_CODES
+from app.services.resilience import CircuitBreaker, call_with_retry
+
+# Fields requested when enriching comment authors and likers
+USER_DETAIL_FIELDS = "id,name,picture.type(large),link,email"
+
+# Maximum number of requests accepted in a single Graph Batch API call
+GRAPH_BATCH_LIMIT = 50
+
+# Default fields requested for each object type
+POST_FIELDS = ["id", "message", "created_time", "permalink_url", "likes.summary(true)", "comments.summary(true)", "shares", "attachments"]
+COMMENT_FIELDS = ["id", "message", "created_time", "from{id,name,picture,link}", "like_count"]
+LIKE_FIELDS = ["id", "name", "picture", "link"]
+CONVERSATION_FIELDS = ["id", "link", "updated_time", "messages.limit(10){message,from,created_time}"]
+SEARCH_FIELDS = ["id", "message", "created_time", "from", "permalink_url"]
+
+# Fields of the post itself and of authors in the composite post view
+FULL_POST_FIELDS = ["id", "message", "created_time", "updated_time", "permalink_url", "from", "shares", "attachments"]
+AUTHOR_FIELDS = "id,name,picture,link"
+
+# Time to live of cached responses per client method. Cache keys are
+# (method, page_id, fields, limit, period, metrics) tuples. Cached responses
+# are shared between callers and must not be mutated.
+RESPONSE_CACHE_TTLS = {
+    "get_page_info": RESPONSE_CACHE_TTL_PAGE_INFO,
+    "get_page_posts": RESPONSE_CACHE_TTL_POSTS,
+    "get_page_insights": RESPONSE_CACHE_TTL_INSIGHTS,
+    "get_page_fans": RESPONSE_CACHE_TTL_FANS,
+    "get_page_mentions": RESPONSE_CACHE_TTL_MENTIONS
+}
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=FACEBOOK_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=FACEBOOK_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=FACEBOOK_HTTP_KEEPALIVE_EXPIRY
+)
+
+def create_http_client():
+    """
+    Create the pooled HTTP client used for Graph API requests.
+    
+    Connections are kept alive between requests so that TCP and TLS handshakes
+    to graph.facebook.com are paid once per pooled connection rather than once
+    per call. Pool size and timeouts come from config.
+    
+    Returns:
+        httpx.AsyncClient: Configured HTTP client.
+    """
+    return httpx.AsyncClient(
+        limits=HTTP_LIMITS,
+        timeout=httpx.Timeout(
+            FACEBOOK_HTTP_TIMEOUT,
+            connect=FACEBOOK_HTTP_CONNECT_TIMEOUT,
+            pool=FACEBOOK_HTTP_POOL_TIMEOUT
+        )
+    )
+
+def graph_endpoint(path):
+    """Name a Graph path by the endpoint it targets: its connection name, "object" or "batch"."""
+    parts = path.split("/")
+    return "batch" if not path else parts[1] if len(parts) > 1 else "object"
+
+def _log_index_failure(page_id, task):
+    """Log the failure of a background index build; Graph errors are already logged by the build."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and not isinstance(error, facebook.GraphAPIError):
+        logger.error(f"Error building search index for page {page_id}: {str(error) or type(error).__name__}")
 
 class FacebookClient:
     """
-    Client for interacting with the Facebook Graph API using the facebook-sdk package.
+    Asynchronous client for interacting with the Facebook Graph API.
+
+    Requests are issued through a pooled ``httpx.AsyncClient`` so that handlers
+    awaiting upstream calls never block the event loop.
     """
     
-    def __init__(self, access_token=None, version=None):
+    def __init__(self, access_token=None, version=None, http_client=None, rate_limiter=None, page_scope="page:me",
+                 shared=None):
         """
         Initialize the Facebook Graph API client.
         
         Args:
             access_token (str, optional): Facebook access token. Defaults to the one in config.
             version (str, optional): Facebook API version. Defaults to the one in config.
+            http_client (httpx.AsyncClient, optional): Shared HTTP client. When omitted the
+                Facebook client creates and owns its own connection pool.
+            rate_limiter (RateLimiter, optional): Shared rate limiter. Defaults to a new one.
+            page_scope (str, optional): Rate limit budget charged for this client's token.
+                Defaults to "page:me".
+            shared (FacebookClient, optional): Client whose caches, search index, in-flight
+                requests and circuit breakers are shared, so that clients holding different
+                tokens of the same pages serve, invalidate and report them as one. Pages must
+                then be passed by ID: responses for "me" are cached as the shared client's page.
+                Defaults to stores of this client's own.
         """
         self.access_token = access_token or FACEBOOK_ACCESS_TOKEN
         self.version = version or FACEBOOK_API_VERSION
-        self.graph = facebook.GraphAPI(access_token=self.access_token, version=self.version)
-        logger.info(f"Facebook client initialized with API version {self.version}")
+        self.base_url = f"{FACEBOOK_GRAPH_URL}/v{self.version}/"
+        self._owns_http_client = http_client is None
+        self.http = http_client or create_http_client()
+        # Pool limits are only known for HTTP clients created here or shared with a client that knows them
+        self.http_limits = HTTP_LIMITS if http_client is None else None
+        self._graph = None
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.page_scope = page_scope
+        if shared is not None:
+            self.user_cache = shared.user_cache
+            self.response_cache = shared.response_cache
+            self.inflight = shared.inflight
+            self.search_index = shared.search_index
+            self._index_tasks = shared._index_tasks
+            self.circuit_breakers = shared.circuit_breakers
+            if self.http is shared.http:
+                self.http_limits = shared.http_limits
+        else:
+            self.user_cache = TTLCache(max_entries=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL)
+            self.response_cache = TTLCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+            self.inflight = SingleFlight()
+            self.search_index = SearchIndex()
+            self._index_tasks = {}
+            self.circuit_breakers = {}
+        self._owns_index_tasks = shared is None
+    
+    @property
+    def graph(self):
+        """
+        Synchronous ``facebook.GraphAPI`` instance for ad-hoc scripts.
+
+        Must not be used from request handlers as every call blocks the event loop.
+        """
+        if self._graph is None:
+            self._graph = facebook.GraphAPI(access_token=self.access_token, version=self.version)
+        return self._graph
+    
+    async def close(self):
+        """Stop background work and close the HTTP connection pool if this client owns it."""
+        if self._owns_index_tasks:
+            for task in self._index_tasks.values():
+                task.cancel()
+        if self._owns_http_client:
+            await self.http.aclose()
+    
+    def pool_stats(self):
+        """
+        Get statistics about the upstream HTTP connection pool.
+        
+        The live counts come from httpcore internals; when those are not
+        available only the configured limits are reported.
+        
+        Returns:
+            dict: Open, active and idle connections, requests waiting for a
+                connection and the configured pool limits.
+        """
+        limits = {}
+        if self.http_limits is not None:
+            limits = {
+                "max_connections": self.http_limits.max_connections,
+                "max_keepalive_connections": self.http_limits.max_keepalive_connections,
+                "keepalive_expiry": self.http_limits.keepalive_expiry
+            }
+        try:
+            pool = self.http._transport._pool
+            connections = list(pool.connections)
+            queued = [pool_request.is_queued() for pool_request in list(pool._requests)]
+            idle = sum(1 for connection in connections if connection.is_idle())
+        except AttributeError:
+            return limits
+        return {
+            "open_connections": len(connections),
+            "active_connections": len(connections) - idle,
+            "idle_connections": idle,
+            "waiting_requests": queued.count(True),
+            **limits
+        }
+    
+    def stats(self):
+        """
+        Get runtime statistics for this client.
+        
+        Returns:
+            dict: Statistics grouped by subsystem.
+        """
+        return {
+            "connection_pool": self.pool_stats(),
+            "user_cache": self.user_cache.stats(),
+            "response_cache": self.response_cache.stats(),
+            "coalescing": self.inflight.stats(),
+            "search_index": self.search_index.stats(),
+            "rate_limits": self.rate_limiter.stats(),
+            "circuit_breakers": {name: breaker.stats() for name, breaker in self.circuit_breakers.items()}
+        }
+    
+    async def warm_up(self, page_ids=("me",), connections=4):
+        """
+        Open pooled connections and pre-fill the response cache before serving traffic.
+        
+        Concurrent HEAD requests to the Graph host establish ``connections``
+        keep-alive connections without spending rate limit budget. Then the page
+        info and latest posts of every page are fetched with the defaults the
+        routes use, so the first requests for them are cache hits.
+        
+        Args:
+            page_ids (iterable, optional): Pages whose data is pre-fetched. Defaults to ("me",).
+            connections (int, optional): Number of connections to open. Defaults to 4.
+            
+        Returns:
+            dict: Connections opened and pages warmed, with the pages that failed.
+        """
+        results = await asyncio.gather(
+            *(self.http.head(FACEBOOK_GRAPH_URL) for _ in range(connections)),
+            return_exceptions=True
+        )
+        opened = sum(1 for result in results if not isinstance(result, Exception))
+        
+        failed = {}
+        for page_id in page_ids:
+            try:
+                await asyncio.gather(self.get_page_info(page_id=page_id), self.get_page_posts(page_id=page_id))
+            except Exception as e:
+                failed[page_id] = str(e)
+                logger.warning(f"Could not warm up page {page_id}: {str(e)}")
+        return {
+            "connections": opened,
+            "pages": [page_id for page_id in page_ids if page_id not in failed],
+            "failed": failed
+        }
+    
+    def invalidate_cache(self, page_id=None, method=None):
+        """
+        Invalidate cached upstream responses.
+        
+        Args:
+            page_id (str, optional): Only invalidate responses for this page. Defaults to all pages.
+            method (str, optional): Only invalidate responses of this client method
+                (e.g. "get_page_posts"). Defaults to all methods.
+            
+        Returns:
+            int: Number of cache entries removed.
+        """
+        removed = self.response_cache.invalidate(
+            lambda key: (page_id is None or key[1] == page_id) and (method is None or key[0] == method)
+        )
+        sampled_logger.info("Invalidated {} cached responses (page_id={}, method={})", removed, page_id, method)
+        return removed
+    
+    async def request(self, path, args=None, post_args=None, method=None):
+        """
+        Fetch the given path in the Graph API.
+        
+        Mirrors ``facebook.GraphAPI.request``: the access token is added to the
+        query (or form) arguments and Graph error payloads are raised as
+        ``facebook.GraphAPIError``. Identical GET requests issued while one is
+        already in flight are coalesced into a single upstream call. Transient
+        errors are retried with jittered backoff behind a per-endpoint circuit
+        breaker; once retries are exhausted, or while the circuit is open, a
+        ``FacebookAPIException`` with a Retry-After hint is raised.
+        
+        Args:
+            path (str): Graph path relative to the versioned base URL.
+            args (dict, optional): Query string arguments.
+            post_args (dict, optional): Form arguments. Turns the request into a POST.
+            method (str, optional): HTTP method. Defaults to GET (or POST with post_args).
+            
+        Returns:
+            dict: Decoded JSON response.
+        """
+        args = dict(args or {})
+        if post_args is not None:
+            method = "POST"
+            post_args = dict(post_args)
+            post_args.setdefault("access_token", self.access_token)
+        else:
+            args.setdefault("access_token", self.access_token)
+        method = method or "GET"
+        
+        endpoint = graph_endpoint(path)
+        circuit_breaker = self._circuit_breaker(endpoint)
+        send = lambda: call_with_retry(lambda: self._send(method, path, args, post_args, endpoint), circuit_breaker)
+        if method != "GET":
+            return await send()
+        
+        # Identical concurrent GETs share one upstream request, even when sent with
+        # different tokens of the same page; "me" means a different object per token
+        token = args["access_token"]
+        if token == self.access_token and path.split("/", 1)[0] != "me":
+            token = None
+        key = (path, token, tuple(sorted((name, str(value)) for name, value in args.items() if name != "access_token")))
+        return await self.inflight.do(key, send)
+    
+    def _circuit_breaker(self, name):
+        """Get the circuit breaker of a Graph endpoint (connection name, object or batch)."""
+        breaker = self.circuit_breakers.get(name)
+        if breaker is None:
+            breaker = self.circuit_breakers[name] = CircuitBreaker(name)
+        return breaker
     
-    def get_page_info(self, page_id="me", fields=None):
+    async def _send(self, method, path, args, post_args, endpoint):
+        """
+        Send a single request to the Graph API and decode its response.
+        
+        The request is paced by the rate limiter, which is updated from the usage
+        headers of the response and from throttling errors. Every attempt is
+        recorded in the upstream call metrics and traced as a client span.
+        """
+        await self.rate_limiter.acquire([APP_SCOPE, self.page_scope])
+        span = start_span(f"Graph {method} {endpoint}", kind=CLIENT, attributes={
+            "http.request.method": method,
+            "graph.endpoint": endpoint,
+            "graph.path": path,
+            "graph.fields": args.get("fields")
+        })
+        started = time.perf_counter()
+        GRAPH_REQUESTS_IN_FLIGHT.inc()
+        try:
+            response = await self.http.request(
+                method,
+                self.base_url + path,
+                params=args,
+                data=post_args
+            )
+        except httpx.HTTPError as e:
+            record_graph_call(endpoint, "error", time.perf_counter() - started)
+            error = facebook.GraphAPIError({"error": {"message": f"Request to Graph API failed: {str(e)}", "type": "TransportError"}})
+            if span is not None:
+                span.end(error)
+            raise error
+        finally:
+            GRAPH_REQUESTS_IN_FLIGHT.dec()
+        duration = time.perf_counter() - started
+        if span is not None:
+            span.set_attribute("http.response.status_code", response.status_code)
+        
+        self.rate_limiter.observe(response.headers, self.page_scope)
+        try:
+            result = response.json()
+        except ValueError:
+            record_graph_call(endpoint, response.status_code, duration)
+            error = facebook.GraphAPIError({"error": {"message": f"Unexpected Graph API response ({response.status_code})", "type": "ResponseError"}})
+            error.http_status = response.status_code
+            if span is not None:
+                span.end(error)
+            raise error
+        
+        if result and isinstance(result, dict) and result.get("error"):
+            error = facebook.GraphAPIError(result)
+            error.http_status = response.status_code
+            record_graph_call(endpoint, response.status_code, duration, error_code=error.code)
+            if span is not None:
+                span.set_attribute("graph.error_code", error.code)
+                span.end(error)
+            if error.code in THROTTLE_ERROR_CODES:
+                self.rate_limiter.record_throttle(error.code, self.page_scope)
+                error.retry_after = self.rate_limiter.retry_after(error.code, self.page_scope)
+            raise error
+        record_graph_call(endpoint, response.status_code, duration)
+        if span is not None:
+            span.end()
+        return result
+    
+    @graph_operation
+    async def get_object(self, id, **args):
+        """Fetch the given object from the graph."""
+        return await self.request(id, args)
+    
+    @graph_operation
+    async def get_connections(self, id, connection_name, **args):
+        """Fetch the connections for the given object."""
+        return await self.request(f"{id}/{connection_name}", args)
+    
+    @graph_operation
+    async def iter_connection_pages(self, id, connection_name, **args):
+        """
+        Iterate over the pages of a connection, following cursor pagination.
+        
+        Each page is fetched only when the previous one has been consumed, so
+        memory use does not depend on the size of the connection.
+        
+        Args:
+            id (str): ID of the object owning the connection.
+            connection_name (str): Name of the connection (e.g. "posts").
+            **args: Query arguments of the first request (fields, limit, after...).
+            
+        Yields:
+            dict: Each page of the connection as returned by the Graph API.
+        """
+        while args is not None:
+            page = await self.get_connections(id, connection_name, **args)
+            yield page
+            args = self.next_page_args(page, args)
+    
+    @staticmethod
+    def next_page_args(page, args):
+        """
+        Get the query arguments for the page following ``page``.
+        
+        Prefers ``paging.cursors.after`` and falls back to the query string of
+        ``paging.next`` for connections paginated by time or offset.
+        
+        Args:
+            page (dict): Page returned by the Graph API.
+            args (dict): Query arguments used to fetch ``page``.
+            
+        Returns:
+            dict: Arguments for the next page, or None when there are no more pages.
+        """
+        paging = page.get("paging") or {}
+        if not page.get("data") or "next" not in paging:
+            return None
+        
+        next_args = dict(args)
+        after = (paging.get("cursors") or {}).get("after")
+        if after:
+            next_args["after"] = after
+        else:
+            next_args.update(parse_qsl(urlsplit(paging["next"]).query))
+            next_args.pop("access_token", None)
+        return next_args
+    
+    @graph_operation
+    async def iter_connection(self, id, connection_name, max_items=None, **args):
+        """
+        Iterate over the items of a connection across all of its pages.
+        
+        Args:
+            id (str): ID of the object owning the connection.
+            connection_name (str): Name of the connection (e.g. "comments").
+            max_items (int, optional): Stop after this many items. Defaults to all items.
+            **args: Query arguments of the first request.
+            
+        Yields:
+            dict: Each item of the connection.
+        """
+        count = 0
+        async for page in self.iter_connection_pages(id, connection_name, **args):
+            for item in page.get("data", []):
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+    
+    @graph_operation
+    async def get_users_details(self, user_ids):
+        """
+        Get additional details for a set of users using the Graph Batch API.
+        
+        Unique IDs are split into chunks of ``GRAPH_BATCH_LIMIT`` and the chunks are
+        requested concurrently, so enriching a full page of comments or likes costs
+        a single round trip. Users found in the user profile cache are served
+        without any upstream call. Users whose details cannot be retrieved (usually
+        due to missing permissions) are left out of the result.
+        
+        Args:
+            user_ids (list): IDs of the users to look up. Duplicates are ignored.
+            
+        Returns:
+            dict: Mapping of user ID to the user's details.
+        """
+        users = {}
+        missing_ids = []
+        for user_id in dict.fromkeys(user_id for user_id in user_ids if user_id):
+            user_details = self.user_cache.get(user_id)
+            if user_details is None:
+                missing_ids.append(user_id)
+            elif user_details:
+                users[user_id] = user_details
+        if not missing_ids:
+            return users
+        
+        chunks = [
+            missing_ids[i:i + GRAPH_BATCH_LIMIT]
+            for i in range(0, len(missing_ids), GRAPH_BATCH_LIMIT)
+        ]
+        results = await asyncio.gather(*(
+            self.inflight.do(("users", tuple(chunk)), lambda chunk=chunk: self._get_users_batch(chunk))
+            for chunk in chunks
+        ))
+        
+        for result in results:
+            for user_id, user_details in result.items():
+                self.user_cache.set(user_id, user_details)
+                if user_details:
+                    users[user_id] = user_details
+        return users
+    
+    async def _get_users_batch(self, user_ids):
+        """
+        Fetch details for up to ``GRAPH_BATCH_LIMIT`` users in a single batch request.
+        
+        Users that Graph refuses with a client error are mapped to an empty dict so
+        the refusal can be cached; transient failures are left out entirely.
+        """
+        batch = [
+            {"method": "GET", "relative_url": f"{user_id}?fields={USER_DETAIL_FIELDS}"}
+            for user_id in user_ids
+        ]
+        
+        try:
+            responses = await self.request("", post_args={
+                "batch": json.dumps(batch),
+                "include_headers": "false"
+            })
+        except (facebook.GraphAPIError, FacebookAPIException) as e:
+            # If we can't get additional details, continue with what we have
+            logger.warning(f"Could not get additional details for {len(user_ids)} users: {str(e)}")
+            return {}
+        
+        users = {}
+        for user_id, response in zip(user_ids, responses):
+            if not response or response.get("code") != 200:
+                body = (response or {}).get("body")
+                logger.warning(f"Could not get additional details for user {user_id}: {body}")
+                if response and 400 <= response.get("code", 0) < 500:
+                    users[user_id] = {}
+                continue
+            users[user_id] = json.loads(response["body"])
+        return users
+    
+    async def _enrich_comments(self, comments, keys=None):
+        """
+        Merge additional author details into each comment's ``from`` dict, fetched in one batch.
+        
+        When ``keys`` is given only those author fields are merged, and no lookup
+        happens if nothing beyond the author ID was selected.
+        """
+        if keys is not None and not keys - {"id"}:
+            return
+        user_ids = [
+            comment["from"]["id"] for comment in comments
+            if isinstance(comment.get("from"), dict) and "id" in comment["from"]
+        ]
+        users = await self.get_users_details(user_ids)
+        for comment in comments:
+            user = comment.get("from")
+            if isinstance(user, dict) and user.get("id") in users:
+                # Update user info with additional details
+                user.update(project(users[user["id"]], keys))
+    
+    async def _enrich_likes(self, likes, keys=None):
+        """Merge additional user details into each like, fetched in one batch. ``keys`` restricts the merged fields."""
+        if keys is not None and not keys - {"id"}:
+            return
+        users = await self.get_users_details([like["id"] for like in likes if "id" in like])
+        for like in likes:
+            if like.get("id") in users:
+                # Update user info with additional details
+                like.update(project(users[like["id"]], keys))
+    
+    def _index_posts(self, posts):
+        """Add fetched posts to the local search index."""
+        for post in posts:
+            if "id" in post:
+                self.search_index.add(page_id_of(post["id"]), "post", post)
+    
+    def _index_comments(self, post_id, comments):
+        """Add fetched comments of a post to the local search index."""
+        for comment in comments:
+            self.search_index.add(page_id_of(post_id), "comment", {**comment, "post_id": post_id})
+    
+    @graph_operation
+    async def resolve_page_id(self, page_id):
+        """
+        Resolve the "me" alias to the numeric ID of the authenticated page.
+        
+        Args:
+            page_id (str): Page ID or "me".
+            
+        Returns:
+            str: Numeric page ID.
+        """
+        if page_id != "me":
+            return page_id
+        page_info = await self.get_page_info(page_id=page_id, fields=["id"])
+        return page_info["id"]
+    
+    @graph_operation
+    async def get_page_info(self, page_id="me", fields=None, use_cache=True):
         """
         Get detailed information about a Facebook page.
         
         Args:
             page_id (str, optional): ID of the page. Defaults to "me".
             fields (list, optional): List of fields to retrieve. Defaults to None.
+            use_cache (bool, optional): Serve from the response cache when possible. Defaults to True.
             
         Returns:
             dict: Dictionary containing page information.
@@ -34,18 +627,26 @@ class FacebookClient:
         if fields is None:
             fields = ["id", "name", "about", "category", "fan_count", "link", "picture", "website"]
         
+        cache_key = ("get_page_info", page_id, tuple(fields), None, None, None)
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            page_info = self.graph.get_object(
+            page_info = await self.get_object(
                 id=page_id,
                 fields=",".join(fields)
             )
-            logger.info(f"Retrieved page info for {page_id}")
+            sampled_logger.info("Retrieved page info for {}", page_id)
+            self.response_cache.set(cache_key, page_info, ttl=RESPONSE_CACHE_TTLS["get_page_info"])
             return page_info
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving page info: {str(e)}")
             raise
     
-    def get_page_posts(self, page_id="me", limit=10, fields=None):
+    @graph_operation
+    async def get_page_posts(self, page_id="me", limit=10, fields=None, use_cache=True):
         """
         Get posts from a Facebook page.
         
@@ -53,27 +654,37 @@ class FacebookClient:
             page_id (str, optional): ID of the page. Defaults to "me".
             limit (int, optional): Maximum number of posts to retrieve. Defaults to 10.
             fields (list, optional): List of fields to retrieve. Defaults to None.
+            use_cache (bool, optional): Serve from the response cache when possible. Defaults to True.
             
         Returns:
             dict: Dictionary containing posts data.
         """
         if fields is None:
-            fields = ["id", "message", "created_time", "permalink_url", "likes.summary(true)", "comments.summary(true)", "shares", "attachments"]
+            fields = POST_FIELDS
+        
+        cache_key = ("get_page_posts", page_id, tuple(fields), limit, None, None)
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         try:
-            posts = self.graph.get_connections(
+            posts = await self.get_connections(
                 id=page_id,
                 connection_name="posts",
                 fields=",".join(fields),
                 limit=limit
             )
-            logger.info(f"Retrieved {len(posts.get('data', []))} posts from page {page_id}")
+            sampled_logger.info("Retrieved {} posts from page {}", len(posts.get('data', [])), page_id)
+            self._index_posts(posts.get("data", []))
+            self.response_cache.set(cache_key, posts, ttl=RESPONSE_CACHE_TTLS["get_page_posts"])
             return posts
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving posts: {str(e)}")
             raise
     
-    def get_post_details(self, post_id, fields=None):
+    @graph_operation
+    async def get_post_details(self, post_id, fields=None):
         """
         Get details of a specific post.
         
@@ -85,20 +696,70 @@ class FacebookClient:
             dict: Dictionary containing post details.
         """
         if fields is None:
-            fields = ["id", "message", "created_time", "permalink_url", "likes.summary(true)", "comments.summary(true)", "shares", "attachments"]
+            fields = POST_FIELDS
         
         try:
-            post = self.graph.get_object(
+            post = await self.get_object(
                 id=post_id,
                 fields=",".join(fields)
             )
-            logger.info(f"Retrieved details for post {post_id}")
+            sampled_logger.info("Retrieved details for post {}", post_id)
+            self._index_posts([post])
             return post
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving post details: {str(e)}")
             raise
     
-    def get_post_comments(self, post_id, limit=25, fields=None):
+    @graph_operation
+    async def get_post_full(self, post_id, comments_limit=25, likes_limit=25, replies=False, replies_limit=10):
+        """
+        Get a post with its comments, likes and their authors in a single Graph request.
+        
+        Comments and likes are fetched through nested field expansion, so authors
+        come back with the post instead of through separate enrichment calls.
+        
+        Args:
+            post_id (str): ID of the post.
+            comments_limit (int, optional): Maximum number of top-level comments. Defaults to 25.
+            likes_limit (int, optional): Maximum number of likes. Defaults to 25.
+            replies (bool, optional): Also fetch replies of each comment. Defaults to False.
+            replies_limit (int, optional): Maximum number of replies per comment. Defaults to 10.
+            
+        Returns:
+            dict: The post with ``comments`` and ``likes`` connections, each comment
+                carrying its ``replies`` when requested.
+        """
+        comment_fields = f"id,message,created_time,like_count,comment_count,from{{{AUTHOR_FIELDS}}}"
+        if replies:
+            comment_fields += (
+                f",comments.limit({replies_limit}).summary(true)"
+                f"{{id,message,created_time,like_count,from{{{AUTHOR_FIELDS}}}}}"
+            )
+        fields = FULL_POST_FIELDS + [
+            f"comments.limit({comments_limit}).summary(true){{{comment_fields}}}",
+            f"likes.limit({likes_limit}).summary(true){{{AUTHOR_FIELDS}}}"
+        ]
+        
+        try:
+            post = await self.get_object(
+                id=post_id,
+                fields=",".join(fields)
+            )
+            comments = post.setdefault("comments", {"data": []}).get("data", [])
+            for comment in comments:
+                comment["post_id"] = post_id
+                if replies:
+                    comment["replies"] = comment.pop("comments", {}).get("data", [])
+            sampled_logger.info("Retrieved post {} with {} comments in one request", post_id, len(comments))
+            self._index_posts([post])
+            self._index_comments(post_id, comments)
+            return post
+        except facebook.GraphAPIError as e:
+            logger.error(f"Error retrieving full post: {str(e)}")
+            raise
+    
+    @graph_operation
+    async def get_post_comments(self, post_id, limit=25, fields=None):
         """
         Get comments on a specific post with detailed user information.
         
@@ -110,44 +771,60 @@ class FacebookClient:
         Returns:
             dict: Dictionary containing comments data with user details.
         """
+        keys = None if fields is None else selected_keys(fields, "from")
         if fields is None:
-            fields = ["id", "message", "created_time", "from{id,name,picture,link}", "like_count"]
+            fields = COMMENT_FIELDS
         
         try:
-            comments = self.graph.get_connections(
+            comments = await self.get_connections(
                 id=post_id,
                 connection_name="comments",
                 fields=",".join(fields),
                 limit=limit
             )
-            logger.info(f"Retrieved {len(comments.get('data', []))} comments for post {post_id}")
+            sampled_logger.info("Retrieved {} comments for post {}", len(comments.get('data', [])), post_id)
             
-            # Process user details for each comment
             if "data" in comments:
-                for comment in comments["data"]:
-                    # Ensure 'from' field is properly formatted
-                    if "from" in comment and isinstance(comment["from"], dict):
-                        user = comment["from"]
-                        # Add additional user details if available
-                        if "id" in user:
-                            try:
-                                # Try to get additional user details if permissions allow
-                                user_details = self.graph.get_object(
-                                    id=user["id"],
-                                    fields="id,name,picture.type(large),link,email"
-                                )
-                                # Update user info with additional details
-                                comment["from"].update(user_details)
-                            except Exception as e:
-                                # If we can't get additional details, continue with what we have
-                                logger.warning(f"Could not get additional details for user {user.get('id')}: {str(e)}")
+                await self._enrich_comments(comments["data"], keys)
+                self._index_comments(post_id, comments["data"])
             
             return comments
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving comments: {str(e)}")
             raise
     
-    def get_post_likes(self, post_id, limit=25, fields=None):
+    @graph_operation
+    async def get_comment(self, post_id, comment_id, fields=None):
+        """
+        Get a single comment on a post with detailed user information.
+        
+        Args:
+            post_id (str): ID of the post the comment belongs to.
+            comment_id (str): ID of the comment.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            
+        Returns:
+            dict: Dictionary containing the comment with user details.
+        """
+        keys = None if fields is None else selected_keys(fields, "from")
+        if fields is None:
+            fields = COMMENT_FIELDS
+        
+        try:
+            comment = await self.get_object(
+                id=comment_id,
+                fields=",".join(fields)
+            )
+            sampled_logger.info("Retrieved comment {} on post {}", comment_id, post_id)
+            await self._enrich_comments([comment], keys)
+            self._index_comments(post_id, [comment])
+            return comment
+        except facebook.GraphAPIError as e:
+            logger.error(f"Error retrieving comment: {str(e)}")
+            raise
+    
+    @graph_operation
+    async def get_post_likes(self, post_id, limit=25, fields=None):
         """
         Get likes on a specific post with detailed user information.
         
@@ -159,65 +836,63 @@ class FacebookClient:
         Returns:
             dict: Dictionary containing likes data with user details.
         """
+        keys = None if fields is None else selected_keys(fields)
         if fields is None:
-            fields = ["id", "name", "picture", "link"]
+            fields = LIKE_FIELDS
         
         try:
-            likes = self.graph.get_connections(
+            likes = await self.get_connections(
                 id=post_id,
                 connection_name="likes",
                 fields=",".join(fields),
                 limit=limit
             )
-            logger.info(f"Retrieved {len(likes.get('data', []))} likes for post {post_id}")
+            sampled_logger.info("Retrieved {} likes for post {}", len(likes.get('data', [])), post_id)
             
-            # Process user details for each like
             if "data" in likes:
-                for like in likes["data"]:
-                    # Try to get additional user details if permissions allow
-                    if "id" in like:
-                        try:
-                            user_details = self.graph.get_object(
-                                id=like["id"],
-                                fields="id,name,picture.type(large),link,email"
-                            )
-                            # Update user info with additional details
-                            like.update(user_details)
-                        except Exception as e:
-                            # If we can't get additional details, continue with what we have
-                            logger.warning(f"Could not get additional details for user {like.get('id')}: {str(e)}")
+                await self._enrich_likes(likes["data"], keys)
             
             return likes
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving likes: {str(e)}")
             raise
     
-    def get_page_fans(self, page_id="me", limit=25):
+    @graph_operation
+    async def get_page_fans(self, page_id="me", limit=25, use_cache=True):
         """
         Get fans/followers count for a Facebook page using insights.
         
         Args:
             page_id (str, optional): ID of the page. Defaults to "me".
             limit (int, optional): Maximum number of data points to retrieve. Defaults to 25.
+            use_cache (bool, optional): Serve from the response cache when possible. Defaults to True.
             
         Returns:
             dict: Dictionary containing page fans data.
         """
+        cache_key = ("get_page_fans", page_id, None, limit, None, ("page_fans",))
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             # Use insights/page_fans to get follower count data
-            fans = self.graph.get_connections(
+            fans = await self.get_connections(
                 id=page_id,
                 connection_name="insights",
                 metric="page_fans",
                 limit=limit
             )
-            logger.info(f"Retrieved page fans data for page {page_id}")
+            sampled_logger.info("Retrieved page fans data for page {}", page_id)
+            self.response_cache.set(cache_key, fans, ttl=RESPONSE_CACHE_TTLS["get_page_fans"])
             return fans
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving page fans: {str(e)}")
             raise
     
-    def get_page_mentions(self, page_id="me", limit=25, fields=None):
+    @graph_operation
+    async def get_page_mentions(self, page_id="me", limit=25, fields=None, use_cache=True):
         """
         Get tagged posts/mentions of a Facebook page.
         
@@ -225,6 +900,7 @@ class FacebookClient:
             page_id (str, optional): ID of the page. Defaults to "me".
             limit (int, optional): Maximum number of mentions to retrieve. Defaults to 25.
             fields (list, optional): List of fields to retrieve. Defaults to None.
+            use_cache (bool, optional): Serve from the response cache when possible. Defaults to True.
             
         Returns:
             dict: Dictionary containing tagged posts data.
@@ -232,21 +908,29 @@ class FacebookClient:
         if fields is None:
             fields = ["id", "message", "created_time", "from", "story"]
         
+        cache_key = ("get_page_mentions", page_id, tuple(fields), limit, None, None)
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             # Use tagged connection to get posts where the page is tagged
-            tagged = self.graph.get_connections(
+            tagged = await self.get_connections(
                 id=page_id,
                 connection_name="tagged",
                 fields=",".join(fields),
                 limit=limit
             )
-            logger.info(f"Retrieved {len(tagged.get('data', []))} tagged posts for page {page_id}")
+            sampled_logger.info("Retrieved {} tagged posts for page {}", len(tagged.get('data', [])), page_id)
+            self.response_cache.set(cache_key, tagged, ttl=RESPONSE_CACHE_TTLS["get_page_mentions"])
             return tagged
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving tagged posts: {str(e)}")
             raise
             
-    def get_page_conversations(self, page_id="me", limit=25, fields=None):
+    @graph_operation
+    async def get_page_conversations(self, page_id="me", limit=25, fields=None):
         """
         Get conversations for a Facebook page.
         
@@ -259,22 +943,55 @@ class FacebookClient:
             dict: Dictionary containing conversations data.
         """
         if fields is None:
-            fields = ["id", "link", "updated_time", "messages.limit(10){message,from,created_time}"]
+            fields = CONVERSATION_FIELDS
         
         try:
-            conversations = self.graph.get_connections(
+            conversations = await self.get_connections(
                 id=page_id,
                 connection_name="conversations",
                 fields=",".join(fields),
                 limit=limit
             )
-            logger.info(f"Retrieved {len(conversations.get('data', []))} conversations for page {page_id}")
+            sampled_logger.info("Retrieved {} conversations for page {}", len(conversations.get('data', [])), page_id)
             return conversations
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving conversations: {str(e)}")
             raise
             
-    def get_page_insights(self, page_id="me", metrics=None, period="day", limit=25):
+    @graph_operation
+    async def get_conversation_details(self, conversation_id, limit=25, fields=None):
+        """
+        Get detailed messages for a specific conversation.
+        
+        Args:
+            conversation_id (str): ID of the conversation.
+            limit (int, optional): Maximum number of messages to retrieve. Defaults to 25.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            
+        Returns:
+            dict: Dictionary containing the conversation and its messages.
+        """
+        if fields is None:
+            fields = [
+                "id", 
+                "link", 
+                "updated_time", 
+                f"messages.limit({limit}){{message,from{{id,name,picture}},created_time}}"
+            ]
+        
+        try:
+            conversation = await self.get_object(
+                id=conversation_id,
+                fields=",".join(fields)
+            )
+            sampled_logger.info("Retrieved details for conversation {}", conversation_id)
+            return conversation
+        except facebook.GraphAPIError as e:
+            logger.error(f"Error retrieving conversation details: {str(e)}")
+            raise
+            
+    @graph_operation
+    async def get_page_insights(self, page_id="me", metrics=None, period="day", limit=25, use_cache=True):
         """
         Get insights/analytics for a Facebook page.
         
@@ -283,6 +1000,7 @@ class FacebookClient:
             metrics (list, optional): List of metrics to retrieve. Defaults to None.
             period (str, optional): Time period for metrics. Defaults to "day".
             limit (int, optional): Maximum number of data points to retrieve. Defaults to 25.
+            use_cache (bool, optional): Serve from the response cache when possible. Defaults to True.
             
         Returns:
             dict: Dictionary containing page insights data.
@@ -296,41 +1014,83 @@ class FacebookClient:
                 "page_views_total"
             ]
         
+        cache_key = ("get_page_insights", page_id, None, limit, period, tuple(metrics))
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            insights = self.graph.get_connections(
+            insights = await self.get_connections(
                 id=page_id,
                 connection_name="insights",
                 metric=",".join(metrics),
                 period=period,
                 limit=limit
             )
-            logger.info(f"Retrieved page insights for page {page_id}")
+            sampled_logger.info("Retrieved page insights for page {}", page_id)
+            self.response_cache.set(cache_key, insights, ttl=RESPONSE_CACHE_TTLS["get_page_insights"])
             return insights
         except facebook.GraphAPIError as e:
             logger.error(f"Error retrieving page insights: {str(e)}")
             raise
             
-    def search_page_feed(self, page_id="me", query=None, limit=25, fields=None):
+    @graph_operation
+    async def search_page_feed(self, page_id="me", query=None, limit=25, fields=None, offset=0, doc_type="post"):
         """
         Search for posts in a page's feed.
         
+        Queries are answered from the local search index once the page's full
+        history has been indexed. Until then the most recent posts are fetched and
+        filtered locally while the history is indexed in the background.
+        
         Args:
             page_id (str, optional): ID of the page. Defaults to "me".
             query (str, optional): Search query. Defaults to None.
             limit (int, optional): Maximum number of results to retrieve. Defaults to 25.
             fields (list, optional): List of fields to retrieve. Defaults to None.
+            offset (int, optional): Number of ranked results to skip. Defaults to 0.
+            doc_type (str, optional): "post", "comment" or None for both. Defaults to "post".
             
         Returns:
             dict: Dictionary containing search results.
         """
+        keys = None if fields is None else selected_keys(fields)
         if fields is None:
-            fields = ["id", "message", "created_time", "from", "permalink_url"]
+            fields = SEARCH_FIELDS
         
         try:
             # If query is provided, use it to filter posts
             if query:
+                page_key = await self.resolve_page_id(page_id)
+                # Posts indexed as a side effect of other calls are only a sample of the page
+                indexed = self.search_index.indexed_pages.get(page_key)
+                if indexed is not None:
+                    # Posts published since the last build are added in the background
+                    if time.monotonic() - indexed["refreshed_at"] >= SEARCH_INDEX_REFRESH_INTERVAL:
+                        # Also spaces out retries when the refresh fails
+                        indexed["refreshed_at"] = time.monotonic()
+                        self._schedule_index_build(page_key, since=indexed["newest"])
+                    total, results = self.search_index.search(
+                        query, page_id=page_key, doc_type=doc_type, offset=offset, limit=limit
+                    )
+                    sampled_logger.info("Found {} indexed documents matching query '{}'", total, query)
+                    if keys is not None:
+                        results = [project(result, keys | {"type", "post_id", "score"}) for result in results]
+                    return {
+                        "data": results,
+                        "paging": {
+                            "total": total,
+                            "offset": offset,
+                            "limit": limit,
+                            "next_offset": offset + limit if offset + limit < total else None
+                        }
+                    }
+                
+                self._schedule_index_build(page_key)
+                
                 # First get all posts
-                posts = self.get_page_posts(page_id=page_id, limit=limit*2, fields=fields)
+                posts = await self.get_page_posts(page_id=page_id, limit=limit*2, fields=fields)
                 
                 # Then filter locally by query
                 if "data" in posts:
@@ -348,12 +1108,161 @@ class FacebookClient:
                         "paging": posts.get("paging", {})
                     }
                     
-                    logger.info(f"Found {len(filtered_posts)} posts matching query '{query}'")
+                    sampled_logger.info("Found {} posts matching query '{}'", len(filtered_posts), query)
                     return result
                 return posts
             else:
                 # If no query, just return posts
-                return self.get_page_posts(page_id=page_id, limit=limit, fields=fields)
+                return await self.get_page_posts(page_id=page_id, limit=limit, fields=fields)
         except facebook.GraphAPIError as e:
             logger.error(f"Error searching page feed: {str(e)}")
             raise
+    
+    @graph_operation
+    async def build_search_index(self, page_id="me", include_comments=False, since=None):
+        """
+        Index the full post history of a page, and optionally all comments.
+        
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            include_comments (bool, optional): Also index the comments of every post. Defaults to False.
+            since (int, optional): Only index posts created from this Unix time on, to top up
+                an index already built. Defaults to the full history.
+            
+        Returns:
+            dict: Number of posts and comments walked.
+        """
+        page_key = await self.resolve_page_id(page_id)
+        refreshed_at = time.monotonic()
+        newest = since or 0
+        args = {} if since is None else {"since": since}
+        posts = comments = 0
+        try:
+            async for post in self.iter_page_posts(page_id=page_key, fields=SEARCH_FIELDS, **args):
+                posts += 1
+                newest = max(newest, graph_timestamp(post.get("created_time")) or 0)
+                if include_comments:
+                    async for comment in self.iter_connection(post["id"], "comments", fields="id,message,created_time,from", limit=100):
+                        self._index_comments(post["id"], [comment])
+                        comments += 1
+        except facebook.GraphAPIError as e:
+            logger.error(f"Error building search index for page {page_key}: {str(e)}")
+            raise
+        
+        self.search_index.indexed_pages[page_key] = {"refreshed_at": refreshed_at, "newest": newest}
+        sampled_logger.info("Indexed {} posts and {} comments for page {}", posts, comments, page_key)
+        return {"page_id": page_key, "posts": posts, "comments": comments}
+    
+    def _schedule_index_build(self, page_id, since=None):
+        """Start indexing a page's history, or its posts since ``since``, in the background unless already running."""
+        task = self._index_tasks.get(page_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self.build_search_index(page_id, since=since))
+            task.add_done_callback(lambda t: _log_index_failure(page_id, t))
+            self._index_tasks[page_id] = task
+    
+    @graph_operation
+    async def iter_page_posts(self, page_id="me", page_size=100, max_items=None, fields=None, **args):
+        """
+        Iterate over all posts of a Facebook page, following pagination.
+        
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            page_size (int, optional): Number of posts requested per upstream call. Defaults to 100.
+            max_items (int, optional): Maximum number of posts to yield. Defaults to all posts.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            **args: Additional query arguments such as ``since`` and ``until``.
+            
+        Yields:
+            dict: Each post.
+        """
+        if fields is None:
+            fields = POST_FIELDS
+        
+        async for post in self.iter_connection(page_id, "posts", max_items=max_items, fields=",".join(fields), limit=page_size, **args):
+            self._index_posts([post])
+            yield post
+    
+    @graph_operation
+    async def iter_post_comments(self, post_id, page_size=100, max_items=None, fields=None, **args):
+        """
+        Iterate over all comments on a post with detailed user information.
+        
+        Authors are enriched one upstream page at a time, in a single batch per page.
+        
+        Args:
+            post_id (str): ID of the post.
+            page_size (int, optional): Number of comments requested per upstream call. Defaults to 100.
+            max_items (int, optional): Maximum number of comments to yield. Defaults to all comments.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            **args: Additional query arguments such as ``since`` and ``until``.
+            
+        Yields:
+            dict: Each comment with user details.
+        """
+        keys = None if fields is None else selected_keys(fields, "from")
+        if fields is None:
+            fields = COMMENT_FIELDS
+        
+        count = 0
+        async for page in self.iter_connection_pages(post_id, "comments", fields=",".join(fields), limit=page_size, **args):
+            comments = page.get("data", [])
+            if max_items is not None:
+                comments = comments[:max_items - count]
+            await self._enrich_comments(comments, keys)
+            self._index_comments(post_id, comments)
+            for comment in comments:
+                yield comment
+            count += len(comments)
+            if max_items is not None and count >= max_items:
+                return
+    
+    @graph_operation
+    async def iter_post_likes(self, post_id, page_size=100, max_items=None, fields=None):
+        """
+        Iterate over all likes on a post with detailed user information.
+        
+        Args:
+            post_id (str): ID of the post.
+            page_size (int, optional): Number of likes requested per upstream call. Defaults to 100.
+            max_items (int, optional): Maximum number of likes to yield. Defaults to all likes.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            
+        Yields:
+            dict: Each like with user details.
+        """
+        keys = None if fields is None else selected_keys(fields)
+        if fields is None:
+            fields = LIKE_FIELDS
+        
+        count = 0
+        async for page in self.iter_connection_pages(post_id, "likes", fields=",".join(fields), limit=page_size):
+            likes = page.get("data", [])
+            if max_items is not None:
+                likes = likes[:max_items - count]
+            await self._enrich_likes(likes, keys)
+            for like in likes:
+                yield like
+            count += len(likes)
+            if max_items is not None and count >= max_items:
+                return
+    
+    @graph_operation
+    async def iter_page_conversations(self, page_id="me", page_size=25, max_items=None, fields=None):
+        """
+        Iterate over all conversations of a Facebook page, following pagination.
+        
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            page_size (int, optional): Number of conversations requested per upstream call. Defaults to 25.
+            max_items (int, optional): Maximum number of conversations to yield. Defaults to all.
+            fields (list, optional): List of fields to retrieve. Defaults to None.
+            
+        Yields:
+            dict: Each conversation.
+        """
+        if fields is None:
+            fields = CONVERSATION_FIELDS
+        
+        async for conversation in self.iter_connection(page_id, "conversations", max_items=max_items, fields=",".join(fields), limit=page_size):
+            yield conversation
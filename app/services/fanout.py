@@ -0,0 +1,63 @@
+import asyncio
+
+import facebook
+
+from app.core.config import FANOUT_CONCURRENCY
+from app.core.error_handlers import FacebookAPIException
+
+async def fan_out(keys, fn, concurrency=FANOUT_CONCURRENCY):
+    """
+    Run ``fn`` for every key concurrently and yield results as they complete.
+
+    At most ``concurrency`` calls are in flight at once. A failing call does not
+    affect the others; its exception is yielded in place of a result.
+
+    Args:
+        keys (iterable): Keys to call ``fn`` with, e.g. page IDs.
+        fn (callable): Coroutine function taking one key.
+        concurrency (int, optional): Maximum number of concurrent calls.
+
+    Yields:
+        tuple: ``(key, result, error)`` where exactly one of result and error is set.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key):
+        async with semaphore:
+            try:
+                return key, await fn(key), None
+            except Exception as e:
+                return key, None, e
+
+    tasks = [asyncio.create_task(run(key)) for key in keys]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        # The consumer went away (e.g. client disconnected); stop remaining calls
+        for task in tasks:
+            task.cancel()
+
+def error_details(error):
+    """
+    Describe an exception raised for a single key of a fan-out.
+
+    Args:
+        error (Exception): Exception raised by the call.
+
+    Returns:
+        dict: Status code, message and details, mirroring the API error responses.
+    """
+    if isinstance(error, FacebookAPIException):
+        details = {"status_code": error.status_code, "message": error.message, "details": error.details}
+        if error.retry_after is not None:
+            details["retry_after"] = error.retry_after
+        return details
+    if isinstance(error, facebook.GraphAPIError):
+        return {
+            "status_code": getattr(error, "http_status", None) or 500,
+            "message": "Facebook API error",
+            "details": str(error),
+            "code": getattr(error, "code", None)
+        }
+    return {"status_code": 500, "message": "Internal server error", "details": str(error)}
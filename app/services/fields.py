@@ -0,0 +1,207 @@
+import re
+
+# Fields callers may request per object type. A field maps to the object type
+# of its nested selection (e.g. ``from{id,name}``) or to None for plain values.
+FIELD_ALLOWLISTS = {
+    "page": {
+        "id": None, "name": None, "about": None, "category": None, "description": None,
+        "fan_count": None, "followers_count": None, "link": None, "picture": None,
+        "website": None, "username": None, "cover": None, "verification_status": None
+    },
+    "post": {
+        "id": None, "message": None, "created_time": None, "updated_time": None,
+        "permalink_url": None, "story": None, "full_picture": None, "status_type": None,
+        "is_published": None, "shares": None, "message_tags": None, "from": "user",
+        "likes": "user", "comments": "comment", "reactions": "reaction", "attachments": "attachment"
+    },
+    "comment": {
+        "id": None, "message": None, "created_time": None, "like_count": None,
+        "comment_count": None, "permalink_url": None, "from": "user", "parent": "comment",
+        "comments": "comment", "likes": "user", "attachment": "attachment"
+    },
+    "user": {
+        "id": None, "name": None, "first_name": None, "last_name": None,
+        "picture": None, "link": None, "email": None
+    },
+    "mention": {
+        "id": None, "message": None, "created_time": None, "story": None,
+        "permalink_url": None, "from": "user"
+    },
+    "conversation": {
+        "id": None, "link": None, "updated_time": None, "snippet": None,
+        "message_count": None, "unread_count": None, "participants": "user", "messages": "message"
+    },
+    "message": {
+        "id": None, "message": None, "created_time": None, "from": "user", "to": "user",
+        "attachments": "attachment"
+    },
+    "attachment": {
+        "title": None, "description": None, "url": None, "type": None, "media": None,
+        "media_type": None, "target": None, "subattachments": "attachment"
+    },
+    "reaction": {"id": None, "name": None, "type": None, "pic": None}
+}
+
+# Graph field modifiers, e.g. ``comments.limit(5).summary(true)`` or ``picture.type(large)``
+FIELD_MODIFIERS = {
+    "limit": re.compile(r"^[0-9]{1,3}$"),
+    "summary": re.compile(r"^(true|false)$"),
+    "type": re.compile(r"^(small|normal|album|large|square)$"),
+    "order": re.compile(r"^(chronological|reverse_chronological)$"),
+    "filter": re.compile(r"^(stream|toplevel)$")
+}
+
+_TOKEN = re.compile(r"\s*([A-Za-z0-9_]+|[{},.()])")
+
+def _tokenize(spec):
+    tokens = []
+    position = 0
+    spec = spec.strip()
+    while position < len(spec):
+        match = _TOKEN.match(spec, position)
+        if not match:
+            raise ValueError(f"Unexpected character {spec[position]!r} at position {position}")
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+def parse_fields(spec):
+    """
+    Parse a Graph ``fields`` expression with nested expansion.
+
+    ``"id,comments.limit(5){from{id,name},message}"`` becomes
+    ``[("id", [], None), ("comments", [("limit", "5")], [("from", [], [...]), ("message", [], None)])]``.
+
+    Args:
+        spec (str): Comma-separated field expression.
+
+    Returns:
+        list: ``(name, modifiers, children)`` tuples; children is None for plain fields.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    tokens = _tokenize(spec)
+    position = 0
+
+    def expect(token):
+        nonlocal position
+        if position >= len(tokens) or tokens[position] != token:
+            found = tokens[position] if position < len(tokens) else "end of input"
+            raise ValueError(f"Expected {token!r} but found {found!r}")
+        position += 1
+
+    def parse_word(kind):
+        nonlocal position
+        if position >= len(tokens) or not re.match(r"^[A-Za-z0-9_]+$", tokens[position]):
+            found = tokens[position] if position < len(tokens) else "end of input"
+            raise ValueError(f"Expected {kind} but found {found!r}")
+        position += 1
+        return tokens[position - 1]
+
+    def parse_list():
+        nonlocal position
+        fields = [parse_field()]
+        while position < len(tokens) and tokens[position] == ",":
+            position += 1
+            fields.append(parse_field())
+        return fields
+
+    def parse_field():
+        nonlocal position
+        name = parse_word("a field name")
+        modifiers = []
+        while position < len(tokens) and tokens[position] == ".":
+            position += 1
+            modifier = parse_word("a modifier")
+            expect("(")
+            modifiers.append((modifier, parse_word("a modifier value")))
+            expect(")")
+        children = None
+        if position < len(tokens) and tokens[position] == "{":
+            position += 1
+            children = parse_list()
+            expect("}")
+        return name, modifiers, children
+
+    if not tokens:
+        raise ValueError("No fields requested")
+    fields = parse_list()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position]!r} after field list")
+    return fields
+
+def render_field(field):
+    """Render a parsed field back into Graph ``fields`` syntax."""
+    name, modifiers, children = field
+    rendered = name + "".join(f".{modifier}({value})" for modifier, value in modifiers)
+    if children is not None:
+        rendered += "{" + ",".join(render_field(child) for child in children) + "}"
+    return rendered
+
+def _validate(fields, object_type, path=""):
+    allowed = FIELD_ALLOWLISTS[object_type]
+    for name, modifiers, children in fields:
+        if name not in allowed:
+            raise ValueError(
+                f"Unknown {object_type} field '{path}{name}'. Allowed fields: {', '.join(sorted(allowed))}"
+            )
+        for modifier, value in modifiers:
+            pattern = FIELD_MODIFIERS.get(modifier)
+            if pattern is None or not pattern.match(value):
+                raise ValueError(f"Invalid modifier '.{modifier}({value})' on field '{path}{name}'")
+        if children is not None:
+            if allowed[name] is None:
+                raise ValueError(f"Field '{path}{name}' does not support nested fields")
+            _validate(children, allowed[name], f"{path}{name}.")
+
+def resolve_fields(spec, object_type):
+    """
+    Validate a caller supplied ``fields`` expression and translate it for Graph.
+
+    The ``id`` field is always included as responses and enrichment depend on it.
+
+    Args:
+        spec (str): Comma-separated field expression, or None for the defaults.
+        object_type (str): Key of FIELD_ALLOWLISTS, e.g. "post".
+
+    Returns:
+        list: Top-level Graph field strings, or None if no projection was requested.
+
+    Raises:
+        ValueError: If the expression is malformed or requests fields outside the allowlist.
+    """
+    if spec is None or not spec.strip():
+        return None
+    fields = parse_fields(spec)
+    _validate(fields, object_type)
+    if "id" in FIELD_ALLOWLISTS[object_type] and not any(name == "id" for name, _, _ in fields):
+        fields.insert(0, ("id", [], None))
+    return list(dict.fromkeys(render_field(field) for field in fields))
+
+def selected_keys(fields, name=None):
+    """
+    Get the keys selected by a list of Graph field strings.
+
+    Args:
+        fields (list): Graph field strings as returned by ``resolve_fields``.
+        name (str, optional): Nested field whose selected keys are wanted, e.g. "from".
+
+    Returns:
+        set: Top-level keys, or the keys selected inside ``name``. A nested field
+            selected without subfields yields Graph's defaults ``{"id", "name"}``;
+            one not selected at all yields an empty set.
+    """
+    parsed = parse_fields(",".join(fields))
+    if name is None:
+        return {field_name for field_name, _, _ in parsed}
+    for field_name, _, children in parsed:
+        if field_name == name:
+            return {"id", "name"} if children is None else {child[0] for child in children}
+    return set()
+
+def project(item, keys):
+    """Keep only ``keys`` of a dict; None keeps everything."""
+    if keys is None:
+        return item
+    return {key: value for key, value in item.items() if key in keys}
@@ -0,0 +1,234 @@
+import os
+import threading
+
+import numpy as np
+
+from app.core.config import INSIGHTS_STORE_DIR
+from app.services.sync_store import graph_timestamp
+
+DAY = 86400
+# 1970-01-01 was a Thursday; weeks are aligned on Mondays, the first one being 1970-01-05
+WEEK_OFFSET = 4 * DAY
+
+def _bucket_starts(end_times, window, origin=None):
+    """
+    Map each timestamp to the start of the window containing it.
+
+    Args:
+        end_times (numpy.ndarray): Sorted Unix timestamps.
+        window (str or int): "week", "month" or a window length in days.
+        origin (int, optional): Start of the first custom window. Defaults to the first timestamp.
+
+    Returns:
+        numpy.ndarray: Window start timestamps, one per input timestamp.
+    """
+    # A data point's end_time is the end of the day it measures
+    times = end_times - 1
+    if window == "month":
+        months = times.astype("datetime64[s]").astype("datetime64[M]")
+        return months.astype("datetime64[s]").astype(np.int64)
+    if window == "week":
+        return times - (times - WEEK_OFFSET) % (7 * DAY)
+    size = int(window) * DAY
+    start = times[0] if origin is None else origin
+    return times - (times - start) % size
+
+def _moving_average(values, size):
+    """Trailing moving average over ``size`` points, computed with a cumulative sum."""
+    if size <= 1:
+        return values
+    if len(values) < size:
+        return values[:0]
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    return (cumsum[size:] - cumsum[:-size]) / size
+
+class InsightsStore:
+    """
+    Columnar store for page insights time series.
+
+    Each (page, metric, period) series is kept as two sorted NumPy arrays, the
+    ``end_time`` of every data point and its value, so rollups over long ranges
+    are a handful of vectorized operations instead of walking Graph JSON.
+    Series are persisted as one compressed ``.npz`` archive per page.
+    """
+
+    def __init__(self, path=INSIGHTS_STORE_DIR):
+        """
+        Open the store and load persisted series.
+
+        Args:
+            path (str, optional): Directory of the per-page archives. Defaults to
+                INSIGHTS_STORE_DIR; None keeps the store in memory only.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._series = {}
+        self._dirty = set()
+        if path:
+            os.makedirs(path, exist_ok=True)
+            for name in os.listdir(path):
+                if name.endswith(".npz"):
+                    self._load(os.path.join(path, name))
+
+    def _load(self, filename):
+        with np.load(filename, allow_pickle=False) as archive:
+            page_id = str(archive["page_id"])
+            for key in archive.files:
+                if key.endswith("|t"):
+                    metric, period = key[:-2].split("|")
+                    self._series[(page_id, metric, period)] = (archive[key], archive[f"{metric}|{period}|v"])
+
+    def save(self):
+        """Write the archives of pages changed since the last save. Returns the number of pages written."""
+        if not self.path:
+            return 0
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            snapshots = {
+                page_id: {
+                    f"{metric}|{period}|{column}": array
+                    for (series_page, metric, period), (end_times, values) in self._series.items()
+                    if series_page == page_id
+                    for column, array in (("t", end_times), ("v", values))
+                }
+                for page_id in dirty
+            }
+        for page_id, arrays in snapshots.items():
+            filename = os.path.join(self.path, f"{page_id}.npz")
+            # Write then rename so a crash never leaves a truncated archive behind
+            with open(filename + ".tmp", "wb") as file:
+                np.savez_compressed(file, page_id=np.array(page_id), **arrays)
+            os.replace(filename + ".tmp", filename)
+        return len(snapshots)
+
+    def ingest(self, page_id, insights):
+        """
+        Merge a Graph insights response into the stored series.
+
+        Points already stored for the same ``end_time`` are overwritten. Values
+        that are not numbers (e.g. breakdowns by country) are skipped.
+
+        Args:
+            page_id (str): ID of the page.
+            insights (dict): Graph response of the page's ``insights`` connection.
+
+        Returns:
+            int: Number of data points ingested.
+        """
+        ingested = 0
+        with self._lock:
+            for metric in insights.get("data", []):
+                points = [
+                    (graph_timestamp(point.get("end_time")), point.get("value"))
+                    for point in metric.get("values", [])
+                ]
+                points = [
+                    (end_time, value) for end_time, value in points
+                    if end_time is not None and isinstance(value, (int, float)) and not isinstance(value, bool)
+                ]
+                if not points:
+                    continue
+                key = (page_id, metric.get("name"), metric.get("period"))
+                end_times = np.fromiter((point[0] for point in points), dtype=np.int64, count=len(points))
+                values = np.fromiter((point[1] for point in points), dtype=np.float64, count=len(points))
+                if key in self._series:
+                    stored_times, stored_values = self._series[key]
+                    end_times = np.concatenate([stored_times, end_times])
+                    values = np.concatenate([stored_values, values])
+                # np.unique keeps the first occurrence; flip so the newest values win
+                end_times, index = np.unique(end_times[::-1], return_index=True)
+                self._series[key] = (end_times, values[::-1][index])
+                self._dirty.add(page_id)
+                ingested += len(points)
+        return ingested
+
+    def get_series(self, page_id, metric, period="day", since=None, until=None):
+        """
+        Get a stored series, optionally restricted to ``since <= end_time < until``.
+
+        Returns:
+            tuple: End time and value arrays (empty if the series is unknown).
+        """
+        with self._lock:
+            end_times, values = self._series.get(
+                (page_id, metric, period), (np.empty(0, dtype=np.int64), np.empty(0))
+            )
+        start = 0 if since is None else np.searchsorted(end_times, since, side="left")
+        stop = len(end_times) if until is None else np.searchsorted(end_times, until, side="left")
+        return end_times[start:stop], values[start:stop]
+
+    def latest_end_time(self, page_id, metric, period="day"):
+        """Get the newest stored ``end_time`` of a series, or None."""
+        end_times, _ = self.get_series(page_id, metric, period)
+        return int(end_times[-1]) if len(end_times) else None
+
+    def rollup(self, page_id, metric, period="day", window="week", since=None, until=None, moving_average=7):
+        """
+        Aggregate a series into calendar or fixed-size windows.
+
+        Args:
+            page_id (str): ID of the page.
+            metric (str): Insights metric name.
+            period (str, optional): Insights period of the series. Defaults to "day".
+            window (str or int, optional): "week", "month" or a window length in days.
+            since (int, optional): Only use points ending at or after this Unix timestamp.
+            until (int, optional): Only use points ending before this Unix timestamp.
+            moving_average (int, optional): Points in the trailing moving average; 0 disables it.
+
+        Returns:
+            dict: Per-window sum, mean, min, max, count and delta of the sum against
+                the previous window, plus the moving average of the raw points.
+        """
+        end_times, values = self.get_series(page_id, metric, period, since, until)
+        result = {
+            "page_id": page_id,
+            "metric": metric,
+            "period": period,
+            "window": window,
+            "points": int(len(values)),
+            "buckets": []
+        }
+        if not len(values):
+            return result
+
+        starts = _bucket_starts(end_times, window, origin=since)
+        # Series are sorted, so every window is a contiguous run of points
+        bucket_starts, first, counts = np.unique(starts, return_index=True, return_counts=True)
+        sums = np.add.reduceat(values, first)
+        means = sums / counts
+        minimums = np.minimum.reduceat(values, first)
+        maximums = np.maximum.reduceat(values, first)
+        deltas = np.diff(sums, prepend=np.nan)
+
+        result["buckets"] = [
+            {
+                "start": int(start),
+                "sum": total,
+                "mean": mean,
+                "min": minimum,
+                "max": maximum,
+                "count": count,
+                "delta": None if np.isnan(delta) else delta
+            }
+            for start, total, mean, minimum, maximum, count, delta in zip(
+                bucket_starts.tolist(), sums.tolist(), means.tolist(), minimums.tolist(),
+                maximums.tolist(), counts.tolist(), deltas.tolist()
+            )
+        ]
+        if moving_average:
+            averaged = _moving_average(values, moving_average)
+            result["moving_average"] = {
+                "size": moving_average,
+                "end_times": end_times[len(end_times) - len(averaged):].tolist(),
+                "values": averaged.tolist()
+            }
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "path": self.path,
+                "series": len(self._series),
+                "points": int(sum(len(end_times) for end_times, _ in self._series.values())),
+                "pages": len({page_id for page_id, _, _ in self._series})
+            }
@@ -0,0 +1,271 @@
+import asyncio
+import json
+import time
+
+from loguru import logger
+
+from app.core.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAX_RATE,
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PACING_THRESHOLD,
+    RATE_LIMIT_USAGE_WINDOW,
+    RATE_LIMIT_THROTTLE_COOLDOWN,
+    RATE_LIMIT_MAX_WAIT
+)
+from app.core.error_handlers import FacebookAPIException
+
+# Graph error codes signalling that a rate limit has been hit, mapped to the
+# budget they apply to
+THROTTLE_ERROR_CODES = {
+    4: "app",
+    17: "page",
+    32: "page",
+    341: "app",
+    613: "page",
+    80001: "page"
+}
+
+APP_SCOPE = "app"
+
+class UsageBudget:
+    """
+    Remaining request budget of one rate limit scope (the app, a page or a business).
+
+    Requests are not paced until reported usage crosses the pacing threshold, so a
+    scope without usage headers (or with little usage) is never slowed down. Above
+    it, usage is turned into a token bucket whose refill rate shrinks as usage
+    approaches 100%, so requests are spread out before Graph starts rejecting
+    them. Observed usage decays over the rolling usage window when no fresher
+    headers arrive.
+    """
+
+    def __init__(self, name, clock=time.monotonic):
+        self.name = name
+        self._clock = clock
+        self.usage = {}
+        self.observed_at = None
+        self.blocked_until = 0.0
+        self.tokens = float(RATE_LIMIT_BURST)
+        self.refilled_at = clock()
+        self.throttled = 0
+        self.waited = 0.0
+        self.lock = asyncio.Lock()
+
+    def observe(self, usage, regain_seconds=0):
+        """
+        Record usage percentages reported by Graph.
+
+        Args:
+            usage (dict): Usage percentages such as call_count, total_time and total_cputime.
+            regain_seconds (float, optional): Time until access is regained if already blocked.
+        """
+        self.usage = {
+            metric: value for metric, value in usage.items()
+            if isinstance(value, (int, float)) and metric != "estimated_time_to_regain_access"
+        }
+        self.observed_at = self._clock()
+        if regain_seconds:
+            self.blocked_until = max(self.blocked_until, self._clock() + regain_seconds)
+
+    def throttle(self, cooldown=RATE_LIMIT_THROTTLE_COOLDOWN):
+        """Mark the budget as exhausted after Graph rejected a request for rate limiting."""
+        self.throttled += 1
+        self.usage = {metric: 100 for metric in self.usage} or {"call_count": 100}
+        self.observed_at = self._clock()
+        self.blocked_until = max(self.blocked_until, self._clock() + cooldown)
+
+    def usage_pct(self):
+        """Highest reported usage percentage, decayed over the rolling usage window."""
+        if not self.usage or self.observed_at is None:
+            return 0.0
+        age = self._clock() - self.observed_at
+        return max(self.usage.values()) * max(0.0, 1 - age / RATE_LIMIT_USAGE_WINDOW)
+
+    def rate(self):
+        """Requests per second currently allowed for this scope, None while it is not paced."""
+        usage = self.usage_pct()
+        if usage <= RATE_LIMIT_PACING_THRESHOLD:
+            return None
+        remaining = max(0.0, 100 - usage) / (100 - RATE_LIMIT_PACING_THRESHOLD)
+        return max(RATE_LIMIT_MIN_RATE, RATE_LIMIT_MAX_RATE * remaining)
+
+    def remaining(self):
+        """Share of the budget left in percent, 0 while blocked after throttling."""
+        if self.blocked_until > self._clock():
+            return 0.0
+        return max(0.0, 100 - self.usage_pct())
+
+    def delay(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: Seconds to wait before a request may be sent, 0 if a token was taken.
+        """
+        now = self._clock()
+        if self.blocked_until > now:
+            return self.blocked_until - now
+
+        rate = self.rate()
+        if rate is None:
+            self.tokens = float(RATE_LIMIT_BURST)
+            self.refilled_at = now
+            return 0.0
+        self.tokens = min(float(RATE_LIMIT_BURST), self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+    def stats(self):
+        blocked_for = max(0.0, self.blocked_until - self._clock())
+        return {
+            "usage": self.usage,
+            "usage_pct": round(self.usage_pct(), 2),
+            "rate_per_second": None if self.rate() is None else round(self.rate(), 3),
+            "tokens": round(self.tokens, 2),
+            "blocked_for_seconds": round(blocked_for, 1),
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited, 3)
+        }
+
+class RateLimiter:
+    """
+    Paces Graph API requests using the usage headers returned by Graph.
+
+    Every request acquires a token from the app budget and from the budget of the
+    page whose token it uses. Budgets are updated from ``X-App-Usage``,
+    ``X-Page-Usage`` and ``X-Business-Use-Case-Usage`` headers and from throttling
+    errors, so requests slow down as usage climbs instead of running into a lockout.
+    """
+
+    def __init__(self, enabled=RATE_LIMIT_ENABLED, max_wait=RATE_LIMIT_MAX_WAIT):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            enabled (bool, optional): Pace requests. When False usage is still tracked.
+            max_wait (float, optional): Longest time a request may be delayed before it
+                is rejected with a 429 error.
+        """
+        self.enabled = enabled
+        self.max_wait = max_wait
+        self.budgets = {}
+
+    def budget(self, scope):
+        """Get the budget of a scope, creating it on first use."""
+        budget = self.budgets.get(scope)
+        if budget is None:
+            budget = self.budgets[scope] = UsageBudget(scope)
+        return budget
+
+    async def acquire(self, scopes):
+        """
+        Wait until every scope has budget for one more request.
+
+        Args:
+            scopes (list): Scopes charged for the request (e.g. ["app", "page:me"]).
+
+        Raises:
+            FacebookAPIException: If the request would have to wait longer than ``max_wait``.
+        """
+        if not self.enabled:
+            return
+        for scope in scopes:
+            budget = self.budget(scope)
+            async with budget.lock:
+                delay = budget.delay()
+                while delay > 0:
+                    if delay > self.max_wait:
+                        raise FacebookAPIException(
+                            status_code=429,
+                            message="Facebook API rate limit reached",
+                            details=f"Budget '{scope}' is exhausted, retry in {int(delay) + 1} seconds",
+                            retry_after=int(delay) + 1
+                        )
+                    budget.waited += delay
+                    await asyncio.sleep(delay)
+                    delay = budget.delay()
+
+    def observe(self, headers, page_scope):
+        """
+        Update budgets from Graph usage headers.
+
+        Args:
+            headers (Mapping): Response headers.
+            page_scope (str): Scope of the page whose token made the request.
+        """
+        app_usage = _parse_header(headers.get("x-app-usage"))
+        if app_usage:
+            self.budget(APP_SCOPE).observe(app_usage)
+
+        page_usage = _parse_header(headers.get("x-page-usage"))
+        if page_usage:
+            self.budget(page_scope).observe(page_usage)
+
+        business_usage = _parse_header(headers.get("x-business-use-case-usage"))
+        for business_id, entries in (business_usage or {}).items():
+            for entry in entries if isinstance(entries, list) else []:
+                regain_seconds = 60 * (entry.get("estimated_time_to_regain_access") or 0)
+                business_budget = self.budget(f"business:{business_id}")
+                business_budget.observe(entry, regain_seconds)
+                # Business use case limits apply to the token, so they also pace its page
+                page_budget = self.budget(page_scope)
+                if business_budget.usage_pct() > page_budget.usage_pct() or regain_seconds:
+                    page_budget.observe(entry, regain_seconds)
+
+    def record_throttle(self, code, page_scope):
+        """
+        Block the affected budget after Graph rejected a request with a throttling code.
+
+        Args:
+            code (int): Graph error code.
+            page_scope (str): Scope of the page whose token made the request.
+        """
+        scope = self._throttle_scope(code, page_scope)
+        self.budget(scope).throttle()
+        logger.warning(f"Graph API throttled request (code {code}), pausing budget '{scope}'")
+
+    def retry_after(self, code, page_scope):
+        """
+        Get the whole seconds until the budget hit by a throttling error is usable again.
+
+        Args:
+            code (int): Graph error code.
+            page_scope (str): Scope of the page whose token made the request.
+
+        Returns:
+            int: Seconds to wait, at least 1.
+        """
+        budget = self.budget(self._throttle_scope(code, page_scope))
+        return max(1, int(budget.blocked_until - budget._clock()) + 1)
+
+    def _throttle_scope(self, code, page_scope):
+        return APP_SCOPE if THROTTLE_ERROR_CODES.get(code) == "app" else page_scope
+
+    def remaining(self, scope):
+        """Share of a scope's budget left in percent; untracked scopes have their full budget."""
+        budget = self.budgets.get(scope)
+        return 100.0 if budget is None else budget.remaining()
+
+    def stats(self):
+        """
+        Get the state of every tracked budget.
+
+        Returns:
+            dict: Budget state keyed by scope.
+        """
+        return {scope: budget.stats() for scope, budget in self.budgets.items()}
+
+def _parse_header(value):
+    """Decode a JSON usage header, ignoring malformed values."""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        logger.warning(f"Could not parse Graph usage header: {value}")
+        return None
@@ -0,0 +1,194 @@
+import asyncio
+import random
+import time
+
+from loguru import logger
+
+from app.core.config import (
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_TIMEOUT,
+    RATE_LIMIT_THROTTLE_COOLDOWN
+)
+from app.core.error_handlers import FacebookAPIException
+from app.services.rate_limiter import THROTTLE_ERROR_CODES
+
+# Graph error codes worth retrying: unknown/service errors and rate limits
+RETRYABLE_ERROR_CODES = {1, 2, 4, 17, 341}
+
+def is_retryable(error):
+    """
+    Check whether a Graph API error is transient.
+
+    Args:
+        error (facebook.GraphAPIError): Error raised by a Graph request.
+
+    Returns:
+        bool: True for retryable error codes, transient errors, 5xx responses
+            and transport failures.
+    """
+    if getattr(error, "code", None) in RETRYABLE_ERROR_CODES:
+        return True
+    if getattr(error, "http_status", 0) >= 500:
+        return True
+    if getattr(error, "type", None) == "TransportError":
+        return True
+    result = getattr(error, "result", None)
+    return isinstance(result, dict) and bool((result.get("error") or {}).get("is_transient"))
+
+def backoff_delay(attempt, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of the attempt that failed, starting at 1.
+        base_delay (float, optional): Delay scale in seconds.
+        max_delay (float, optional): Upper bound of the delay in seconds.
+
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream endpoint keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the circuit opens
+    and calls are rejected for ``recovery_timeout`` seconds. Then a single trial
+    call is let through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def retry_after(self):
+        """Seconds until the circuit lets a trial call through."""
+        if self.state != self.OPEN:
+            return 0
+        return max(0.0, self.opened_at + self.recovery_timeout - self._clock())
+
+    def before_call(self):
+        """
+        Check that a call may proceed.
+
+        Raises:
+            FacebookAPIException: If the circuit is open.
+        """
+        if self.state == self.OPEN and self.retry_after() <= 0:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        if self.state != self.CLOSED:
+            self.rejected += 1
+            retry_after = max(1, int(self.retry_after()) + 1)
+            raise FacebookAPIException(
+                status_code=503,
+                message="Facebook API temporarily unavailable",
+                details=f"Circuit for '{self.name}' is open after repeated upstream failures",
+                retry_after=retry_after
+            )
+
+    def release(self):
+        """Let another call through after a call that neither proved nor disproved upstream health."""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Opening circuit for Graph endpoint '{self.name}' after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 1)
+        }
+
+async def call_with_retry(fn, circuit_breaker, max_attempts=RETRY_MAX_ATTEMPTS):
+    """
+    Call ``fn`` through a circuit breaker, retrying transient Graph errors.
+
+    Non-retryable errors are raised unchanged, except throttling codes, which are
+    raised as a 429 ``FacebookAPIException`` with the Retry-After hint of the rate
+    limiter. When every attempt failed with a transient error, a
+    ``FacebookAPIException`` carrying a Retry-After hint is raised instead (429
+    for throttling codes, 503 otherwise).
+
+    Args:
+        fn (callable): Zero-argument coroutine function performing the request.
+        circuit_breaker (CircuitBreaker): Breaker guarding the upstream endpoint.
+        max_attempts (int, optional): Maximum number of attempts.
+
+    Returns:
+        The result of ``fn``.
+    """
+    attempt = 0
+    while True:
+        circuit_breaker.before_call()
+        attempt += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            circuit_breaker.release()
+            raise
+        except Exception as e:
+            # Throttling means "slow down" rather than "upstream is unhealthy"
+            throttled = getattr(e, "code", None) in THROTTLE_ERROR_CODES
+            if not is_retryable(e):
+                if hasattr(e, "result"):
+                    # The endpoint answered; client errors do not count against its health
+                    circuit_breaker.record_success()
+                else:
+                    circuit_breaker.release()
+                if throttled:
+                    raise FacebookAPIException(
+                        status_code=429,
+                        message="Facebook API rate limit reached",
+                        details=str(e),
+                        retry_after=getattr(e, "retry_after", None) or int(RATE_LIMIT_THROTTLE_COOLDOWN)
+                    ) from e
+                raise
+            if not throttled:
+                circuit_breaker.record_failure()
+            delay = backoff_delay(attempt)
+            if attempt >= max_attempts or circuit_breaker.state == CircuitBreaker.OPEN:
+                retry_after = max(1, int(max(delay, circuit_breaker.retry_after())) + 1, getattr(e, "retry_after", 0))
+                raise FacebookAPIException(
+                    status_code=429 if throttled else 503,
+                    message="Facebook API rate limit reached" if throttled else "Facebook API temporarily unavailable",
+                    details=f"{str(e)} (after {attempt} attempts)",
+                    retry_after=retry_after
+                ) from e
+            logger.warning(f"Retrying Graph request to '{circuit_breaker.name}' in {delay:.2f}s (attempt {attempt}): {str(e)}")
+            await asyncio.sleep(delay)
+        else:
+            circuit_breaker.record_success()
+            return result
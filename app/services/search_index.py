@@ -0,0 +1,169 @@
+import math
+import re
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Fields kept for each indexed document and returned in search results
+STORED_FIELDS = ("id", "message", "created_time", "permalink_url", "from", "post_id")
+
+def tokenize(text):
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        list: Tokens in order of appearance.
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+def page_id_of(object_id):
+    """Get the page ID prefix of a ``<page_id>_<post_id>`` object ID."""
+    return object_id.split("_", 1)[0]
+
+class SearchIndex:
+    """
+    In-memory inverted index over post and comment messages.
+
+    Documents are added incrementally as posts and comments are fetched and are
+    ranked with BM25. Re-adding a document replaces its previous version, so
+    edited messages are re-indexed in place.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1 (float, optional): BM25 term frequency saturation. Defaults to 1.2.
+            b (float, optional): BM25 length normalization. Defaults to 0.75.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)
+        self._documents = {}
+        self._page_documents = defaultdict(int)
+        self._total_length = 0
+        # Fully indexed page ID -> {"refreshed_at": monotonic time, "newest": Unix time of its newest post}
+        self.indexed_pages = {}
+
+    def add(self, page_id, doc_type, document):
+        """
+        Add or replace a document in the index.
+
+        Args:
+            page_id (str): ID of the page the document belongs to.
+            doc_type (str): Type of the document ("post" or "comment").
+            document (dict): Graph object with at least ``id`` and ``message``.
+
+        Returns:
+            bool: True if the document was indexed, False if it has no message.
+        """
+        doc_id = document.get("id")
+        terms = tokenize(document.get("message"))
+        if not doc_id or not terms:
+            return False
+
+        self.remove(doc_id)
+        frequencies = defaultdict(int)
+        for term in terms:
+            frequencies[term] += 1
+        for term, frequency in frequencies.items():
+            self._postings[term][doc_id] = frequency
+
+        self._documents[doc_id] = {
+            "page_id": page_id,
+            "type": doc_type,
+            "length": len(terms),
+            "terms": tuple(frequencies),
+            "data": {field: document[field] for field in STORED_FIELDS if field in document}
+        }
+        self._page_documents[page_id] += 1
+        self._total_length += len(terms)
+        return True
+
+    def remove(self, doc_id):
+        """
+        Remove a document from the index.
+
+        Args:
+            doc_id (str): ID of the document.
+
+        Returns:
+            bool: True if the document was indexed.
+        """
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return False
+        for term in document["terms"]:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._page_documents[document["page_id"]] -= 1
+        self._total_length -= document["length"]
+        return True
+
+    def search(self, query, page_id=None, doc_type=None, offset=0, limit=25):
+        """
+        Search the index.
+
+        Args:
+            query (str): Free text query. Documents matching any term are ranked by BM25.
+            page_id (str, optional): Only return documents of this page.
+            doc_type (str, optional): Only return documents of this type.
+            offset (int, optional): Number of ranked results to skip. Defaults to 0.
+            limit (int, optional): Maximum number of results to return. Defaults to 25.
+
+        Returns:
+            tuple: Total number of matches and the requested slice of results,
+                each result being the stored document with its ``score``.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._documents:
+            return 0, []
+
+        total_documents = len(self._documents)
+        average_length = self._total_length / total_documents
+        scores = defaultdict(float)
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total_documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                document = self._documents[doc_id]
+                if page_id is not None and document["page_id"] != page_id:
+                    continue
+                if doc_type is not None and document["type"] != doc_type:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * document["length"] / average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        # Highest score first, most recent first among equal scores
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (item[1], self._documents[item[0]]["data"].get("created_time") or ""),
+            reverse=True
+        )
+        results = []
+        for doc_id, score in ranked[offset:offset + limit]:
+            document = self._documents[doc_id]
+            results.append({**document["data"], "type": document["type"], "score": round(score, 4)})
+        return len(ranked), results
+
+    def stats(self):
+        """
+        Get index statistics.
+
+        Returns:
+            dict: Number of documents, distinct terms and pages.
+        """
+        return {
+            "documents": len(self._documents),
+            "terms": len(self._postings),
+            "pages": sum(1 for count in self._page_documents.values() if count > 0),
+            "fully_indexed_pages": len(self.indexed_pages)
+        }
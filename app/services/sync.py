@@ -0,0 +1,469 @@
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+
+from loguru import logger
+
+from app.core.config import (
+    SYNC_REFRESH_WINDOW, SYNC_CONCURRENCY, SYNC_CONVERSATIONS, SYNC_MESSAGE_BACKFILL, SYNC_MESSAGE_MAX_FAILURES,
+    SYNC_READ_MAX_AGE, INSIGHTS_METRICS, INSIGHTS_BACKFILL_DAYS
+)
+from app.core.error_handlers import FacebookAPIException
+from app.services.facebook_client import POST_FIELDS
+from app.services.sync_store import graph_timestamp
+
+# Posts are synced with updated_time so that edits and new comments can be detected
+SYNC_POST_FIELDS = POST_FIELDS + ["updated_time"]
+# Conversations are listed without their messages, which are synced separately
+SYNC_CONVERSATION_FIELDS = ["id", "link", "updated_time", "snippet", "message_count", "unread_count", "participants"]
+SYNC_MESSAGE_FIELDS = "id,message,from,to,created_time"
+
+# Graph rejects insights ranges longer than 93 days
+INSIGHTS_CHUNK_DAYS = 90
+# Recent insights values are revised by Facebook for a couple of days
+INSIGHTS_REFRESH_DAYS = 3
+
+class SyncEngine:
+    """
+    Incrementally copies page posts and their comments into the local store.
+
+    Each sync only asks Graph for posts created after the stored watermark, plus
+    the posts of a recent refresh window so that edits and new comments on them
+    are picked up through their ``updated_time``. Comments are only pulled for
+    posts that are new or changed, again starting from a per-post watermark;
+    a post is only recorded as synced once its comments are.
+    Conversations and their messages are synced the same way for the inbox.
+
+    Pages fully synced within ``read_max_age`` seconds have their posts and
+    comments served from the store by the read routes.
+    The stores can be passed as factories, in which case they are only opened
+    the first time they are used.
+    """
+
+    def __init__(self, client, store, insights_store=None, refresh_window=SYNC_REFRESH_WINDOW,
+                 concurrency=SYNC_CONCURRENCY, read_max_age=SYNC_READ_MAX_AGE):
+        """
+        Initialize the sync engine.
+
+        Args:
+            client (FacebookClient): Client used to fetch from the Graph API.
+            store (SyncStore or callable): Store receiving the synced objects, or a
+                factory opening it on first use.
+            insights_store (InsightsStore or callable, optional): Store receiving synced
+                insights series, or a factory opening it on first use.
+            refresh_window (float, optional): Seconds of recent posts re-checked on every sync.
+            concurrency (int, optional): Number of posts whose comments are synced in parallel.
+            read_max_age (float, optional): Seconds after a full sync during which reads of the page
+                are served from the store; 0 disables serving reads from the store.
+        """
+        self.client = client
+        self._store = store
+        self._insights_store = insights_store
+        self._open_lock = threading.Lock()
+        self.refresh_window = refresh_window
+        self.concurrency = concurrency
+        self.read_max_age = read_max_age
+        self._locks = {}
+        # Page ID -> time of the last sync that included comments
+        self._synced_at = {}
+        self.last_results = {}
+
+    def _open(self, name):
+        with self._open_lock:
+            value = getattr(self, name)
+            if callable(value):
+                value = value()
+                setattr(self, name, value)
+            return value
+
+    @property
+    def store(self):
+        return self._open("_store")
+
+    @property
+    def insights_store(self):
+        return self._open("_insights_store")
+
+    def close(self):
+        """Close the stores that were opened, saving pending insights series."""
+        if self._store is not None and not callable(self._store):
+            self._store.close()
+        if self._insights_store is not None and not callable(self._insights_store):
+            self._insights_store.save()
+
+    async def sync_page(self, page_id="me", include_comments=True):
+        """
+        Sync new and recently changed posts of a page, and their comments.
+
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            include_comments (bool, optional): Also sync comments of changed posts. Defaults to True.
+                Posts synced without their comments are still reported as changed by the next sync.
+
+        Returns:
+            dict: Summary of the sync.
+        """
+        page_key = await self.client.resolve_page_id(page_id)
+        lock = self._locks.setdefault(page_key, asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            scope = f"posts:{page_key}"
+            watermark = await asyncio.to_thread(self.store.get_watermark, scope)
+            since = None if watermark is None else min(watermark, int(time.time() - self.refresh_window))
+
+            args = {"since": since} if since is not None else {}
+            fetched = 0
+            newest = watermark or 0
+            changed = []
+            updated_times = {}
+            batch = []
+            async for post in self.client.iter_page_posts(page_id=page_key, fields=SYNC_POST_FIELDS, **args):
+                fetched += 1
+                newest = max(newest, graph_timestamp(post.get("created_time")) or 0)
+                updated_times[post["id"]] = post.get("updated_time")
+                batch.append(post)
+                if len(batch) >= 100:
+                    changed += await asyncio.to_thread(self.store.upsert_posts, page_key, batch)
+                    batch = []
+            if batch:
+                changed += await asyncio.to_thread(self.store.upsert_posts, page_key, batch)
+
+            comments = 0
+            if include_comments and changed:
+                semaphore = asyncio.Semaphore(self.concurrency)
+
+                async def sync_comments(post_id):
+                    async with semaphore:
+                        fetched_comments = await self.sync_post_comments(post_id)
+                    # A post only counts as synced once its comments are, so failed ones are retried next time
+                    await asyncio.to_thread(self.store.mark_posts_synced, {post_id: updated_times[post_id]})
+                    return fetched_comments
+
+                results = await asyncio.gather(*(sync_comments(post_id) for post_id in changed), return_exceptions=True)
+                errors = [result for result in results if isinstance(result, Exception)]
+                if errors:
+                    logger.error(f"Comments of {len(errors)} of {len(changed)} changed posts of page {page_key} failed to sync")
+                    raise errors[0]
+                comments = sum(results)
+
+            if newest:
+                await asyncio.to_thread(self.store.set_watermark, scope, newest)
+            if include_comments:
+                self._synced_at[page_key] = time.time()
+
+            result = {
+                "page_id": page_key,
+                "posts_fetched": fetched,
+                "posts_changed": len(changed),
+                "comments_fetched": comments,
+                "duration_seconds": round(time.perf_counter() - started, 3)
+            }
+            self.last_results[page_key] = result
+            logger.info(f"Synced page {page_key}: {fetched} posts fetched, {len(changed)} changed, {comments} comments")
+            return result
+
+    def _is_fresh(self, page_key):
+        synced_at = self._synced_at.get(page_key)
+        return synced_at is not None and time.time() - synced_at <= self.read_max_age
+
+    async def stored_posts(self, page_id="me", limit=10):
+        """
+        Get the newest posts of a page from the store if the page was fully synced recently.
+
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            limit (int, optional): Maximum number of posts to return. Defaults to 10.
+
+        Returns:
+            dict: Posts in the shape of the Graph response, or None if they have to be read from Graph.
+        """
+        if not self._synced_at:
+            return None
+        page_key = await self.client.resolve_page_id(page_id)
+        if not self._is_fresh(page_key):
+            return None
+        _, posts = await asyncio.to_thread(self.store.get_posts, page_key, limit)
+        return {"data": posts}
+
+    async def stored_comments(self, post_id, limit=25):
+        """
+        Get the oldest comments of a post from the store if its page was fully synced recently.
+
+        Args:
+            post_id (str): ID of the post, prefixed with the ID of its page.
+            limit (int, optional): Maximum number of comments to return. Defaults to 25.
+
+        Returns:
+            dict: Comments in the shape of the Graph response, or None if they have to be read from Graph.
+        """
+        page_key, separator, _ = post_id.partition("_")
+        if not separator or not self._is_fresh(page_key):
+            return None
+        total, comments = await asyncio.to_thread(self.store.get_comments, post_id, limit)
+        # Posts created since the last sync are not stored yet, so posts without stored comments go to Graph
+        if not total:
+            return None
+        return {"data": comments}
+
+    async def sync_post_comments(self, post_id):
+        """
+        Sync comments of a post created after its stored watermark.
+
+        Args:
+            post_id (str): ID of the post.
+
+        Returns:
+            int: Number of comments fetched.
+        """
+        scope = f"comments:{post_id}"
+        watermark = await asyncio.to_thread(self.store.get_watermark, scope)
+        args = {"since": watermark} if watermark is not None else {}
+
+        fetched = 0
+        newest = watermark or 0
+        batch = []
+        async for comment in self.client.iter_post_comments(post_id=post_id, **args):
+            comment["post_id"] = post_id
+            newest = max(newest, graph_timestamp(comment.get("created_time")) or 0)
+            batch.append(comment)
+            fetched += 1
+            if len(batch) >= 100:
+                await asyncio.to_thread(self.store.upsert_comments, post_id, batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(self.store.upsert_comments, post_id, batch)
+        if newest:
+            await asyncio.to_thread(self.store.set_watermark, scope, newest)
+        return fetched
+
+    async def sync_conversations(self, page_id="me", include_messages=True):
+        """
+        Sync conversations of a page that changed since the last sync, and their new messages.
+
+        Graph lists conversations most recently updated first, so the listing
+        stops at the first conversation whose ``updated_time`` matches the store,
+        once conversations left behind by a failed sync have been listed again:
+        when nothing changed a sync costs a single upstream request. Left-behind
+        conversations Graph no longer lists are dropped after a full listing.
+
+        A conversation whose messages fail to sync is retried by the next syncs
+        and given up after ``SYNC_MESSAGE_MAX_FAILURES`` consecutive failures
+        until it changes again; it does not fail the sync of the others. Only
+        throttling and upstream outages, which would fail every conversation
+        alike, are raised and not counted.
+
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            include_messages (bool, optional): Also sync messages of changed conversations. Defaults to True.
+                Conversations synced without their messages are still reported as changed by the next sync.
+
+        Returns:
+            dict: Summary of the sync.
+        """
+        page_key = await self.client.resolve_page_id(page_id)
+        lock = self._locks.setdefault(f"conversations:{page_key}", asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            known = await asyncio.to_thread(self.store.get_conversation_times, page_key)
+            pending = await asyncio.to_thread(self.store.get_pending_conversations, page_key)
+
+            fetched = 0
+            updated = []
+            listed_all = True
+            conversations = self.client.iter_page_conversations(page_id=page_key, fields=SYNC_CONVERSATION_FIELDS)
+            async with aclosing(conversations):
+                async for conversation in conversations:
+                    fetched += 1
+                    pending.discard(conversation["id"])
+                    if known.get(conversation["id"]) == conversation.get("updated_time"):
+                        # Older conversations are unchanged too, unless a previous sync left some behind
+                        if not pending:
+                            listed_all = False
+                            break
+                        continue
+                    updated.append(conversation)
+            if listed_all and pending:
+                # Deleted, archived or moved out of the inbox: they would keep every listing full
+                logger.info(f"Dropping {len(pending)} pending conversations of page {page_key} no longer listed")
+                await asyncio.to_thread(self.store.drop_pending_conversations, pending)
+            changed = await asyncio.to_thread(self.store.upsert_conversations, page_key, updated) if updated else []
+            updated_times = {conversation["id"]: conversation.get("updated_time") for conversation in updated}
+
+            messages = 0
+            failed = []
+            if include_messages and changed:
+                semaphore = asyncio.Semaphore(self.concurrency)
+
+                async def sync_messages(conversation_id):
+                    async with semaphore:
+                        fetched_messages = await self.sync_conversation_messages(conversation_id)
+                    # Until its messages are synced a conversation keeps counting as changed, which
+                    # also keeps the next listing from stopping before it
+                    await asyncio.to_thread(
+                        self.store.mark_conversations_synced, {conversation_id: updated_times[conversation_id]}
+                    )
+                    return fetched_messages
+
+                results = await asyncio.gather(
+                    *(sync_messages(conversation_id) for conversation_id in changed), return_exceptions=True
+                )
+                errors = {
+                    conversation_id: result for conversation_id, result in zip(changed, results)
+                    if isinstance(result, Exception)
+                }
+                messages = sum(result for result in results if not isinstance(result, Exception))
+                if errors:
+                    logger.error(
+                        f"Messages of {len(errors)} of {len(changed)} changed conversations of page {page_key} "
+                        f"failed to sync: {str(next(iter(errors.values())))}"
+                    )
+                    outages = [error for error in errors.values() if isinstance(error, FacebookAPIException)]
+                    if outages:
+                        raise outages[0]
+                    failed = list(errors)
+                    given_up = await asyncio.to_thread(
+                        self.store.record_message_failures, failed, SYNC_MESSAGE_MAX_FAILURES
+                    )
+                    if given_up:
+                        logger.warning(
+                            f"Giving up on messages of conversations {', '.join(given_up)} of page {page_key} "
+                            f"after {SYNC_MESSAGE_MAX_FAILURES} failed syncs"
+                        )
+
+            result = {
+                "page_id": page_key,
+                "conversations_fetched": fetched,
+                "conversations_changed": len(changed),
+                "messages_fetched": messages,
+                "conversations_failed": len(failed),
+                "duration_seconds": round(time.perf_counter() - started, 3)
+            }
+            self.last_results[f"conversations:{page_key}"] = result
+            logger.info(
+                f"Synced conversations of page {page_key}: {fetched} fetched, {len(changed)} changed, {messages} messages"
+            )
+            return result
+
+    async def sync_conversation_messages(self, conversation_id):
+        """
+        Sync messages of a conversation created since its stored watermark.
+
+        Messages are listed newest first and the listing stops at the watermark.
+        The first sync of a conversation only keeps its latest
+        ``SYNC_MESSAGE_BACKFILL`` messages.
+
+        Args:
+            conversation_id (str): ID of the conversation.
+
+        Returns:
+            int: Number of messages fetched.
+        """
+        scope = f"messages:{conversation_id}"
+        watermark = await asyncio.to_thread(self.store.get_watermark, scope)
+
+        batch = []
+        newest = watermark or 0
+        messages = self.client.iter_connection(conversation_id, "messages", fields=SYNC_MESSAGE_FIELDS, limit=25)
+        async with aclosing(messages):
+            async for message in messages:
+                created = graph_timestamp(message.get("created_time")) or 0
+                # Messages of the watermark second itself are fetched again as others may share it
+                if watermark is not None and created < watermark:
+                    break
+                message["conversation_id"] = conversation_id
+                newest = max(newest, created)
+                batch.append(message)
+                if watermark is None and len(batch) >= SYNC_MESSAGE_BACKFILL:
+                    break
+        if batch:
+            await asyncio.to_thread(self.store.upsert_messages, conversation_id, batch)
+        if newest:
+            await asyncio.to_thread(self.store.set_watermark, scope, newest)
+        return len(batch)
+
+    async def sync_insights(self, page_id="me", metrics=None, period="day", days=INSIGHTS_BACKFILL_DAYS):
+        """
+        Pull insights series into the insights store.
+
+        The first sync of a series backfills ``days`` days in 90-day requests;
+        later syncs only re-fetch the last few days.
+
+        Args:
+            page_id (str, optional): ID of the page. Defaults to "me".
+            metrics (list, optional): Metrics to sync. Defaults to INSIGHTS_METRICS.
+            period (str, optional): Insights period. Defaults to "day".
+            days (int, optional): Days of history to backfill. Defaults to INSIGHTS_BACKFILL_DAYS.
+
+        Returns:
+            dict: Summary of the sync.
+        """
+        if self.insights_store is None:
+            raise RuntimeError("Insights store is not configured")
+        metrics = metrics or INSIGHTS_METRICS
+        page_key = await self.client.resolve_page_id(page_id)
+        started = time.perf_counter()
+
+        now = int(time.time())
+        latest = [self.insights_store.latest_end_time(page_key, metric, period) for metric in metrics]
+        since = now - days * 86400
+        if all(end_time is not None for end_time in latest):
+            since = max(since, min(latest) - INSIGHTS_REFRESH_DAYS * 86400)
+
+        points = 0
+        requests = 0
+        chunk_start = since
+        while chunk_start < now:
+            chunk_end = min(chunk_start + INSIGHTS_CHUNK_DAYS * 86400, now)
+            insights = await self.client.get_connections(
+                id=page_key,
+                connection_name="insights",
+                metric=",".join(metrics),
+                period=period,
+                since=chunk_start,
+                until=chunk_end
+            )
+            points += await asyncio.to_thread(self.insights_store.ingest, page_key, insights)
+            requests += 1
+            chunk_start = chunk_end
+        await asyncio.to_thread(self.insights_store.save)
+
+        result = {
+            "page_id": page_key,
+            "period": period,
+            "since": since,
+            "requests": requests,
+            "points": points,
+            "duration_seconds": round(time.perf_counter() - started, 3)
+        }
+        logger.info(f"Synced insights of page {page_key}: {points} points in {requests} requests")
+        return result
+
+    async def run_periodically(self, page_ids, interval):
+        """
+        Sync a set of pages forever, waiting ``interval`` seconds between rounds.
+
+        Args:
+            page_ids (list): IDs of the pages to keep in sync.
+            interval (float): Seconds between sync rounds.
+        """
+        while True:
+            for page_id in page_ids:
+                try:
+                    await self.sync_page(page_id)
+                    if SYNC_CONVERSATIONS:
+                        await self.sync_conversations(page_id)
+                    if self.insights_store is not None:
+                        await self.sync_insights(page_id)
+                except Exception as e:
+                    logger.error(f"Error syncing page {page_id}: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def stats(self):
+        # Stores that have not been opened yet are not opened just to report on them
+        return {
+            "store": None if callable(self._store) else self._store.stats(),
+            "insights_store": None if self._insights_store is None or callable(self._insights_store)
+                else self._insights_store.stats(),
+            "last_results": self.last_results
+        }
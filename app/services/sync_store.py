@@ -0,0 +1,388 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from app.core.config import SYNC_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    page_id TEXT NOT NULL,
+    created_time TEXT,
+    updated_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_page_created ON posts (page_id, created_time DESC);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    post_id TEXT NOT NULL,
+    created_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_post_created ON comments (post_id, created_time);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    page_id TEXT NOT NULL,
+    updated_time TEXT,
+    synced_time TEXT,
+    message_failures INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_page_updated ON conversations (page_id, updated_time DESC);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    created_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_conversation_created ON messages (conversation_id, created_time DESC);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    scope TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+def graph_timestamp(value):
+    """
+    Convert a Graph API time string (e.g. "2024-01-01T12:00:00+0000") to a Unix timestamp.
+
+    Args:
+        value (str): Graph time string.
+
+    Returns:
+        int: Unix timestamp, or None if the value is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+    except ValueError:
+        return None
+
+class SyncStore:
+    """
+    Embedded SQLite store for synced posts, comments, conversations and messages.
+
+    Objects are stored as their raw Graph JSON next to the columns needed for
+    ordering and incremental sync. Methods are synchronous and guarded by a lock;
+    call them from a worker thread when used inside the event loop.
+    """
+
+    def __init__(self, path=SYNC_DB_PATH):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path (str, optional): Path of the SQLite database. Defaults to SYNC_DB_PATH.
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(conversations)")]
+        if "synced_time" not in columns:
+            self._db.execute("ALTER TABLE conversations ADD COLUMN synced_time TEXT")
+            self._db.execute("UPDATE conversations SET synced_time = updated_time")
+            self._db.commit()
+        if "message_failures" not in columns:
+            self._db.execute("ALTER TABLE conversations ADD COLUMN message_failures INTEGER NOT NULL DEFAULT 0")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def upsert_posts(self, page_id, posts):
+        """
+        Insert or update posts of a page.
+
+        The stored ``updated_time`` used for change detection is left as it was;
+        it only advances through ``mark_posts_synced`` once the comments of the
+        post have been synced, so a post stays changed until then.
+
+        Args:
+            page_id (str): ID of the page.
+            posts (list): Graph post objects.
+
+        Returns:
+            list: IDs of the posts that were new or whose updated_time changed.
+        """
+        changed = []
+        with self._lock, self._db:
+            for post in posts:
+                row = self._db.execute("SELECT updated_time FROM posts WHERE id = ?", (post["id"],)).fetchone()
+                if row is None or row[0] != post.get("updated_time"):
+                    changed.append(post["id"])
+                self._db.execute(
+                    "INSERT INTO posts (id, page_id, created_time, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET page_id = excluded.page_id, "
+                    "created_time = excluded.created_time, data = excluded.data",
+                    (post["id"], page_id, post.get("created_time"), json.dumps(post))
+                )
+        return changed
+
+    def mark_posts_synced(self, updated_times):
+        """
+        Record the ``updated_time`` up to which posts are fully synced.
+
+        Args:
+            updated_times (dict): ``updated_time`` keyed by post ID.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE posts SET updated_time = ? WHERE id = ?",
+                [(updated_time, post_id) for post_id, updated_time in updated_times.items()]
+            )
+
+    def upsert_comments(self, post_id, comments):
+        """
+        Insert or update comments of a post.
+
+        Args:
+            post_id (str): ID of the post.
+            comments (list): Graph comment objects.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO comments (id, post_id, created_time, data) VALUES (?, ?, ?, ?)",
+                [(comment["id"], post_id, comment.get("created_time"), json.dumps(comment)) for comment in comments]
+            )
+
+    def delete_post(self, post_id):
+        """Delete a post and its comments. Returns True if the post was stored."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
+            return self._db.execute("DELETE FROM posts WHERE id = ?", (post_id,)).rowcount > 0
+
+    def delete_comment(self, comment_id):
+        """Delete a comment. Returns True if the comment was stored."""
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM comments WHERE id = ?", (comment_id,)).rowcount > 0
+
+    def get_posts(self, page_id, limit=25, offset=0):
+        """
+        Get stored posts of a page, newest first.
+
+        Returns:
+            tuple: Total number of stored posts of the page and the requested slice.
+        """
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM posts WHERE page_id = ?", (page_id,)).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT data FROM posts WHERE page_id = ? ORDER BY created_time DESC LIMIT ? OFFSET ?",
+                (page_id, limit, offset)
+            ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+
+    def get_comments(self, post_id, limit=25, offset=0):
+        """
+        Get stored comments of a post, oldest first.
+
+        Returns:
+            tuple: Total number of stored comments of the post and the requested slice.
+        """
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM comments WHERE post_id = ?", (post_id,)).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT data FROM comments WHERE post_id = ? ORDER BY created_time LIMIT ? OFFSET ?",
+                (post_id, limit, offset)
+            ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+
+    def get_conversation_times(self, page_id):
+        """Get the ``updated_time`` up to which each conversation of a page is synced, keyed by conversation ID."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, synced_time FROM conversations WHERE page_id = ?", (page_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def get_pending_conversations(self, page_id):
+        """Get the IDs of conversations of a page whose messages are not synced up to their ``updated_time``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM conversations WHERE page_id = ? AND synced_time IS NOT updated_time", (page_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def upsert_conversations(self, page_id, conversations):
+        """
+        Insert or update conversations of a page.
+
+        Change detection compares against ``synced_time``, which only advances
+        through ``mark_conversations_synced`` once the messages have been synced.
+
+        Args:
+            page_id (str): ID of the page.
+            conversations (list): Graph conversation objects.
+
+        Returns:
+            list: IDs of the conversations that were new or whose updated_time changed.
+        """
+        changed = []
+        with self._lock, self._db:
+            for conversation in conversations:
+                row = self._db.execute(
+                    "SELECT synced_time FROM conversations WHERE id = ?", (conversation["id"],)
+                ).fetchone()
+                if row is None or row[0] != conversation.get("updated_time"):
+                    changed.append(conversation["id"])
+                self._db.execute(
+                    "INSERT INTO conversations (id, page_id, updated_time, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET page_id = excluded.page_id, "
+                    "updated_time = excluded.updated_time, data = excluded.data",
+                    (conversation["id"], page_id, conversation.get("updated_time"), json.dumps(conversation))
+                )
+        return changed
+
+    def mark_conversations_synced(self, updated_times):
+        """
+        Record the ``updated_time`` up to which conversations are fully synced.
+
+        Args:
+            updated_times (dict): ``updated_time`` keyed by conversation ID.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE conversations SET synced_time = ?, message_failures = 0 WHERE id = ?",
+                [(updated_time, conversation_id) for conversation_id, updated_time in updated_times.items()]
+            )
+
+    def record_message_failures(self, conversation_ids, max_failures):
+        """
+        Count a failed message sync against conversations, giving up on those failing too often.
+
+        Conversations reaching ``max_failures`` consecutive failures are recorded
+        as synced up to their current ``updated_time`` and are only synced again
+        once they change.
+
+        Args:
+            conversation_ids (list): IDs of the conversations whose messages failed to sync.
+            max_failures (int): Consecutive failures after which a conversation is given up.
+
+        Returns:
+            list: IDs of the conversations given up.
+        """
+        given_up = []
+        with self._lock, self._db:
+            for conversation_id in conversation_ids:
+                self._db.execute(
+                    "UPDATE conversations SET message_failures = message_failures + 1 WHERE id = ?", (conversation_id,)
+                )
+                row = self._db.execute(
+                    "SELECT message_failures FROM conversations WHERE id = ?", (conversation_id,)
+                ).fetchone()
+                if row is not None and row[0] >= max_failures:
+                    given_up.append(conversation_id)
+            self._db.executemany(
+                "UPDATE conversations SET synced_time = updated_time, message_failures = 0 WHERE id = ?",
+                [(conversation_id,) for conversation_id in given_up]
+            )
+        return given_up
+
+    def drop_pending_conversations(self, conversation_ids):
+        """
+        Stop waiting for pending conversations Graph no longer lists, without syncing their messages.
+
+        Args:
+            conversation_ids (iterable): IDs of the conversations.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE conversations SET synced_time = updated_time, message_failures = 0 WHERE id = ?",
+                [(conversation_id,) for conversation_id in conversation_ids]
+            )
+
+    def upsert_messages(self, conversation_id, messages):
+        """
+        Insert or update messages of a conversation.
+
+        Args:
+            conversation_id (str): ID of the conversation.
+            messages (list): Graph message objects.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (id, conversation_id, created_time, data) VALUES (?, ?, ?, ?)",
+                [(message["id"], conversation_id, message.get("created_time"), json.dumps(message)) for message in messages]
+            )
+
+    def get_conversations(self, page_id, limit=25, offset=0, messages=0):
+        """
+        Get stored conversations of a page, most recently updated first.
+
+        Args:
+            page_id (str): ID of the page.
+            limit (int, optional): Maximum number of conversations. Defaults to 25.
+            offset (int, optional): Number of conversations to skip. Defaults to 0.
+            messages (int, optional): Latest stored messages embedded in each conversation. Defaults to 0.
+
+        Returns:
+            tuple: Total number of stored conversations of the page and the requested slice.
+        """
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM conversations WHERE page_id = ?", (page_id,)).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT data FROM conversations WHERE page_id = ? ORDER BY updated_time DESC LIMIT ? OFFSET ?",
+                (page_id, limit, offset)
+            ).fetchall()
+            conversations = [json.loads(row[0]) for row in rows]
+            if messages:
+                for conversation in conversations:
+                    message_rows = self._db.execute(
+                        "SELECT data FROM messages WHERE conversation_id = ? ORDER BY created_time DESC LIMIT ?",
+                        (conversation["id"], messages)
+                    ).fetchall()
+                    conversation["messages"] = {"data": [json.loads(row[0]) for row in message_rows]}
+        return total, conversations
+
+    def get_messages(self, conversation_id, limit=25, offset=0):
+        """
+        Get stored messages of a conversation, newest first.
+
+        Returns:
+            tuple: Total number of stored messages of the conversation and the requested slice.
+        """
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COUNT(*) FROM messages WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT data FROM messages WHERE conversation_id = ? ORDER BY created_time DESC LIMIT ? OFFSET ?",
+                (conversation_id, limit, offset)
+            ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+
+    def get_watermark(self, scope):
+        """Get the stored Unix timestamp watermark of a sync scope, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM watermarks WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, scope, value):
+        """Store the Unix timestamp watermark of a sync scope."""
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO watermarks (scope, value) VALUES (?, ?)", (scope, value))
+
+    def stats(self):
+        with self._lock:
+            posts = self._db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            comments = self._db.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+            conversations = self._db.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+            messages = self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return {
+            "path": self.path,
+            "posts": posts,
+            "comments": comments,
+            "conversations": conversations,
+            "messages": messages
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+
+from loguru import logger
+
+from app.services.sync import SYNC_POST_FIELDS
+
+# Feed items describing a post itself rather than an interaction with it
+POST_ITEMS = {"post", "status", "photo", "video", "share"}
+
+def verify_signature(body, signature, app_secret):
+    """
+    Check the ``X-Hub-Signature-256`` header of a webhook delivery.
+
+    Args:
+        body (bytes): Raw request body.
+        signature (str): Header value, formatted as "sha256=<hex digest>".
+        app_secret (str): Facebook app secret used to sign deliveries.
+
+    Returns:
+        bool: True if the signature matches the body.
+    """
+    if not signature or not signature.startswith("sha256=") or not app_secret:
+        return False
+    expected = hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+class WebhookProcessor:
+    """
+    Turns page webhook events into cache invalidation and targeted refreshes.
+
+    Cached page responses are invalidated as soon as an event arrives. Removed
+    posts and comments are dropped from the local store and search index, and
+    added or edited ones are re-fetched individually instead of re-polling the
+    whole feed. New Messenger messages trigger a delta sync of the page's inbox;
+    messages arriving while a sync of the page is already waiting to start are
+    covered by that sync instead of queueing another one.
+    """
+
+    def __init__(self, client, sync_engine):
+        """
+        Initialize the processor.
+
+        Args:
+            client (FacebookClient): Client whose caches and search index are kept fresh.
+            sync_engine (SyncEngine): Sync engine whose store is kept fresh.
+        """
+        self.client = client
+        self.sync_engine = sync_engine
+        self.events = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.coalesced = 0
+        self._inbox_locks = {}
+        self._inbox_waiting = set()
+
+    async def handle(self, payload):
+        """
+        Process one webhook delivery.
+
+        Args:
+            payload (dict): Decoded webhook body with ``object`` and ``entry``.
+
+        Returns:
+            dict: Number of events, invalidated cache entries and refreshes.
+        """
+        invalidated = 0
+        refreshes = []
+        inbox_pages = set()
+        for entry in payload.get("entry", []):
+            page_id = entry.get("id")
+            for change in entry.get("changes", []):
+                self.events += 1
+                if change.get("field") == "feed":
+                    invalidated += self._invalidate_page(page_id)
+                    refreshes += self._feed_actions(page_id, change.get("value") or {})
+                elif change.get("field") == "messages":
+                    inbox_pages.add(page_id)
+            for message in entry.get("messaging", []):
+                self.events += 1
+                # Delivery and read receipts do not add messages
+                if "message" in message:
+                    inbox_pages.add(page_id)
+        refreshes += [self._refresh_inbox(page_id) for page_id in inbox_pages]
+
+        results = await asyncio.gather(*refreshes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.errors += 1
+                logger.error(f"Error processing webhook event: {str(result)}")
+        self.refreshes += len(refreshes)
+        return {"invalidated": invalidated, "refreshes": len(refreshes)}
+
+    def _invalidate_page(self, page_id):
+        # Responses requested for "me" may belong to this page as well
+        return sum(
+            self.client.invalidate_cache(page_id=key, method=method)
+            for key in (page_id, "me")
+            for method in ("get_page_posts", "get_page_mentions")
+        )
+
+    def _feed_actions(self, page_id, value):
+        item = value.get("item")
+        verb = value.get("verb")
+        post_id = value.get("post_id")
+        comment_id = value.get("comment_id")
+
+        if item == "comment" and comment_id:
+            if verb == "remove":
+                return [self._remove_comment(comment_id)]
+            if verb in ("add", "edited") and post_id:
+                return [self._refresh_comment(post_id, comment_id)]
+        elif item in POST_ITEMS and post_id:
+            if verb in ("remove", "hide"):
+                return [self._remove_post(post_id)]
+            if verb in ("add", "edited"):
+                return [self._refresh_post(page_id, post_id)]
+        return []
+
+    async def _remove_post(self, post_id):
+        self.client.search_index.remove(post_id)
+        await asyncio.to_thread(self.sync_engine.store.delete_post, post_id)
+
+    async def _remove_comment(self, comment_id):
+        self.client.search_index.remove(comment_id)
+        await asyncio.to_thread(self.sync_engine.store.delete_comment, comment_id)
+
+    async def _refresh_post(self, page_id, post_id):
+        post = await self.client.get_post_details(post_id, fields=SYNC_POST_FIELDS)
+        await asyncio.to_thread(self.sync_engine.store.upsert_posts, page_id, [post])
+
+    async def _refresh_inbox(self, page_id):
+        # A sync that has not started listing yet also picks up this delivery's messages
+        if page_id in self._inbox_waiting:
+            self.coalesced += 1
+            return
+        self._inbox_waiting.add(page_id)
+        lock = self._inbox_locks.setdefault(page_id, asyncio.Lock())
+        async with lock:
+            self._inbox_waiting.discard(page_id)
+            await self.sync_engine.sync_conversations(page_id)
+
+    async def _refresh_comment(self, post_id, comment_id):
+        comment = await self.client.get_comment(post_id, comment_id)
+        comment["post_id"] = post_id
+        await asyncio.to_thread(self.sync_engine.store.upsert_comments, post_id, [comment])
+
+    def stats(self):
+        return {"events": self.events, "refreshes": self.refreshes, "errors": self.errors, "coalesced": self.coalesced}
+
+def build_feed_event(page_id, item, verb, post_id, comment_id=None, message=None):
+    """
+    Build a simulated ``feed`` webhook delivery for local testing.
+
+    Args:
+        page_id (str): ID of the page receiving the event.
+        item (str): Changed item ("post", "status", "comment", "reaction"...).
+        verb (str): Change verb ("add", "edited", "remove").
+        post_id (str): ID of the affected post.
+        comment_id (str, optional): ID of the affected comment.
+        message (str, optional): Message of the post or comment.
+
+    Returns:
+        dict: Webhook payload as delivered by Facebook.
+    """
+    value = {"item": item, "verb": verb, "post_id": post_id, "created_time": int(time.time())}
+    if comment_id:
+        value["comment_id"] = comment_id
+    if message:
+        value["message"] = message
+    return {
+        "object": "page",
+        "entry": [{"id": page_id, "time": int(time.time()), "changes": [{"field": "feed", "value": value}]}]
+    }
+
+def build_message_event(page_id, sender_id, text):
+    """
+    Build a simulated Messenger ``messages`` webhook delivery for local testing.
+
+    Args:
+        page_id (str): ID of the page receiving the message.
+        sender_id (str): Page-scoped ID of the sender.
+        text (str): Message text.
+
+    Returns:
+        dict: Webhook payload as delivered by Facebook.
+    """
+    timestamp = int(time.time() * 1000)
+    return {
+        "object": "page",
+        "entry": [{
+            "id": page_id,
+            "time": timestamp,
+            "messaging": [{
+                "sender": {"id": sender_id},
+                "recipient": {"id": page_id},
+                "timestamp": timestamp,
+                "message": {"mid": f"m_{timestamp}", "text": text}
+            }]
+        }]
+    }
+
+def sign_payload(payload, app_secret):
+    """
+    Serialize and sign a simulated webhook payload.
+
+    Args:
+        payload (dict): Webhook payload.
+        app_secret (str): Facebook app secret.
+
+    Returns:
+        tuple: Raw body and the matching ``X-Hub-Signature-256`` header value.
+    """
+    body = json.dumps(payload).encode()
+    return body, "sha256=" + hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
@@ -0,0 +1,59 @@
+"""
+Compare two result files written by ``benchmarks.run``.
+
+Scenarios are matched by route, comment/like count and concurrency. For each
+one the change in throughput and p50/p95/p99 latency is printed, and the exit
+status is 1 if any p95 latency grew or throughput dropped by more than the
+threshold, so the script can gate a CI job.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data["meta"], {(r["route"], r["count"], r["concurrency"]): r for r in data["results"]}
+
+def change(before, after):
+    return (after - before) / before if before else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported as a regression")
+    args = parser.parse_args()
+
+    baseline_meta, baseline = load(args.baseline)
+    candidate_meta, candidate = load(args.candidate)
+    print(f"Baseline {baseline_meta['commit']} ({baseline_meta['started_at']}) -> "
+          f"candidate {candidate_meta['commit']} ({candidate_meta['started_at']})")
+    print(f"{'route':<22} {'count':>5} {'c':>4} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+
+    regressions = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        throughput = change(before["throughput_rps"], after["throughput_rps"])
+        latencies = [change(before[f"{p}_ms"], after[f"{p}_ms"]) for p in ("p50", "p95", "p99")]
+        route, count, concurrency = key
+        print(f"{route:<22} {count:>5} {concurrency:>4} {throughput:>+9.1%} "
+              + " ".join(f"{value:>+8.1%}" for value in latencies))
+        if latencies[1] > args.threshold or throughput < -args.threshold:
+            regressions.append(key)
+
+    missing = sorted(baseline.keys() ^ candidate.keys())
+    if missing:
+        print(f"{len(missing)} scenarios only present in one file were skipped")
+    if regressions:
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%}:")
+        for route, count, concurrency in regressions:
+            print(f"  {route} count={count} concurrency={concurrency}")
+        sys.exit(1)
+    print("No regressions")
+
+if __name__ == "__main__":
+    main()
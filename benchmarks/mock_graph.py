@@ -0,0 +1,343 @@
+"""
+Local mock of the Facebook Graph API for offline benchmarks and manual testing.
+
+Serves deterministic pages, posts, comments (with replies), likes, mentions,
+conversations, users and insights. It supports cursor pagination, nested field
+expansion (``comments.limit(5).summary(true){from{id,name}}``), the Batch API,
+``ids`` lookups, injectable latency and errors, and usage headers.
+
+Run it as a server and point the API at it:
+
+    python -m benchmarks.mock_graph --port 8900 --comments 100
+    FACEBOOK_GRAPH_URL=http://localhost:8900 python run.py
+
+or mount it in-process with ``httpx.ASGITransport(app=create_mock_graph_app())``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.fields import parse_fields
+
+PAGE_ID = "1000"
+BASE_TIME = 1704067200  # 2024-01-01T00:00:00+0000
+
+# Graph error codes and the HTTP status they are returned with
+ERROR_STATUS = {1: 500, 2: 503, 4: 403, 17: 403, 32: 403, 100: 400, 190: 401, 341: 403, 613: 403}
+
+def graph_time(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+class MockGraph:
+    """
+    Deterministic Graph data set and request handling.
+
+    Object IDs encode their position: posts are ``<page>_<n>``, comments
+    ``<post>_c<n>``, replies ``<comment>_r<n>``, conversations ``t_<n>``,
+    messages ``<conversation>_m<n>`` and users ``u<n>``. An object ID of
+    ``error_<code>`` always fails with that Graph error code.
+    """
+
+    def __init__(self, posts=200, comments=25, likes=25, replies=2, conversations=50, messages=20,
+                 latency=0.0, jitter=0.0, error_rate=0.0, error_code=2, app_usage=5):
+        """
+        Args:
+            posts (int): Posts per page.
+            comments (int): Top-level comments per post.
+            likes (int): Likes per post and per comment.
+            replies (int): Replies per comment.
+            conversations (int): Conversations per page.
+            messages (int): Messages per conversation.
+            latency (float): Seconds added to every response.
+            jitter (float): Maximum random seconds added on top of ``latency``.
+            error_rate (float): Fraction of requests failing with ``error_code``.
+            error_code (int): Graph error code of injected errors.
+            app_usage (int): Percentage reported in the usage headers.
+        """
+        self.posts = posts
+        self.comments = comments
+        self.likes = likes
+        self.replies = replies
+        self.conversations = conversations
+        self.messages = messages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.app_usage = app_usage
+        self.requests = 0
+
+    # Objects
+
+    def kind_of(self, object_id):
+        if object_id in ("me", PAGE_ID) or object_id.isdigit():
+            return "page"
+        if re.fullmatch(r"\w+_\d+_c\d+(_r\d+)?", object_id):
+            return "comment"
+        if re.fullmatch(r"\d+_\d+", object_id):
+            return "post"
+        if re.fullmatch(r"t_\d+_m\d+", object_id):
+            return "message"
+        if re.fullmatch(r"t_\d+", object_id):
+            return "conversation"
+        if re.fullmatch(r"u\d+", object_id):
+            return "user"
+        return None
+
+    def record(self, kind, object_id):
+        """Plain fields of an object."""
+        number = int(re.findall(r"\d+", object_id)[-1]) if re.search(r"\d", object_id) else 0
+        if kind == "page":
+            page_id = PAGE_ID if object_id == "me" else object_id
+            return {
+                "id": page_id, "name": f"Page {page_id}", "about": "A mock page", "category": "Software",
+                "description": "Mock page served by the local Graph server", "fan_count": 12345,
+                "followers_count": 13000, "link": f"https://facebook.com/{page_id}", "username": f"page{page_id}",
+                "website": "https://example.com", "picture": {"data": {"url": f"https://example.com/{page_id}.jpg"}}
+            }
+        if kind == "post":
+            created = BASE_TIME + (self.posts - number) * 3600
+            return {
+                "id": object_id, "message": f"Post {number} about cats, dogs and product updates",
+                "created_time": graph_time(created), "updated_time": graph_time(created + 60),
+                "permalink_url": f"https://facebook.com/{object_id}", "status_type": "mobile_status_update",
+                "shares": {"count": number % 7}, "full_picture": f"https://example.com/{object_id}.jpg",
+                "attachments": {"data": [{"type": "photo", "url": f"https://example.com/{object_id}.jpg"}]}
+            }
+        if kind == "comment":
+            return {
+                "id": object_id, "message": f"Comment {number}: great post, thanks for sharing",
+                "created_time": graph_time(BASE_TIME + number * 60), "like_count": number % 5,
+                "comment_count": 0 if "_r" in object_id else self.replies,
+                "permalink_url": f"https://facebook.com/{object_id}"
+            }
+        if kind == "conversation":
+            return {
+                "id": object_id, "link": f"/{PAGE_ID}/inbox/{object_id}",
+                "updated_time": graph_time(BASE_TIME + (self.conversations - number) * 600), "snippet": "Hello, is this available?",
+                "message_count": self.messages, "unread_count": number % 3
+            }
+        if kind == "message":
+            return {
+                "id": object_id, "message": f"Message {number}",
+                "created_time": graph_time(BASE_TIME + (self.messages - number) * 30)
+            }
+        if kind == "user":
+            return {
+                "id": object_id, "name": f"User {number}", "first_name": "User", "last_name": str(number),
+                "link": f"https://facebook.com/{object_id}", "email": f"{object_id}@example.com",
+                "picture": {"data": {"url": f"https://example.com/{object_id}.jpg"}}
+            }
+        return {"id": object_id}
+
+    def author(self, kind, object_id):
+        """ID of the user behind the ``from`` field of an object."""
+        if kind == "post":
+            return PAGE_ID
+        number = int(re.findall(r"\d+", object_id)[-1])
+        return f"u{number % 50}"
+
+    def children(self, kind, object_id, connection):
+        """Kind and IDs of the objects of a connection, or None if it does not exist."""
+        page_id = PAGE_ID if object_id == "me" else object_id
+        if kind == "page" and connection in ("posts", "feed", "published_posts"):
+            return "post", [f"{page_id}_{n}" for n in range(self.posts)]
+        if kind == "page" and connection == "tagged":
+            return "post", [f"{int(page_id) + 1}_{n}" for n in range(min(self.posts, 50))]
+        if kind == "page" and connection == "conversations":
+            return "conversation", [f"t_{n}" for n in range(self.conversations)]
+        if kind == "post" and connection == "comments":
+            return "comment", [f"{object_id}_c{n}" for n in range(self.comments)]
+        if kind == "comment" and connection == "comments":
+            return "comment", [] if "_r" in object_id else [f"{object_id}_r{n}" for n in range(self.replies)]
+        if kind in ("post", "comment") and connection in ("likes", "reactions"):
+            return "user", [f"u{n}" for n in range(self.likes)]
+        if kind == "conversation" and connection == "messages":
+            return "message", [f"{object_id}_m{n}" for n in range(self.messages)]
+        if kind == "conversation" and connection == "participants":
+            return "user", [PAGE_ID, f"u{object_id[2:]}"]
+        return None
+
+    DEFAULT_FIELDS = {
+        "page": "id,name", "post": "id,message,created_time", "comment": "id,message,created_time,from",
+        "conversation": "id,updated_time", "message": "id,message,created_time", "user": "id,name"
+    }
+
+    def render(self, kind, object_id, fields):
+        """Render an object with a parsed field selection."""
+        if fields is None:
+            fields = parse_fields(self.DEFAULT_FIELDS.get(kind, "id"))
+        record = self.record(kind, object_id)
+        result = {}
+        for name, modifiers, nested in fields:
+            options = dict(modifiers)
+            if name == "from" or name == "to":
+                user_id = self.author(kind, object_id)
+                result[name] = self.render("page" if user_id == PAGE_ID else "user", user_id,
+                                           nested or parse_fields("id,name"))
+            elif self.children(kind, object_id, name) is not None:
+                result[name] = self.connection(kind, object_id, name, nested, options)
+            elif name in record:
+                result[name] = record[name]
+        result.setdefault("id", record["id"])
+        return result
+
+    def connection(self, kind, object_id, name, fields, options, url=None):
+        """Render one page of a connection with cursor paging."""
+        child_kind, ids = self.children(kind, object_id, name)
+        if "since" in options:
+            since = graph_time(int(options["since"]))
+            ids = [child_id for child_id in ids if self.record(child_kind, child_id).get("created_time", since) >= since]
+        limit = min(int(options.get("limit", 25)), 100)
+        offset = int(options.get("after", 0))
+        page = ids[offset:offset + limit]
+        result = {"data": [self.render(child_kind, child_id, fields) for child_id in page]}
+        if page:
+            result["paging"] = {"cursors": {"before": str(offset), "after": str(offset + len(page))}}
+            if offset + len(page) < len(ids) and url is not None:
+                query = dict(parse_qsl(urlsplit(url).query))
+                query["after"] = str(offset + len(page))
+                result["paging"]["next"] = url.split("?")[0] + "?" + "&".join(f"{k}={v}" for k, v in query.items())
+        if options.get("summary") == "true":
+            result["summary"] = {"total_count": len(ids)}
+        return result
+
+    def insights(self, object_id, params):
+        now = int(time.time())
+        until = int(params.get("until", now))
+        since = int(params.get("since", until - 30 * 86400))
+        days = range(since - since % 86400 + 86400, until + 1, 86400)
+        metrics = [metric for metric in params.get("metric", "page_impressions").split(",") if metric]
+        return {
+            "data": [
+                {
+                    "name": metric, "period": params.get("period", "day"), "id": f"{object_id}/insights/{metric}",
+                    "values": [
+                        {"value": (day // 86400 * (index + 7)) % 1000, "end_time": graph_time(day + 7 * 3600)}
+                        for day in days
+                    ]
+                }
+                for index, metric in enumerate(metrics)
+            ]
+        }
+
+    # Requests
+
+    def error(self, code):
+        return ERROR_STATUS.get(code, 400), {
+            "error": {"message": f"Mock error {code}", "type": "OAuthException" if code == 190 else "GraphMethodException",
+                      "code": code, "is_transient": code in (1, 2), "fbtrace_id": "mock"}
+        }
+
+    def handle(self, path, params, url=None):
+        """
+        Answer a GET request.
+
+        Args:
+            path (str): Path after the version, e.g. "1000/posts".
+            params (dict): Query parameters.
+            url (str, optional): Full request URL, used for ``paging.next``.
+
+        Returns:
+            tuple: HTTP status and JSON body.
+        """
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error(self.error_code)
+        parts = [part for part in path.split("/") if part]
+        if parts and parts[0].startswith("error_"):
+            return self.error(int(parts[0][len("error_"):]))
+        fields = parse_fields(params["fields"]) if params.get("fields") else None
+
+        if not parts:
+            ids = [object_id for object_id in params.get("ids", "").split(",") if object_id]
+            return 200, {object_id: self.render(self.kind_of(object_id), object_id, fields) for object_id in ids}
+
+        object_id = parts[0]
+        kind = self.kind_of(object_id)
+        if kind is None:
+            return self.error(100)
+        if len(parts) == 1:
+            return 200, self.render(kind, object_id, fields)
+        if kind == "page" and parts[1] == "insights":
+            return 200, self.insights(object_id, params)
+        if self.children(kind, object_id, parts[1]) is None:
+            return self.error(100)
+        return 200, self.connection(kind, object_id, parts[1], fields, params, url)
+
+    def handle_batch(self, batch):
+        responses = []
+        for request in batch:
+            relative = urlsplit(request.get("relative_url", ""))
+            status, body = self.handle(relative.path, dict(parse_qsl(relative.query)))
+            responses.append({"code": status, "headers": [], "body": json.dumps(body)})
+        return responses
+
+    def usage_headers(self):
+        usage = json.dumps({"call_count": self.app_usage, "total_time": self.app_usage, "total_cputime": self.app_usage})
+        return {"X-App-Usage": usage, "X-Page-Usage": usage}
+
+def create_mock_graph_app(graph=None):
+    """
+    Create the ASGI app serving a ``MockGraph``.
+
+    Args:
+        graph (MockGraph, optional): Data set and behaviour. Defaults to a new MockGraph().
+
+    Returns:
+        FastAPI: The mock Graph server app, with the MockGraph on ``app.state.graph``.
+    """
+    graph = graph or MockGraph()
+    app = FastAPI(title="Mock Graph API")
+    app.state.graph = graph
+
+    async def delay():
+        graph.requests += 1
+        if graph.latency or graph.jitter:
+            await asyncio.sleep(graph.latency + random.uniform(0, graph.jitter))
+
+    @app.get("/{version}/{path:path}")
+    async def get(version: str, path: str, request: Request):
+        await delay()
+        status, body = graph.handle(path, dict(request.query_params), str(request.url))
+        return JSONResponse(body, status_code=status, headers=graph.usage_headers())
+
+    @app.post("/{version}/")
+    async def batch(version: str, request: Request):
+        await delay()
+        form = await request.form()
+        return JSONResponse(graph.handle_batch(json.loads(form["batch"])), headers=graph.usage_headers())
+
+    return app
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the mock Graph API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=25)
+    parser.add_argument("--likes", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-code", type=int, default=2)
+    parser.add_argument("--app-usage", type=int, default=5, help="Usage percentage reported in headers")
+    args = parser.parse_args()
+
+    graph = MockGraph(
+        posts=args.posts, comments=args.comments, likes=args.likes, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_code=args.error_code, app_usage=args.app_usage
+    )
+    uvicorn.run(create_mock_graph_app(graph), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark every route of the facebook router against the local mock Graph server.
+
+For each comment/like count a fresh ``MockGraph`` is mounted in-process as the
+client's upstream. Every route is then driven at each concurrency level and its
+throughput, p50/p95/p99 latency, error count and upstream calls per request
+are recorded. The response cache is bypassed (``no_cache=true``) unless
+``--cache`` is given; the user profile cache is cleared before each scenario.
+Client-side rate limiting is disabled unless ``--rate-limit`` is given, so the
+numbers reflect the service rather than the configured request pacing.
+
+Results are written as JSON to ``benchmarks/results/<timestamp>-<commit>.json``
+so runs can be compared across commits with ``python -m benchmarks.compare``.
+
+Usage:
+    python -m benchmarks.run [--concurrency 1,10,50] [--counts 10,100] [--requests 200]
+                             [--latency 0.02] [--routes posts,comments] [--cache] [--rate-limit]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_data_dir = tempfile.mkdtemp(prefix="facebook-benchmark-")
+os.environ.setdefault("FACEBOOK_ACCESS_TOKEN", "benchmark")
+os.environ.setdefault("RESPONSE_VALIDATION_SAMPLE_RATE", "0")
+os.environ.setdefault("SYNC_INTERVAL", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("SYNC_DB_PATH", os.path.join(_data_dir, "sync.db"))
+os.environ.setdefault("INSIGHTS_STORE_DIR", os.path.join(_data_dir, "insights"))
+os.environ.setdefault("EXPORT_DIR", os.path.join(_data_dir, "exports"))
+os.environ.setdefault("TRACE_EXPORT_PATH", os.path.join(_data_dir, "traces.jsonl"))
+os.environ.setdefault("LOG_FILE", os.path.join(_data_dir, "facebook_api.log"))
+# The application replaces the sinks configured below on startup
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+import numpy as np
+from loguru import logger
+
+from app.core.config import API_V1_STR
+from app.main import app
+from benchmarks.mock_graph import MockGraph, create_mock_graph_app
+
+PREFIX = f"{API_V1_STR}/facebook"
+POST_ID = "1000_1"
+CONVERSATION_ID = "t_1"
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# name -> (method, path, params); cacheable routes get no_cache=true unless --cache
+ROUTES = {
+    "stats": ("GET", "/stats", {}),
+    "rate_limits": ("GET", "/rate-limits", {}),
+    "invalidate_cache": ("DELETE", "/cache", {}),
+    "page_info": ("GET", "/page-info", {"no_cache": True}),
+    "posts": ("GET", "/posts", {"limit": 25, "no_cache": True}),
+    "posts_stream": ("GET", "/posts/stream", {"max_items": 100}),
+    "post": ("GET", f"/posts/{POST_ID}", {}),
+    "post_full": ("GET", f"/posts/{POST_ID}/full", {"comments_limit": 100, "likes_limit": 100, "replies": True}),
+    "comments": ("GET", f"/posts/{POST_ID}/comments", {"limit": 100}),
+    "comments_stream": ("GET", f"/posts/{POST_ID}/comments/stream", {}),
+    "likes": ("GET", f"/posts/{POST_ID}/likes", {"limit": 100}),
+    "likes_stream": ("GET", f"/posts/{POST_ID}/likes/stream", {}),
+    "fans": ("GET", "/fans", {"no_cache": True}),
+    "mentions": ("GET", "/mentions", {"no_cache": True}),
+    "conversations": ("GET", "/conversations", {}),
+    "conversations_stream": ("GET", "/conversations/stream", {"max_items": 50}),
+    "conversation": ("GET", f"/conversations/{CONVERSATION_ID}", {"limit": 25}),
+    "insights": ("GET", "/insights", {"no_cache": True}),
+    "search": ("GET", "/search", {"query": "cats product"}),
+    "search_index": ("POST", "/search/index", {}),
+}
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def summarize(latencies, duration):
+    """Throughput and latency percentiles (in milliseconds) of one scenario."""
+    latencies = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "throughput_rps": round(len(latencies) / duration, 2),
+        "mean_ms": round(float(latencies.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(latencies.max()), 3),
+    }
+
+async def run_scenario(api, graph, method, path, params, concurrency, requests, warmup):
+    """
+    Send ``requests`` requests to one route with ``concurrency`` in flight.
+
+    Returns:
+        dict: Latency summary, error count and upstream calls per request.
+    """
+    async def send():
+        started = time.perf_counter()
+        response = await api.request(method, PREFIX + path, params=params)
+        return time.perf_counter() - started, response.status_code
+
+    for _ in range(warmup):
+        await send()
+
+    graph.requests = 0
+    latencies = []
+    statuses = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            latency, status = await send()
+            latencies.append(latency)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    result = summarize(latencies, duration)
+    result["requests"] = requests
+    result["errors"] = sum(count for status, count in statuses.items() if status >= 400)
+    result["status_codes"] = {str(status): count for status, count in sorted(statuses.items())}
+    result["upstream_calls_per_request"] = round(graph.requests / requests, 2)
+    return result
+
+async def run(args):
+    routes = args.routes.split(",") if args.routes else list(ROUTES)
+    unknown = [route for route in routes if route not in ROUTES]
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(unknown)}. Available: {', '.join(ROUTES)}")
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    counts = [int(count) for count in args.counts.split(",")]
+
+    results = []
+    async with app.router.lifespan_context(app):
+        client = app.state.facebook_client
+        client.rate_limiter.enabled = args.rate_limit
+        await client.http.aclose()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as api:
+            for count in counts:
+                graph = MockGraph(
+                    posts=args.posts, comments=count, likes=count, latency=args.latency, jitter=args.jitter
+                )
+                client.http = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_mock_graph_app(graph)))
+                for route in routes:
+                    method, path, params = ROUTES[route]
+                    params = dict(params)
+                    if args.cache:
+                        params.pop("no_cache", None)
+                    for concurrency in concurrency_levels:
+                        client.invalidate_cache()
+                        client.user_cache.clear()
+                        result = await run_scenario(
+                            api, graph, method, path, params, concurrency, args.requests, args.warmup
+                        )
+                        result.update({"route": route, "path": path, "concurrency": concurrency, "count": count})
+                        results.append(result)
+                        print(
+                            f"{route:<22} count={count:<5} c={concurrency:<4} "
+                            f"{result['throughput_rps']:>9.1f} req/s  p50={result['p50_ms']:>8.2f}ms  "
+                            f"p95={result['p95_ms']:>8.2f}ms  p99={result['p99_ms']:>8.2f}ms  "
+                            f"upstream/req={result['upstream_calls_per_request']:<6} errors={result['errors']}"
+                        )
+                await client.http.aclose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the facebook routes against the mock Graph server")
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated concurrency levels")
+    parser.add_argument("--counts", default="10,100", help="Comma-separated comment/like counts per post")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests before each scenario")
+    parser.add_argument("--posts", type=int, default=200, help="Posts on the mock page")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of upstream latency per Graph call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra upstream latency")
+    parser.add_argument("--routes", default=None, help=f"Comma-separated subset of: {', '.join(ROUTES)}")
+    parser.add_argument("--cache", action="store_true", help="Let cacheable routes use the response cache")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep client-side rate limiting enabled")
+    parser.add_argument("--output", default=None, help="Result file (defaults to benchmarks/results/<timestamp>-<commit>.json)")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    started = datetime.now(timezone.utc)
+    results = asyncio.run(run(args))
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{started.strftime('%Y%m%dT%H%M%SZ')}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "started_at": started.isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "parameters": vars(args),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measure the CPU time saved by the fast response path.
+
+Serves the same 100-item payloads twice from a local FastAPI app: once through
+FastAPI's ``response_model`` validation and encoding, and once through
+``model_response`` (precompiled key filter and orjson). The serialization step
+alone is also timed in-process, without the HTTP round trip.
+
+Usage:
+    python -m benchmarks.serialization [--items 100] [--requests 500]
+"""
+import argparse
+import os
+import time
+
+import orjson
+
+os.environ.setdefault("FACEBOOK_ACCESS_TOKEN", "benchmark")
+os.environ.setdefault("RESPONSE_VALIDATION_SAMPLE_RATE", "0")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.responses import compile_serializer, model_response
+from app.models.schemas import CommentResponse, ConversationResponse
+
+def build_payloads(items):
+    user = {"id": "1234567890", "name": "Jane Doe", "picture": {"data": {"url": "https://example.com/p.jpg"}}, "link": "https://facebook.com/jane"}
+    comments = {
+        "data": [
+            {
+                "id": f"123_{i}",
+                "message": f"Comment number {i} with some text to encode",
+                "created_time": "2024-05-01T12:00:00+0000",
+                "from": dict(user),
+                "like_count": i,
+                "post_id": "123_456"
+            }
+            for i in range(items)
+        ],
+        "paging": {"cursors": {"before": "abc", "after": "def"}}
+    }
+    conversations = {
+        "data": [
+            {
+                "id": f"t_{i}",
+                "link": f"/conversations/t_{i}",
+                "updated_time": "2024-05-01T12:00:00+0000",
+                "messages": {
+                    "data": [
+                        {"id": f"m_{i}_{j}", "message": "Hello there", "created_time": "2024-05-01T12:00:00+0000", "from": dict(user)}
+                        for j in range(10)
+                    ]
+                }
+            }
+            for i in range(items)
+        ]
+    }
+    return {"comments": (comments, CommentResponse), "conversations": (conversations, ConversationResponse)}
+
+def build_app(payloads):
+    app = FastAPI()
+    for name, (payload, model) in payloads.items():
+        async def standard(payload=payload):
+            return payload
+
+        async def fast(payload=payload, model=model):
+            return model_response(payload, model)
+
+        app.get(f"/standard/{name}", response_model=model, response_model_exclude_unset=True)(standard)
+        app.get(f"/fast/{name}", response_model=model, response_model_exclude_unset=True)(fast)
+    return app
+
+def measure(client, path, requests):
+    client.get(path)
+    started = time.process_time()
+    for _ in range(requests):
+        response = client.get(path)
+    elapsed = time.process_time() - started
+    return elapsed / requests * 1000, len(response.content)
+
+def measure_serialization(payload, model, requests):
+    started = time.process_time()
+    for _ in range(requests):
+        model.model_validate(payload).model_dump_json(by_alias=True, exclude_unset=True)
+    standard = time.process_time() - started
+
+    serializer = compile_serializer(model)
+    started = time.process_time()
+    for _ in range(requests):
+        orjson.dumps(serializer(payload))
+    fast = time.process_time() - started
+    return standard / requests * 1000, fast / requests * 1000
+
+def report(label, standard, fast):
+    print(f"{label:<30}{standard:>13.3f}{fast:>10.3f}{standard - fast:>10.3f}{(standard - fast) / standard:>8.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="Items per response")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per measurement")
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.items)
+    client = TestClient(build_app(payloads))
+    print(f"CPU time per request, {args.items} items per response")
+    print(f"{'payload':<30}{'standard ms':>13}{'fast ms':>10}{'saved ms':>10}{'saved':>8}")
+    for name, (payload, model) in payloads.items():
+        standard, _ = measure(client, f"/standard/{name}", args.requests)
+        fast, _ = measure(client, f"/fast/{name}", args.requests)
+        report(f"{name} (HTTP round trip)", standard, fast)
+        report(f"{name} (serialization only)", *measure_serialization(payload, model, args.requests))
+
+if __name__ == "__main__":
+    main()
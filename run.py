@@ -1,7 +1,6 @@
 import os
 import sys
 from loguru import logger
-from fastapi_mcp import FastApiMCP
 # Create logs directory if it doesn't exist
 os.makedirs("logs", exist_ok=True)
 
@@ -10,17 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import FastAPI app
 from app.main import app
-# mcp = FastApiMCP(
-#     app,
-
-#     # Optional parameters
-#     name="My API MCP",
-#     description="My API description",
-#     base_url="http://localhost:8000",
-# )
-
-# # Mount the MCP server directly to your FastAPI app
-# mcp.mount()
+# MCP tools are mounted by app.main when MCP_ENABLED=true
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,17 +1,14 @@
-# from fastapi import FastAPI
-# from fastapi_mcp import FastApiMCP
-# from app.main import app
+"""
+Run the API with the MCP server mounted at /mcp.
 
-# mcp_app = FastAPI()
-# mcp = FastApiMCP(
-#     app,
+Equivalent to starting ``run.py`` with ``MCP_ENABLED=true``; the MCP tools are
+the compact routes under /api/v1/mcp.
+"""
+import os
 
-#     # Optional parameters
-#     name="My API MCP",
-#     description="My API description",
-#     base_url="http://localhost:8001",
-# )
+import uvicorn
 
-# # Mount the MCP server directly to your FastAPI app
-# mcp.mount()
+os.environ.setdefault("MCP_ENABLED", "true")
 
+if __name__ == "__main__":
+    uvicorn.run("app.main:app", host="0.0.0.0", port=int(os.getenv("MCP_PORT", "8001")))
@@ -0,0 +1,70 @@
+import os
+import sys
+import requests
+from loguru import logger
+
+from app.services.webhooks import build_feed_event, build_message_event, sign_payload
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, format="{time} | {level} | {message}")
+logger.add("logs/webhook_test.log", rotation="10 MB", level="INFO")
+
+# Webhook URL of the running API and the secret it verifies signatures with
+WEBHOOK_URL = "http://localhost:8000/webhooks/facebook"
+APP_SECRET = os.getenv("FACEBOOK_APP_SECRET")
+VERIFY_TOKEN = os.getenv("FACEBOOK_WEBHOOK_VERIFY_TOKEN")
+
+def send_event(name, payload, secret=APP_SECRET, expected_status=200):
+    """Sign and deliver a simulated webhook event and log the result"""
+    body, signature = sign_payload(payload, secret)
+    logger.info(f"Sending event: {name}")
+
+    try:
+        response = requests.post(
+            WEBHOOK_URL,
+            data=body,
+            headers={"Content-Type": "application/json", "X-Hub-Signature-256": signature}
+        )
+        if response.status_code == expected_status:
+            logger.info(f"✅ Success: {name} - Status: {response.status_code}")
+        else:
+            logger.error(f"❌ Failed: {name} - Expected status {expected_status}, got {response.status_code}")
+            logger.error(f"Response: {response.text}")
+    except Exception as e:
+        logger.error(f"❌ Error sending {name}: {str(e)}")
+
+def test_verification():
+    """Test the subscription handshake"""
+    response = requests.get(WEBHOOK_URL, params={
+        "hub.mode": "subscribe",
+        "hub.verify_token": VERIFY_TOKEN,
+        "hub.challenge": "challenge-123"
+    })
+    if response.status_code == 200 and response.text == "challenge-123":
+        logger.info("✅ Success: verification handshake")
+    else:
+        logger.error(f"❌ Failed: verification handshake - Status: {response.status_code}, Response: {response.text}")
+
+def run_tests(page_id, post_id):
+    """Simulate a sequence of page events"""
+    if not APP_SECRET or not VERIFY_TOKEN:
+        logger.error("FACEBOOK_APP_SECRET and FACEBOOK_WEBHOOK_VERIFY_TOKEN must be set")
+        return
+
+    logger.info("Starting webhook simulation")
+    test_verification()
+
+    send_event("post edited", build_feed_event(page_id, "status", "edited", post_id, message="Edited post"))
+    send_event("comment added", build_feed_event(page_id, "comment", "add", post_id, comment_id=f"{post_id}_1", message="Nice!"))
+    send_event("comment removed", build_feed_event(page_id, "comment", "remove", post_id, comment_id=f"{post_id}_1"))
+    send_event("message received", build_message_event(page_id, "1234567890", "Hello"))
+    send_event("invalid signature", build_feed_event(page_id, "status", "add", post_id), secret="wrong", expected_status=403)
+
+    logger.info("Webhook simulation completed")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python test_webhooks.py <page_id> <post_id>")
+        sys.exit(1)
+    run_tests(sys.argv[1], sys.argv[2])